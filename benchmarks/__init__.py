@@ -0,0 +1,6 @@
+"""Бенчмарки Tasker
+
+Запускаются отдельно от pytest, каждый на временной тестовой БД:
+
+    python -m benchmarks.bench_task_create --mode eager
+"""
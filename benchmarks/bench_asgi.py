@@ -0,0 +1,255 @@
+"""Пропускная способность и хвостовые задержки досок: WSGI против ASGI
+
+Обработчики Django вызываются в процессе, без сетевого сервера: WSGIHandler -
+из пула потоков (как воркер gunicorn с --threads), ASGIHandler - корутинами
+одного событийного цикла (как uvicorn) с асинхронными представлениями
+config.urls_asgi. Для каждого уровня конкурентности из --concurrency каждая
+доска запрашивается --requests раз; печатаются RPS и p50/p95/p99. С --cold
+каждый запрос получает свой параметр и не попадает в кеш досок.
+
+    python -m benchmarks.bench_asgi
+    python -m benchmarks.bench_asgi --concurrency 1 8 32 --requests 400 --cold
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from itertools import count
+
+from benchmarks.utils import latency_summary, setup_django, test_database
+
+
+DEFAULT_CONCURRENCY = (1, 8, 32)
+BOARD_ROUTES = ("index", "kanban", "today", "task_detail")
+# Разрешён тестовым окружением (setup_test_environment)
+HOST = "testserver"
+
+
+def board_paths() -> dict[str, str]:
+    """Адреса досок и карточки первой задачи"""
+    from django.urls import reverse
+
+    from tasker_app.models import Task
+
+    pk = Task.objects.order_by("pk").values_list("pk", flat=True).first()
+    return {
+        name: reverse(name, kwargs={"pk": pk} if name == "task_detail" else None)
+        for name in BOARD_ROUTES
+    }
+
+
+class QueryStrings:
+    """Строки запроса: пустые или уникальные (--cold), потокобезопасно"""
+
+    def __init__(self, cold: bool):
+        self.cold = cold
+        self._numbers = count()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        if not self.cold:
+            return ""
+        with self._lock:
+            return f"bench={next(self._numbers)}"
+
+
+def wsgi_request(handler, path: str, query: str) -> None:
+    """GET через WSGIHandler с дочитыванием и закрытием ответа"""
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SCRIPT_NAME": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "wsgi.version": (1, 0),
+    }
+    statuses = []
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    try:
+        for _ in response:
+            pass
+    finally:
+        # request_finished: закрытие соединения с БД, как у сервера
+        response.close()
+    if not statuses[0].startswith("200"):
+        raise RuntimeError(f"{path}: status {statuses[0]}")
+
+
+def run_wsgi(path: str, queries: QueryStrings, requests: int, concurrency: int):
+    """Задержки запросов и общее время в пуле потоков"""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connections
+
+    handler = WSGIHandler()
+    samples: list[float] = []
+    errors: list[Exception] = []
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker() -> None:
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                started = time.perf_counter()
+                wsgi_request(handler, path, queries())
+                elapsed = time.perf_counter() - started
+                with lock:
+                    samples.append(elapsed)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return samples, time.perf_counter() - started
+
+
+async def asgi_request(application, path: str, query: str) -> None:
+    """GET через ASGIHandler"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (HOST, 80),
+    }
+    # Тело запроса пустое; следующий receive ждёт отключения клиента
+    # (Django отменяет его после ответа)
+    messages: asyncio.Queue = asyncio.Queue()
+    messages.put_nowait({"type": "http.request", "body": b"", "more_body": False})
+    statuses = []
+
+    async def send(message) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await application(scope, messages.get, send)
+    if statuses[0] != 200:
+        raise RuntimeError(f"{path}: status {statuses[0]}")
+
+
+def run_asgi(path: str, queries: QueryStrings, requests: int, concurrency: int):
+    """Задержки запросов и общее время в событийном цикле"""
+    from django.core.handlers.asgi import ASGIHandler
+
+    application = ASGIHandler()
+    samples: list[float] = []
+
+    async def worker(remaining) -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await asgi_request(application, path, queries())
+            samples.append(time.perf_counter() - started)
+
+    async def gather() -> float:
+        remaining = iter(range(requests))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(remaining) for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+    return samples, asyncio.run(gather())
+
+
+SERVERS = {
+    "wsgi": (run_wsgi, "config.urls"),
+    "asgi": (run_asgi, "config.urls_asgi"),
+}
+
+
+def run(levels: list[int], requests: int, cold: bool) -> list[dict]:
+    """Метрики каждой доски для обоих обработчиков и уровней конкурентности"""
+    from django.test.utils import override_settings
+
+    rows = []
+    for concurrency in levels:
+        for name, path in board_paths().items():
+            for server, (runner, urlconf) in SERVERS.items():
+                with override_settings(ROOT_URLCONF=urlconf):
+                    queries = QueryStrings(cold)
+                    runner(path, queries, concurrency, concurrency)  # прогрев
+                    samples, elapsed = runner(path, queries, requests, concurrency)
+                rows.append(
+                    {
+                        "concurrency": concurrency,
+                        "route": name,
+                        "server": server,
+                        "rps": len(samples) / elapsed,
+                        **latency_summary(samples),
+                    }
+                )
+    return rows
+
+
+def print_table(rows: list[dict]) -> None:
+    """Таблица метрик"""
+    print(
+        f"{'conc':>5} {'route':<12} {'server':<6} {'rps':>8} "
+        f"{'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['concurrency']:>5} {row['route']:<12} {row['server']:<6} "
+            f"{row['rps']:>8.1f} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+            f"{row['p99_ms']:>8.2f}"
+        )
+
+
+def main() -> None:
+    """Точка входа"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY)
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--cold", action="store_true", help="Bypass the board cache on every request"
+    )
+    args = parser.parse_args()
+
+    # Задачи celery (события) выполняются в процессе, без брокера и таймера
+    os.environ["CELERY_BROKER_URL"] = ""
+    os.environ["TASK_EVENTS_FLUSH_INTERVAL"] = "0"
+    setup_django()
+    from benchmarks.bench_views import seed_to
+
+    with test_database():
+        # Воркер в процессе печатает созданные задачи - в отчёте они не нужны
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_to(args.size)
+        rows = run(args.concurrency, args.requests, args.cold)
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
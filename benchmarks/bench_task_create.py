@@ -0,0 +1,82 @@
+"""Задержка создания задачи через TaskCreateView
+
+Режимы:
+    eager  - брокер не настроен, задача celery выполняется в процессе;
+    memory - брокер в памяти без воркера: чистая стоимость постановки в очередь;
+    broker - брокер из CELERY_BROKER_URL; запустите воркер, чтобы получить
+             цифры "с воркером", или остановите его для "без воркера".
+
+    python -m benchmarks.bench_task_create --mode memory --requests 300
+"""
+
+import argparse
+import os
+import time
+from datetime import date
+
+from benchmarks.utils import latency_summary, setup_django, test_database
+
+
+MODES = ("eager", "memory", "broker")
+
+
+BROKER_URLS = {"eager": "", "memory": "memory://"}
+
+
+def configure_celery(mode: str) -> None:
+    """Брокер для режима бенчмарка (до загрузки настроек Django)"""
+    if mode in BROKER_URLS:
+        os.environ["CELERY_BROKER_URL"] = BROKER_URLS[mode]
+
+
+def run(mode: str, requests: int, warmup: int) -> dict[str, float]:
+    """Отправить requests форм создания задачи и замерить задержку"""
+    from django.test import Client
+    from django.urls import reverse
+
+    from user_app.models import CustomUser
+
+    user = CustomUser.objects.create_user(
+        email="bench@example.com", password="benchpass", full_name="Bench User"
+    )  # type: ignore
+    client = Client()
+    url = reverse("add_task_form")
+    samples = []
+    for i in range(warmup + requests):
+        data = {
+            "task_type": "task",
+            "title": f"Задача бенчмарка {i}",
+            "user_name": user.pk,
+            "body": "Описание",
+            "end_date": date.today().isoformat(),
+        }
+        started = time.perf_counter()
+        response = client.post(url, data)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 302:
+            raise RuntimeError(f"Unexpected status {response.status_code}")
+        if i >= warmup:
+            samples.append(elapsed)
+    return latency_summary(samples)
+
+
+def main() -> None:
+    """Точка входа"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=MODES, default="eager")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+
+    configure_celery(args.mode)
+    setup_django()
+    with test_database():
+        summary = run(args.mode, args.requests, args.warmup)
+    print(
+        f"mode={args.mode} requests={args.requests} "
+        + " ".join(f"{key}={value:.2f}" for key, value in summary.items())
+    )
+
+
+if __name__ == "__main__":
+    main()
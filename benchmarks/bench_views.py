@@ -0,0 +1,290 @@
+"""Запросы, время и пиковая память представлений на данных разного размера
+
+Для каждого размера из --sizes тестовая БД догенерируется (tasker_app.seeding)
+до нужного числа задач, затем каждый маршрут tasker_app/urls.py и
+user_app/urls.py запрашивается --repeat раз. Результаты сравниваются с
+базовой линией benchmarks/baseline_views.json: рост числа запросов - всегда
+регрессия, время и пиковая память Python - с допуском.
+
+    python -m benchmarks.bench_views
+    python -m benchmarks.bench_views --sizes 100 1000 --update-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.utils import setup_django, test_database
+
+
+URLCONFS = ("tasker_app.urls", "user_app.urls")
+BASELINE_PATH = Path(__file__).with_name("baseline_views.json")
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Маршруты, которые запрашиваются не простым GET
+POST_ROUTES = {"task_delete", "logout", "kanban_moves", "api_tasks_batch"}
+# JSON-тела POST-запросов по id первой задачи
+JSON_ROUTES = {
+    "kanban_moves": lambda pk: {"moves": [{"id": pk, "status": "active", "position": 0}]},
+    "api_tasks_batch": lambda pk: {"tasks": [{"id": pk, "body": "Описание из бенчмарка"}]},
+}
+# Маршруты, доступные только персоналу
+STAFF_ROUTES = {"task_export"}
+# Значения параметров маршрутов, кроме pk (он берётся из данных)
+ROUTE_VARIANTS = {"task_export": [{"fmt": "csv"}, {"fmt": "ndjson"}]}
+
+# Разница времени и памяти ниже этих порогов регрессией не считается
+TIME_FLOOR_MS = 5.0
+MEMORY_FLOOR_KB = 64.0
+
+
+@dataclass
+class Measurement:
+    """Метрики одного маршрута"""
+
+    queries: int
+    time_ms: float
+    peak_kb: float
+
+
+@dataclass
+class Route:
+    """Маршрут с параметрами и методом запроса"""
+
+    label: str
+    name: str
+    kwargs: dict
+    method: str = "get"
+
+    def request(self) -> tuple[str, dict]:
+        """Адрес и аргументы запроса; для удаления каждый раз создаётся новая задача"""
+        from django.urls import reverse
+
+        from tasker_app.models import Task
+
+        kwargs = dict(self.kwargs)
+        if "pk" in kwargs:
+            task = Task.objects.order_by("pk").first()
+            if self.name == "task_delete":
+                task.pk = None
+                task.save()
+            kwargs["pk"] = task.pk
+        data = {}
+        if self.name in JSON_ROUTES:
+            pk = Task.objects.order_by("pk").values_list("pk", flat=True).first()
+            data = {
+                "data": JSON_ROUTES[self.name](pk),
+                "content_type": "application/json",
+            }
+        return reverse(self.name, kwargs=kwargs), data
+
+
+def collect_routes() -> list[Route]:
+    """Все именованные маршруты приложений"""
+    from django.urls import get_resolver
+
+    routes = []
+    for urlconf in URLCONFS:
+        for pattern in get_resolver(urlconf).url_patterns:
+            params = set(pattern.pattern.converters)
+            method = "post" if pattern.name in POST_ROUTES else "get"
+            for variant in ROUTE_VARIANTS.get(pattern.name, [{}]):
+                missing = params - set(variant) - {"pk"}
+                if missing:
+                    raise RuntimeError(
+                        f"No benchmark values for {pattern.name}: {sorted(missing)}"
+                    )
+                kwargs = dict(variant, **dict.fromkeys(params & {"pk"}))
+                label = ":".join([pattern.name, *variant.values()])
+                routes.append(Route(label, pattern.name, kwargs, method))
+    return routes
+
+
+def seed_to(size: int) -> None:
+    """Догенерировать данные до size задач"""
+    from faker import Faker
+
+    from tasker_app import seeding
+    from tasker_app.models import Task
+
+    missing = size - Task.objects.count()
+    if missing > 0:
+        seeding.seed(
+            Faker("ru_RU"),
+            users=max(5, missing // 200),
+            tags=max(5, min(200, missing // 100)),
+            tasks=missing,
+            random_seed=size,
+        )
+
+
+def call(client, route: Route, request: tuple[str, dict]) -> None:
+    """Выполнить запрос и дочитать потоковый ответ"""
+    url, data = request
+    response = getattr(client, route.method)(url, **data)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{route.label}: status {response.status_code}")
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+
+
+def measure(client, route: Route, repeat: int) -> Measurement:
+    """Число запросов, лучшее время и пик памяти одного маршрута"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    call(client, route, route.request())  # прогрев
+    request = route.request()
+    with CaptureQueriesContext(connection) as ctx:
+        call(client, route, request)
+    queries = len(ctx.captured_queries)
+
+    samples = []
+    for _ in range(repeat):
+        request = route.request()
+        started = time.perf_counter()
+        call(client, route, request)
+        samples.append(time.perf_counter() - started)
+
+    request = route.request()
+    tracemalloc.start()
+    call(client, route, request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Measurement(
+        queries=queries,
+        # Лучшее из повторов меньше всего зависит от фоновой нагрузки
+        time_ms=round(min(samples) * 1000, 2),
+        peak_kb=round(peak / 1024, 1),
+    )
+
+
+def run(sizes: list[int], repeat: int) -> dict[str, dict[str, Measurement]]:
+    """Метрики всех маршрутов для каждого размера данных"""
+    from django.test import Client
+
+    from user_app.models import CustomUser
+
+    routes = collect_routes()
+    client = Client()
+    staff_client = Client()
+    staff_client.force_login(
+        CustomUser.objects.create_superuser(
+            email="bench-admin@example.com", full_name="Bench Admin"
+        )
+    )
+    results = {}
+    for size in sorted(sizes):
+        seed_to(size)
+        results[str(size)] = {
+            route.label: measure(
+                staff_client if route.name in STAFF_ROUTES else client, route, repeat
+            )
+            for route in routes
+        }
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, time_tolerance: float, memory_tolerance: float
+) -> list[str]:
+    """Регрессии относительно базовой линии"""
+    regressions = []
+    for size, routes in results.items():
+        for label, current in routes.items():
+            base = baseline.get(size, {}).get(label)
+            if base is None:
+                continue
+            name = f"{label} @ {size}"
+            if current.queries > base["queries"]:
+                regressions.append(
+                    f"{name}: queries {base['queries']} -> {current.queries}"
+                )
+            time_limit = max(
+                base["time_ms"] * (1 + time_tolerance), base["time_ms"] + TIME_FLOOR_MS
+            )
+            if current.time_ms > time_limit:
+                regressions.append(
+                    f"{name}: time {base['time_ms']}ms -> {current.time_ms}ms"
+                )
+            memory_limit = max(
+                base["peak_kb"] * (1 + memory_tolerance),
+                base["peak_kb"] + MEMORY_FLOOR_KB,
+            )
+            if current.peak_kb > memory_limit:
+                regressions.append(
+                    f"{name}: peak memory {base['peak_kb']}KB -> {current.peak_kb}KB"
+                )
+    return regressions
+
+
+def print_table(results: dict) -> None:
+    """Таблица метрик"""
+    print(f"{'size':>7} {'route':<24} {'queries':>7} {'time_ms':>9} {'peak_kb':>9}")
+    for size, routes in results.items():
+        for label, current in routes.items():
+            print(
+                f"{size:>7} {label:<24} {current.queries:>7} "
+                f"{current.time_ms:>9.2f} {current.peak_kb:>9.1f}"
+            )
+
+
+def main() -> None:
+    """Точка входа"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Save results as baseline"
+    )
+    parser.add_argument("--time-tolerance", type=float, default=1.0)
+    parser.add_argument("--memory-tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Задачи celery (события) выполняются в процессе, без брокера, и без
+    # таймера: фоновый сброс буфера искажал бы замеры памяти
+    os.environ["CELERY_BROKER_URL"] = ""
+    os.environ["TASK_EVENTS_FLUSH_INTERVAL"] = "0"
+    setup_django()
+    # Воркер в процессе печатает созданные задачи - в отчёте они не нужны.
+    # Остаток буфера событий сбрасывается здесь же, а не при выходе (atexit),
+    # пока вывод перенаправлен и тестовая БД ещё существует
+    with test_database(), contextlib.redirect_stdout(io.StringIO()):
+        from tasker_app import events
+
+        results = run(args.sizes, args.repeat)
+        events.flush()
+    print_table(results)
+
+    if args.update_baseline:
+        data = {
+            size: {label: asdict(m) for label, m in routes.items()}
+            for size, routes in results.items()
+        }
+        args.baseline.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, run with --update-baseline")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(
+        results, baseline, args.time_tolerance, args.memory_tolerance
+    )
+    if regressions:
+        print("Regressions:\n" + "\n".join(regressions))
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
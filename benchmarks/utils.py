@@ -0,0 +1,44 @@
+import os
+import statistics
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django() -> None:
+    """Инициализация Django для запуска бенчмарка как скрипта"""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Временная тестовая БД, удаляемая после бенчмарка"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """Перцентиль выборки (ближайший ранг)"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99/среднее в миллисекундах"""
+    return {
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+    }
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Доски и карточка задачи - асинхронные представления (tasker_app.async_views)
+os.environ.setdefault('ROOT_URLCONF', 'config.urls_asgi')
 
 application = get_asgi_application()
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 import os
 from pathlib import Path
+from celery.schedules import crontab
 from environ import environ
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,16 +48,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Отключается сам, если REQUEST_PROFILING = False
+    "tasker_app.profiling.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "user_app.middleware.TimezoneMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "config.urls"
+# config/asgi.py выбирает config.urls_asgi с асинхронными представлениями
+ROOT_URLCONF = env("ROOT_URLCONF", default="config.urls")
 
 TEMPLATES = [
     {
@@ -78,18 +83,27 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+# DB_ENGINE позволяет локально подставить SQLite (DB_NAME - путь к файлу)
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": env("DB_ENGINE", default="django.db.backends.postgresql_psycopg2"),
         "NAME": env("DB_NAME"),
-        "USER": env("DB_USER"),
-        "PASSWORD": env("DB_PASSWORD"),
-        "HOST": env("DB_HOST"),
-        "PORT": env("DB_PORT"),
+        "USER": env("DB_USER", default=""),
+        "PASSWORD": env("DB_PASSWORD", default=""),
+        "HOST": env("DB_HOST", default=""),
+        "PORT": env("DB_PORT", default=""),
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# CACHE_URL в формате django-environ, например redis://localhost:6379/1.
+# Кеш досок (BOARD_CACHE_ALIAS) должен быть общим для веб-процессов и
+# воркеров celery, кеш в памяти процесса годится только для одного процесса
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -130,6 +144,51 @@ AUTH_USER_MODEL = "user_app.CustomUser"
 
 
 # Настроки CELERY
-CELERY_BROKER_URL = "redis://localhost:6379/0"
+CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="redis://localhost:6379/0")
+# Без брокера (CELERY_BROKER_URL=) задачи выполняются в процессе веб-сервера
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
 CELERY_RESULT_BACKEND = "django-db"
 CEELERY_TASK_IGNORE_RESULT = False
+# Периодические задачи (celery -A config beat)
+CELERY_BEAT_SCHEDULE = {
+    "archive-closed-tasks": {
+        "task": "tasker_app.tasks.archive_closed_tasks",
+        "schedule": crontab(hour=3, minute=30),
+    },
+}
+
+# События задач отправляются воркеру пачками: по размеру или по времени
+TASK_EVENTS_BATCH_SIZE = env.int("TASK_EVENTS_BATCH_SIZE", default=100)
+TASK_EVENTS_FLUSH_INTERVAL = env.float("TASK_EVENTS_FLUSH_INTERVAL", default=2.0)
+
+# Живые обновления канбана (SSE, только под ASGI): брокер (LocalBroker -
+# подписчики процесса, RedisBroker - всех процессов через TASK_LIVE_REDIS_URL),
+# очередь подписчика, история для переподключения и интервал keepalive, с
+TASK_LIVE_BROKER = env("TASK_LIVE_BROKER", default="tasker_app.live.LocalBroker")
+TASK_LIVE_REDIS_URL = env("TASK_LIVE_REDIS_URL", default="redis://localhost:6379/2")
+TASK_LIVE_QUEUE_SIZE = env.int("TASK_LIVE_QUEUE_SIZE", default=100)
+TASK_LIVE_HISTORY = env.int("TASK_LIVE_HISTORY", default=500)
+TASK_LIVE_KEEPALIVE = env.float("TASK_LIVE_KEEPALIVE", default=15.0)
+
+# Массовые действия админки: выборки больше порога уходят в celery заданиями
+# по TASK_BULK_JOB_SIZE id, задание обрабатывает их частями по TASK_BULK_CHUNK_SIZE
+TASK_BULK_ASYNC_THRESHOLD = env.int("TASK_BULK_ASYNC_THRESHOLD", default=5000)
+TASK_BULK_JOB_SIZE = env.int("TASK_BULK_JOB_SIZE", default=10000)
+TASK_BULK_CHUNK_SIZE = env.int("TASK_BULK_CHUNK_SIZE", default=1000)
+
+# Архив закрытых задач: задачи, закрытые больше TASK_ARCHIVE_AFTER_DAYS дней
+# назад, переносятся из таблицы задач частями по TASK_ARCHIVE_CHUNK_SIZE
+TASK_ARCHIVE_AFTER_DAYS = env.int("TASK_ARCHIVE_AFTER_DAYS", default=90)
+TASK_ARCHIVE_CHUNK_SIZE = env.int("TASK_ARCHIVE_CHUNK_SIZE", default=1000)
+
+# Профилирование запросов: Server-Timing и сводка на /admin/profiling/
+REQUEST_PROFILING = env.bool("REQUEST_PROFILING", default=False)
+REQUEST_PROFILING_WINDOW = env.int("REQUEST_PROFILING_WINDOW", default=500)
+
+# Кеш данных досок: алиас из CACHES и время жизни записей в секундах
+BOARD_CACHE_ALIAS = env("BOARD_CACHE_ALIAS", default="default")
+BOARD_CACHE_TIMEOUT = env.int("BOARD_CACHE_TIMEOUT", default=300)
+
+# Полнотекстовый поиск задач: конфигурация текстового поиска PostgreSQL
+# (после изменения - python manage.py rebuild_search_index)
+TASK_SEARCH_CONFIG = env("TASK_SEARCH_CONFIG", default="russian")
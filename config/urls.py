@@ -1,7 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from tasker_app.board_cache import board_cache_stats
+from tasker_app.profiling import profiling_summary
+
 urlpatterns = [
+    path("admin/board-cache/", board_cache_stats, name="board_cache_stats"),
+    path("admin/profiling/", profiling_summary, name="profiling_summary"),
     path("admin/", admin.site.urls),
     path("", include("tasker_app.urls")),
     path("user/", include("user_app.urls")),
@@ -0,0 +1,14 @@
+"""Маршруты для ASGI: доски и карточка задачи - асинхронные представления
+
+Асинхронные маршруты стоят первыми и перекрывают синхронные с теми же
+адресами; остальные берутся из config/urls.py.
+"""
+
+from django.urls import include, path
+
+from config.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("", include("tasker_app.urls_async")),
+    *sync_urlpatterns,
+]
@@ -1,6 +1,53 @@
-from datetime import date
-from django.contrib import admin
-from .models import Task, Tag
+from celery.result import AsyncResult, GroupResult
+from celery.utils import uuid
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.http import JsonResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from user_app.models import CustomUser
+from . import bulk, counters, search
+from .models import Task, TaskEvent, Tag
+from .tasks import bulk_update_tasks, send_task
+
+
+class TaskActionForm(ActionForm):
+    """Параметры массовых действий над задачами"""
+
+    status = forms.ChoiceField(
+        choices=[("", "---------"), *Task.TaskStatus.choices],
+        required=False,
+        label="Статус",
+    )
+    task_type = forms.ChoiceField(
+        choices=[("", "---------"), *Task.TaskType.choices],
+        required=False,
+        label="Тип",
+    )
+    user_email = forms.EmailField(required=False, label="Email пользователя")
+    tag_name = forms.CharField(required=False, label="Тег")
+
+
+class AssigneeFilter(admin.SimpleListFilter):
+    """Фильтр по исполнителю с числом задач из счётчиков"""
+
+    title = "исполнитель"
+    parameter_name = "user_name"
+
+    def lookups(self, request, model_admin):
+        return [
+            (user_id, f"{full_name} ({total})")
+            for user_id, full_name, total in counters.count_by_user()
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value().isdigit():
+            return queryset.filter(user_name_id=self.value())
+        return queryset
 
 
 @admin.register(Task)
@@ -9,18 +56,168 @@ class TaskAdmin(admin.ModelAdmin):
 
     list_display = ("title", "user_name", "end_date", "created_at")
     ordering = ("end_date", "title")
-    list_filter = ("user_name", "end_date", "created_at")
-    search_fields = ("title", "user_name__full_name", "body", "end_date", "created_at")
-    search_help_text = "Поиск по всем полям задачи"
+    list_filter = (AssigneeFilter, "end_date", "created_at")
+    # Поиск идёт по поисковому индексу (get_search_results), поле нужно
+    # только чтобы админка показала строку поиска
+    search_fields = ("title",)
+    search_help_text = "Полнотекстовый поиск по названию, описанию и тегам"
+    action_form = TaskActionForm
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_tasks(queryset, search_term), False
+
+    def run_bulk(self, request, queryset, operation: str, **params) -> None:
+        """Выполнить массовую операцию сразу или отдать большую выборку в celery"""
+        threshold = settings.TASK_BULK_ASYNC_THRESHOLD
+        ids = list(queryset.values_list("pk", flat=True)[: threshold + 1])
+        if len(ids) <= threshold:
+            count = bulk.apply(operation, ids, **params)
+            self.message_user(request, f"Изменено задач: {count}", messages.SUCCESS)
+            return
+        # Id читаются и отправляются частями: ни память запроса, ни
+        # сообщения брокеру не растут с размером выборки
+        results, total = [], 0
+        for chunk in bulk.chunk_ids(queryset, settings.TASK_BULK_JOB_SIZE):
+            results.append(send_task(bulk_update_tasks, operation, chunk, params))
+            total += len(chunk)
+        if all(result.ready() for result in results):
+            # Задания выполнены в процессе (без брокера): итог их бэкенд
+            # результатов не сохраняет, страница прогресса его не покажет
+            self.report_jobs(request, results)
+            return
+        group = GroupResult(uuid(), results)
+        group.save()
+        status_url = reverse("admin:tasker_app_task_bulk_job", args=[group.id])
+        self.message_user(
+            request,
+            format_html(
+                'Изменение {} задач запущено в фоне: <a href="{}">прогресс</a>',
+                total,
+                status_url,
+            ),
+            messages.INFO,
+        )
+
+    def report_jobs(self, request, results) -> None:
+        """Сообщение об итоге выполненных заданий массовой операции"""
+        failed = next((result for result in results if not result.successful()), None)
+        if failed is None:
+            count = sum(result.result["done"] for result in results)
+            self.message_user(request, f"Изменено задач: {count}", messages.SUCCESS)
+        else:
+            self.message_user(
+                request, f"Массовая операция не выполнена: {failed.result}", messages.ERROR
+            )
+
+    def get_action_param(self, request, name: str):
+        """Значение параметра действия из формы действий"""
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid() or not form.cleaned_data[name]:
+            self.message_user(
+                request,
+                f"Укажите поле «{form.fields[name].label}» для этого действия",
+                messages.ERROR,
+            )
+            return None
+        return form.cleaned_data[name]
 
     @admin.action(description='Сделать дату окончания "Сегодня"')
     def set_end_date_today(self, request, queryset):
         """Сделать дату окончания "Сегодня" для выбранных задач"""
-        for task in queryset:
-            task.end_date = date.today()
-            task.save()
+        self.run_bulk(
+            request, queryset, "set_fields", end_date=timezone.localdate().isoformat()
+        )
+
+    @admin.action(description="Изменить статус")
+    def set_status(self, request, queryset):
+        """Установить выбранным задачам статус из формы действий"""
+        status = self.get_action_param(request, "status")
+        if status:
+            self.run_bulk(request, queryset, "set_fields", status=status)
+
+    @admin.action(description="Изменить тип")
+    def set_task_type(self, request, queryset):
+        """Установить выбранным задачам тип из формы действий"""
+        task_type = self.get_action_param(request, "task_type")
+        if task_type:
+            self.run_bulk(request, queryset, "set_fields", task_type=task_type)
+
+    @admin.action(description="Переназначить пользователя")
+    def reassign_user(self, request, queryset):
+        """Назначить выбранные задачи пользователю с указанным email"""
+        email = self.get_action_param(request, "user_email")
+        if not email:
+            return
+        user_id = (
+            CustomUser.objects.filter(email__iexact=email)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if user_id is None:
+            self.message_user(request, f"Пользователь {email} не найден", messages.ERROR)
+            return
+        self.run_bulk(request, queryset, "set_fields", user_name_id=user_id)
+
+    @admin.action(description="Добавить тег")
+    def add_tag(self, request, queryset):
+        """Добавить выбранным задачам тег (создаётся при необходимости)"""
+        name = self.get_action_param(request, "tag_name")
+        if name:
+            # Существующий тег ищется без учёта регистра и лишних пробелов
+            tags, _ = Tag.objects.get_or_create_many([name])
+            self.run_bulk(request, queryset, "add_tag", tag_id=tags[name])
+
+    @admin.action(description="Снять тег")
+    def remove_tag(self, request, queryset):
+        """Снять с выбранных задач тег"""
+        name = self.get_action_param(request, "tag_name")
+        if not name:
+            return
+        tags, _ = Tag.objects.get_or_create_many([name], create=False)
+        if tags.get(name) is None:
+            self.message_user(request, f"Тег {name} не найден", messages.ERROR)
+            return
+        self.run_bulk(request, queryset, "remove_tag", tag_id=tags[name])
 
-    actions = (set_end_date_today,)  # type: ignore
+    actions = (  # type: ignore
+        set_end_date_today,
+        set_status,
+        set_task_type,
+        reassign_user,
+        add_tag,
+        remove_tag,
+    )
+
+    def get_urls(self):
+        return [
+            path(
+                "bulk-jobs/<str:job_id>/",
+                self.admin_site.admin_view(self.bulk_job_view),
+                name="tasker_app_task_bulk_job",
+            ),
+            *super().get_urls(),
+        ]
+
+    def bulk_job_view(self, request, job_id: str):
+        """Прогресс фоновой массовой операции по всем её заданиям"""
+        group = GroupResult.restore(job_id)
+        results = group.results if group is not None else [AsyncResult(job_id)]
+        infos = [result.info if isinstance(result.info, dict) else {} for result in results]
+        states = {result.state for result in results}
+        if len(states) > 1:
+            states = {"FAILURE"} if "FAILURE" in states else {"PROGRESS"}
+        # Общее число известно, когда все задания начали работу
+        totals = [info.get("total") for info in infos]
+        return JsonResponse(
+            {
+                "state": states.pop(),
+                "done": sum(info.get("done", 0) for info in infos),
+                "total": None if None in totals else sum(totals),
+            }
+        )
 
 
 @admin.register(Tag)
@@ -32,3 +229,13 @@ class TagAdmin(admin.ModelAdmin):
     list_filter = ("name",)
     search_fields = ("name",)
     search_help_text = "Поиск по имени тега"
+
+
+@admin.register(TaskEvent)
+class TaskEventAdmin(admin.ModelAdmin):
+    """Админка для журнала событий задач"""
+
+    list_display = ("task_id", "kind", "occurred_at", "recorded_at")
+    list_filter = ("kind",)
+    search_fields = ("task_id",)
+    ordering = ("-id",)
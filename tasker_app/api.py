@@ -0,0 +1,241 @@
+"""Компактный JSON API: списки задач, тегов, исполнителей и пакетная запись задач
+
+Списки отдаются страницами по курсору (tasker_app.pagination) в виде
+{"results": [...], "next": курсор или null}. Параметр fields (через
+запятую) выбирает поля ответа, и в SELECT попадают только они и ключ
+сортировки: строки читаются через values(), без создания объектов моделей.
+Страница стоит одного запроса, теги задач - ещё одного к сквозной таблице.
+
+Пакетная запись (TaskBatchView) создаёт и изменяет сотни задач за
+постоянное число запросов через tasker_app.bulk.
+"""
+
+import json
+
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.generic import View
+
+from tasker_app import bulk
+from tasker_app.forms import TaskBatchForm, TaskFilterForm, TaskModelForm
+from tasker_app.models import Tag, Task
+from tasker_app.pagination import InvalidCursor, KeysetPaginator
+from user_app.models import CustomUser
+
+
+class ApiListView(View):
+    """Список объектов: поля fields, размер страницы limit, курсор cursor
+
+    fields - поля ответа и поля выборки values(), из которых они берутся;
+    поле со значением None (или вычисляемое из выборки) заполняет
+    add_related_fields.
+    """
+
+    queryset = None
+    fields: dict[str, str | None]
+    default_fields: tuple[str, ...]
+    ordering = ("id",)
+    filter_form: type | None = None
+    per_page = 50
+    max_per_page = 200
+
+    def get_fields(self, value: str | None) -> tuple[list[str], list[str]]:
+        """Запрошенные поля ответа и неизвестные среди них"""
+        if not value:
+            return list(self.default_fields), []
+        names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+        return names, [name for name in names if name not in self.fields]
+
+    def get_limit(self) -> int:
+        """Размер страницы из параметра limit"""
+        try:
+            limit = int(self.request.GET.get("limit", self.per_page))
+        except ValueError:
+            return self.per_page
+        return max(1, min(limit, self.max_per_page))
+
+    def add_related_fields(self, rows: list[dict], names: list[str]) -> None:
+        """Заполнить поля, которых нет в выборке (по умолчанию их нет)"""
+
+    def get(self, request):
+        """Страница списка"""
+        names, unknown = self.get_fields(request.GET.get("fields"))
+        if unknown:
+            return JsonResponse(
+                {"errors": {"fields": [f"Неизвестные поля: {', '.join(unknown)}"]}},
+                status=400,
+            )
+        queryset = self.queryset.all()  # type: ignore
+        if self.filter_form is not None:
+            form = self.filter_form(request.GET)
+            if not form.is_valid():
+                return JsonResponse({"errors": form.errors}, status=400)
+            queryset = form.filter(queryset)
+
+        lookups = {self.fields[name] for name in names} - {None}
+        queryset = queryset.values(*lookups.union(self.ordering))
+        paginator = KeysetPaginator(queryset, self.get_limit(), ordering=self.ordering)
+        try:
+            page = paginator.page(request.GET.get("cursor"))
+        except InvalidCursor as exc:
+            return JsonResponse({"errors": {"cursor": [str(exc)]}}, status=400)
+
+        rows = page.object_list
+        self.add_related_fields(rows, names)
+        results = [
+            {name: row[name] if name in row else row[self.fields[name]] for name in names}
+            for row in rows
+        ]
+        return JsonResponse({"results": results, "next": page.next_cursor})
+
+
+class TaskListView(ApiListView):
+    """Задачи по сроку с фильтрами TaskFilterForm; теги - списком id"""
+
+    queryset = Task.objects.all()
+    # Поля записи (TaskBatchView) и поля, которые только читаются
+    fields = {
+        "id": "id",
+        **TaskBatchForm.MODEL_FIELDS,
+        "rank": "rank",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+        # updated_at без округления: версия для пакетной записи (Task.version)
+        "version": "updated_at",
+        "user_full_name": "user_name__full_name",
+        "tags": None,
+    }
+    default_fields = ("id", "title", "task_type", "status", "end_date", "user", "tags")
+    ordering = ("end_date", "id")
+    filter_form = TaskFilterForm
+
+    def add_related_fields(self, rows: list[dict], names: list[str]) -> None:
+        if "version" in names:
+            for row in rows:
+                row["version"] = row["updated_at"].isoformat()
+        if "tags" not in names or not rows:
+            return
+        tags: dict[int, list[int]] = {row["id"]: [] for row in rows}
+        links = (
+            Task.tags.through.objects.filter(task_id__in=tags)
+            .order_by("tag_id")
+            .values_list("task_id", "tag_id")
+        )
+        for task_id, tag_id in links:
+            tags[task_id].append(tag_id)
+        for row in rows:
+            row["tags"] = tags[row["id"]]
+
+
+class TagListView(ApiListView):
+    """Теги"""
+
+    queryset = Tag.objects.all()
+    fields = {"id": "id", "name": "name"}
+    default_fields = ("id", "name")
+
+
+class UserListView(ApiListView):
+    """Исполнители (почта не отдаётся)"""
+
+    queryset = CustomUser.objects.all()
+    fields = {"id": "id", "full_name": "full_name"}
+    default_fields = ("id", "full_name")
+
+
+class TaskBatchView(View):
+    """Пакетная запись задач: {"tasks": [{...}, ...]}
+
+    Задачи с id изменяются, без id - создаются (TaskBatchForm). Пакет
+    проверяется целиком: исполнители и теги ищутся одним запросом каждый,
+    затем корректные задачи записываются одной транзакцией. Ответ -
+    результат каждой задачи в порядке пакета: result (created, updated,
+    invalid, missing, conflict), id и ошибки.
+    """
+
+    max_tasks = 500
+
+    def post(self, request):
+        """Записать пакет"""
+        try:
+            items = json.loads(request.body)["tasks"]
+        except (ValueError, KeyError, TypeError):
+            items = None
+        if not isinstance(items, list):
+            return JsonResponse({"errors": "Ожидается JSON с полем tasks"}, status=400)
+        if len(items) > self.max_tasks:
+            return JsonResponse(
+                {"errors": f"Не больше {self.max_tasks} задач за раз"}, status=400
+            )
+        forms = [TaskBatchForm(item if isinstance(item, dict) else {}) for item in items]
+        self.check_references([form for form in forms if form.is_valid()])
+        ready = [form for form in forms if not form.errors]
+
+        with transaction.atomic():
+            created = self.create([form for form in ready if form.cleaned_data["id"] is None])
+            updated = self.update([form for form in ready if form.cleaned_data["id"]])
+        return JsonResponse(
+            {"results": [self.get_result(form, created, updated) for form in forms]}
+        )
+
+    @staticmethod
+    def check_references(forms: list[TaskBatchForm]) -> None:
+        """Исполнители и теги существуют, задача встречается в пакете один раз"""
+        users = {form.cleaned_data["user"] for form in forms if form.given("user")}
+        tags = {pk for form in forms for pk in form.cleaned_data["tags"] or []}
+        known_users = set(CustomUser.objects.filter(pk__in=users).values_list("pk", flat=True))
+        known_tags = set(Tag.objects.filter(pk__in=tags).values_list("pk", flat=True))
+        seen = set()
+        for form in forms:
+            if form.given("user") and form.cleaned_data["user"] not in known_users:
+                form.add_error("user", "Исполнитель не найден")
+            missing = sorted(set(form.cleaned_data.get("tags") or []) - known_tags)
+            if missing:
+                form.add_error("tags", f"Теги не найдены: {', '.join(map(str, missing))}")
+            pk = form.cleaned_data.get("id")
+            if pk in seen:
+                form.add_error("id", "Задача уже есть в пакете")
+            elif pk is not None:
+                seen.add(pk)
+
+    @staticmethod
+    def create(forms: list[TaskBatchForm]) -> dict[TaskBatchForm, int]:
+        """Создать задачи; {форма: id задачи}"""
+        if not forms:
+            return {}
+        tasks = [Task(**form.get_values()) for form in forms]
+        bulk.create_tasks(
+            tasks, [form.cleaned_data["tags"] or [] for form in forms], record=True
+        )
+        return {form: task.pk for form, task in zip(forms, tasks)}
+
+    @staticmethod
+    def update(forms: list[TaskBatchForm]) -> dict[int, str]:
+        """Изменить задачи; {id: результат bulk.update_tasks}"""
+        if not forms:
+            return {}
+        data = [(form.cleaned_data["id"], form) for form in forms]
+        return bulk.update_tasks(
+            {pk: form.get_values() for pk, form in data},
+            {
+                pk: form.cleaned_data["tags"]
+                for pk, form in data
+                if form.cleaned_data["tags"] is not None
+            },
+            {pk: form.cleaned_data["version"] or None for pk, form in data},
+        )
+
+    @staticmethod
+    def get_result(form: TaskBatchForm, created: dict, updated: dict) -> dict:
+        """Результат одной задачи пакета"""
+        if form in created:
+            return {"result": "created", "id": created[form]}
+        pk = form.cleaned_data.get("id")
+        if form.errors:
+            return {"result": "invalid", "errors": form.errors}
+        result = {"result": updated[pk], "id": pk}
+        if updated[pk] == "missing":
+            result["errors"] = {"id": ["Задача не найдена"]}
+        elif updated[pk] == "conflict":
+            result["errors"] = {"version": [TaskModelForm.CONFLICT_MESSAGE]}
+        return result
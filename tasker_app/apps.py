@@ -6,3 +6,6 @@ class TaskerAppConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasker_app"
+
+    def ready(self):
+        from tasker_app import checks, signals  # pylint: disable=unused-import
@@ -0,0 +1,184 @@
+"""Архив закрытых задач
+
+Закрытые задачи, которые не менялись TASK_ARCHIVE_AFTER_DAYS дней, celery
+раз в сутки (archive_closed_tasks) переносит вместе со связями с тегами из
+таблицы задач в ArchivedTask. Таблица задач и её индексы, по которым
+работают доски, остаются размером с рабочий набор. Карточка задачи читает
+архив, если задачи нет в таблице (TaskDetailView), команда restore_tasks
+возвращает задачи обратно.
+
+Строки переносятся INSERT ... SELECT и DELETE частями по
+TASK_ARCHIVE_CHUNK_SIZE задач, каждая часть - в своей транзакции за
+постоянное число запросов. Архивные задачи не входят в счётчики и поиск,
+канбан получает о них события удаления.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasker_app import board_cache, counters, events, search
+from tasker_app.models import ArchivedTask, Task, TaskEvent
+
+
+TaskTag = Task.tags.through
+ArchivedTaskTag = ArchivedTask.tags.through
+
+# Общие столбцы задачи и архивной задачи
+COLUMNS = (
+    "id",
+    "title",
+    "user_name_id",
+    "body",
+    "end_date",
+    "created_at",
+    "updated_at",
+    "task_type",
+    "status",
+    "rank",
+)
+# Столбцы связи архивной задачи с тегом и столбцы связи задачи, из которых
+# они берутся
+ARCHIVED_LINK_COLUMNS = {"archivedtask_id": "task_id", "tag_id": "tag_id"}
+
+
+def _table(model) -> str:
+    return model._meta.db_table  # pylint: disable=protected-access
+
+
+def _copy(source, target, columns: dict[str, str], ids: list[int], params=()):
+    # INSERT INTO target SELECT ... FROM source: columns - столбец target и
+    # выражение source для него, params - значения %s в выражениях. Строки
+    # выбираются по первому столбцу (id задачи)
+    quote = connection.ops.quote_name
+    key = next(iter(columns.values()))
+    placeholders = ", ".join(["%s"] * len(ids))
+    sql = (
+        f"INSERT INTO {quote(_table(target))} ({', '.join(map(quote, columns))}) "
+        f"SELECT {', '.join(columns.values())} FROM {quote(_table(source))} "
+        f"WHERE {quote(key)} IN ({placeholders})"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *ids])
+
+
+def _delete(model, key: str, ids: list[int]) -> None:
+    # DELETE без сбора связанных объектов и сигналов удаления
+    quote = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(_table(model))} WHERE {quote(key)} IN ({placeholders})",
+            ids,
+        )
+
+
+def archive_closed(days: int | None = None) -> int:
+    """Перенести в архив задачи, закрытые больше days дней назад; их число
+
+    Закрытой считается задача со статусом closed, дата закрытия - её
+    последнее изменение (updated_at). По умолчанию days -
+    TASK_ARCHIVE_AFTER_DAYS.
+    """
+    if days is None:
+        days = settings.TASK_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+    size = settings.TASK_ARCHIVE_CHUNK_SIZE
+    total = 0
+    while True:
+        count = _archive_chunk(cutoff, size)
+        total += count
+        if count < size:
+            return total
+
+
+def _archive_chunk(cutoff, size: int) -> int:
+    with transaction.atomic():
+        # Задачи, которые сейчас меняют другие запросы, уйдут в следующий раз
+        rows = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.TaskStatus.CLOSED, updated_at__lt=cutoff)
+            .order_by("pk")
+            .values_list("pk", "title", "end_date", *counters.KEY_FIELDS)[:size]
+        )
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        _copy(
+            Task,
+            ArchivedTask,
+            {**{column: column for column in COLUMNS}, "archived_at": "%s"},
+            ids,
+            [now],
+        )
+        _copy(TaskTag, ArchivedTaskTag, ARCHIVED_LINK_COLUMNS, ids)
+        _delete(TaskTag, "task_id", ids)
+        _delete(Task, "id", ids)
+
+        events.record(
+            [
+                events.make_event(TaskEvent.Kind.DELETED, pk, title=title, archived=True)
+                for pk, title, *_ in rows
+            ]
+        )
+        deltas: Counter = Counter()
+        deltas.subtract(tuple(row[3:]) for row in rows)
+        counters.apply(deltas)
+        board_cache.bump_tasks([row[2] for row in rows])
+        search.update_documents(ids)
+    return len(rows)
+
+
+def restore(ids) -> list[int]:
+    """Вернуть задачи из архива с прежними id; id восстановленных задач
+
+    Задачи получают новую отметку изменения: следующий перенос в архив
+    не заберёт их сразу же. Задачи, которых нет в архиве, пропускаются.
+    """
+    ids = sorted(set(ids))
+    size = settings.TASK_ARCHIVE_CHUNK_SIZE
+    restored = []
+    for start in range(0, len(ids), size):
+        restored += _restore_chunk(ids[start : start + size])
+    return restored
+
+
+def _restore_chunk(ids: list[int]) -> list[int]:
+    with transaction.atomic():
+        rows = list(
+            ArchivedTask.objects.select_for_update()
+            .filter(pk__in=ids)
+            .order_by("pk")
+            .values_list("pk", "title", "end_date", "rank", *counters.KEY_FIELDS)
+        )
+        if not rows:
+            return []
+        ids = [row[0] for row in rows]
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        columns = {column: column for column in COLUMNS}
+        _copy(ArchivedTask, Task, {**columns, "updated_at": "%s"}, ids, [now])
+        _copy(
+            ArchivedTaskTag,
+            TaskTag,
+            {column: source for source, column in ARCHIVED_LINK_COLUMNS.items()},
+            ids,
+        )
+        _delete(ArchivedTaskTag, "archivedtask_id", ids)
+        _delete(ArchivedTask, "id", ids)
+
+        events.record(
+            [
+                events.make_event(
+                    TaskEvent.Kind.CREATED, pk, title=title, status=status, rank=rank
+                )
+                for pk, title, _, rank, _, status, _ in rows
+            ]
+        )
+        counters.apply(Counter(tuple(row[4:]) for row in rows))
+        board_cache.bump_tasks([row[2] for row in rows])
+        search.update_documents(ids)
+    return ids
@@ -0,0 +1,172 @@
+"""Асинхронные представления досок и карточки задачи для ASGI
+
+Те же страницы, что и в tasker_app.views, но агрегаты валидаторов, выборки
+задач с тегами и исполнителями, счётчики и кеш досок читаются асинхронным
+API Django (aaggregate, aiterator, aprefetch_related_objects, aget), и
+событийный цикл сервера не ждёт БД в потоке. Шаблон, как и у синхронных
+представлений, рендерит обработчик Django (TemplateResponse). Маршруты -
+tasker_app/urls_async.py, их подключает config/asgi.py.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.db.models import Max
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+
+from tasker_app import board_cache, counters, live
+from tasker_app.models import Task
+from tasker_app.pagination import InvalidCursor, KeysetPage
+from tasker_app.views import (
+    BoardPaginationMixin,
+    ConditionalGetMixin,
+    IndexTemplateView,
+    KanbanEventsView,
+    KanbanTemplateView,
+    TaskDetailView,
+    TodayTemplateView,
+)
+
+
+def _has_messages(request) -> bool:
+    # Сообщения читаются из cookie и сессии (запрос к БД)
+    return bool(messages.get_messages(request))
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """ConditionalGetMixin с асинхронными запросами к БД и кешу
+
+    Контекст шаблона строит корутина aget_context_data, по умолчанию -
+    синхронный get_context_data в потоке.
+    """
+
+    async def aget_context_data(self, **kwargs) -> dict:
+        """Контекст шаблона"""
+        return await sync_to_async(self.get_context_data)(**kwargs)
+
+    async def aget_validation_state(self) -> tuple[list, float | None]:
+        """get_validation_state() с асинхронными запросами"""
+        state = await self.get_validation_queryset().aaggregate(**self.validators)
+        (version,) = await board_cache.aget_versions(board_cache.BOARD)
+        return self.get_queryset_state(state, version)
+
+    # Асинхронный get делает представление асинхронным (View.view_is_async)
+    async def get(self, request, *args, **kwargs):  # pylint: disable=invalid-overridden-method
+        """304, если страница у клиента актуальна, иначе полный ответ"""
+        state = await self.aget_validation_state()
+        user = await request.auser()
+        etag, timestamp = self.get_validators(state, user.pk)
+        response = None
+        if not await sync_to_async(_has_messages)(request):
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+        if response is None:
+            context = await self.aget_context_data(**kwargs)
+            response = self.render_to_response(context)  # type: ignore
+        return self.finish_response(response, etag, timestamp)
+
+
+class AsyncBoardMixin(BoardPaginationMixin):
+    """Данные доски из кеша досок или из корутины abuild_board"""
+
+    async def aget_tasks_state(self) -> dict:
+        """get_tasks_state() с асинхронными запросами"""
+        return {
+            "counts": await counters.acount_by_status(),
+            **await Task.objects.aaggregate(last_modified=Max("updated_at")),
+        }
+
+    async def aget_validation_state(self) -> tuple[list, float | None]:
+        """Состояние доски из кеша досок, счётчиков и отметки изменения задач"""
+        return self.get_board_state(
+            await board_cache.aget_state(*self.get_board_scopes()),
+            await self.aget_tasks_state(),
+        )
+
+    async def apaginate_tasks(self, queryset) -> KeysetPage:
+        """Страница задач после курсора из параметра cursor"""
+        try:
+            return await self.get_paginator(queryset).apage(self.get_cursor())
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+
+    async def abuild_board(self):
+        """Данные доски: по умолчанию страница задач"""
+        return await self.apaginate_tasks(self.get_board_queryset())
+
+    async def aget_context_data(self, **kwargs) -> dict:
+        """Контекст шаблона с данными доски"""
+        board = await board_cache.aget_or_build(
+            self.board_name,
+            self.get_board_key_params(),
+            self.abuild_board,
+            self.get_board_scopes(),
+        )
+        return self.get_context_data(board=board, **kwargs)
+
+
+class AsyncIndexTemplateView(
+    AsyncBoardMixin, AsyncConditionalGetMixin, IndexTemplateView
+):
+    """Главная страница"""
+
+
+class AsyncKanbanTemplateView(
+    AsyncBoardMixin, AsyncConditionalGetMixin, KanbanTemplateView
+):
+    """Канбан"""
+
+    async def abuild_board(self) -> dict[str, KeysetPage]:
+        paginator = self.get_paginator(self.get_board_queryset())
+        try:
+            columns = await paginator.acolumn_pages("status", self.get_column_cursors())
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+        return self.set_totals(columns, await self.aget_status_counts())
+
+    async def aget_status_counts(self) -> dict[str, int]:
+        """get_status_counts() с асинхронным запросом к счётчикам"""
+        if self.tasks_state is not None:
+            return self.tasks_state["counts"]
+        return await counters.acount_by_status()
+
+
+class AsyncTodayTemplateView(
+    AsyncBoardMixin, AsyncConditionalGetMixin, TodayTemplateView
+):
+    """Задачи на сегодня"""
+
+    async def aget_tasks_state(self) -> dict:
+        return await Task.get_by_date(self.today).aaggregate(**self.validators)
+
+
+class AsyncTaskDetailView(AsyncConditionalGetMixin, TaskDetailView):
+    """Карточка задачи (и задачи из архива)"""
+
+    async def aget_context_data(self, **kwargs) -> dict:
+        try:
+            # Как в DetailView.get
+            # pylint: disable-next=attribute-defined-outside-init
+            self.object = await self.get_queryset().aget(pk=self.kwargs["pk"])
+        except Task.DoesNotExist as exc:
+            # pylint: disable-next=attribute-defined-outside-init
+            self.object = await self.archive_queryset.filter(pk=self.kwargs["pk"]).afirst()
+            if self.object is None:
+                raise Http404("Задача не найдена") from exc
+        return self.get_context_data(object=self.object)
+
+
+class AsyncKanbanEventsView(KanbanEventsView):
+    """Поток изменений задач: ждёт событий, не занимая поток"""
+
+    async def get(self, request):  # pylint: disable=invalid-overridden-method
+        """Кадры SSE до отключения клиента"""
+        response = StreamingHttpResponse(
+            live.stream(request.headers.get("Last-Event-ID")),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx не должен буферизовать поток
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,237 @@
+"""Кеш данных досок с версиями
+
+Данные страниц досок кешируются под ключом, в который входят счётчики версий
+областей (scope), от которых они зависят. Изменения (сигналы и
+tasker_app.bulk) увеличивают счётчики - старые записи просто перестают
+читаться и вытесняются по таймауту:
+
+- BOARD - теги и исполнители, от них зависят все доски;
+- TASKS - любые задачи (главная, канбан);
+- day_scope(дата) - задачи с этим сроком (страница "Сегодня").
+
+Инвалидация стоит один incr независимо от числа закешированных страниц.
+Версии видны всем процессам только в общем кеше (Redis, Memcached, БД): в
+кеше в памяти процесса (locmem) версии, увеличенные воркерами celery и
+другими веб-процессами, до текущего процесса не доходят. Об этом
+предупреждает проверка tasker_app.W001 (tasker_app.checks).
+
+Рядом с версией хранится время её последнего увеличения: по версиям и
+времени, вместе с отметкой изменения задач из БД, доски отвечают 304 Not
+Modified без выборки задач.
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import caches
+from django.db import transaction
+from django.http import JsonResponse
+
+
+BOARD = "board"
+TASKS = "tasks"
+
+
+def day_scope(day) -> str:
+    """Область задач со сроком day"""
+    return f"day:{day.isoformat()}"
+
+
+def get_cache():
+    """Кеш досок (BOARD_CACHE_ALIAS)"""
+    return caches[settings.BOARD_CACHE_ALIAS]
+
+
+def _version_key(scope: str) -> str:
+    return f"boards:version:{scope}"
+
+
+def _modified_key(scope: str) -> str:
+    return f"boards:modified:{scope}"
+
+
+def _state_keys(scopes) -> list[str]:
+    return [*map(_version_key, scopes), *map(_modified_key, scopes)]
+
+
+def _split_state(scopes, found: dict) -> tuple[list[int], float | None]:
+    versions = [found[_version_key(scope)] for scope in scopes]
+    modified = [found.get(_modified_key(scope)) for scope in scopes]
+    return versions, None if None in modified else max(modified)
+
+
+def get_state(*scopes: str) -> tuple[list[int], float | None]:
+    """Версии scopes и время их последнего изменения одним обращением к кешу
+
+    Время (timestamp) - последнее увеличение любой из версий или появление
+    версии в кеше; None, если для какой-то из версий оно вытеснено.
+    """
+    cache = get_cache()
+    found = cache.get_many(_state_keys(scopes))
+    for scope in scopes:
+        key = _version_key(scope)
+        if key not in found:
+            # Начальная версия из времени не совпадёт с версиями записей,
+            # оставшихся в кеше после вытеснения счётчика
+            now = time.time_ns()
+            cache.add(key, now)
+            cache.add(_modified_key(scope), now / 1e9)
+            found[key] = cache.get(key)
+            found[_modified_key(scope)] = now / 1e9
+    return _split_state(scopes, found)
+
+
+async def aget_state(*scopes: str) -> tuple[list[int], float | None]:
+    """get_state() для асинхронных представлений"""
+    cache = get_cache()
+    found = await cache.aget_many(_state_keys(scopes))
+    for scope in scopes:
+        key = _version_key(scope)
+        if key not in found:
+            now = time.time_ns()
+            await cache.aadd(key, now)
+            await cache.aadd(_modified_key(scope), now / 1e9)
+            found[key] = await cache.aget(key)
+            found[_modified_key(scope)] = now / 1e9
+    return _split_state(scopes, found)
+
+
+def get_versions(*scopes: str) -> list[int]:
+    """Текущие версии scopes одним обращением к кешу"""
+    return get_state(*scopes)[0]
+
+
+async def aget_versions(*scopes: str) -> list[int]:
+    """get_versions() для асинхронных представлений"""
+    return (await aget_state(*scopes))[0]
+
+
+@dataclass(frozen=True)
+class _Increment:
+    """Увеличение версий scopes; равные экземпляры - один колбэк on_commit"""
+
+    scopes: tuple[str, ...]
+
+    def __call__(self) -> None:
+        cache = get_cache()
+        for scope in self.scopes:
+            key = _version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                if not cache.add(key, time.time_ns()):
+                    cache.incr(key)
+        cache.set_many({_modified_key(scope): time.time() for scope in self.scopes})
+
+
+def bump_version(*scopes: str) -> None:
+    """Сделать устаревшими данные scopes (по умолчанию всех досок)
+
+    Версия увеличивается сразу и ещё раз после коммита транзакции: иначе
+    конкурентный запрос мог бы закешировать под новой версией данные,
+    прочитанные до коммита.
+    """
+    scopes = scopes or (BOARD,)
+    increment = _Increment(scopes)
+    increment()
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return
+    # Одного увеличения после коммита достаточно на всю транзакцию; колбэки
+    # откаченных точек сохранения Django удаляет сам
+    if increment not in [func for _, func, _ in connection.run_on_commit]:
+        transaction.on_commit(increment)
+
+
+def bump_tasks(days) -> None:
+    """Изменились задачи со сроками days"""
+    bump_version(TASKS, *sorted({day_scope(day) for day in days if day}))
+
+
+class CacheStats:
+    """Попадания и промахи кеша по доскам в текущем процессе"""
+
+    def __init__(self):
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name: str, hit: bool) -> None:
+        """Учесть обращение к доске name"""
+        with self._lock:
+            (self.hits if hit else self.misses)[name] += 1
+
+    def clear(self) -> None:
+        """Обнулить счётчики"""
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+    def summary(self) -> dict[str, dict]:
+        """Попадания, промахи и доля попаданий по доскам"""
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            return {
+                name: {
+                    "hits": self.hits[name],
+                    "misses": self.misses[name],
+                    "hit_ratio": round(
+                        self.hits[name] / (self.hits[name] + self.misses[name]), 3
+                    ),
+                }
+                for name in names
+            }
+
+
+stats = CacheStats()
+
+
+def _board_key(name: str, versions: list[int], params: dict) -> str:
+    digest = hashlib.md5(
+        repr(sorted(params.items())).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"boards:{name}:{'.'.join(map(str, versions))}:{digest}"
+
+
+def get_or_build(
+    name: str, params: dict, build, scopes: tuple[str, ...] = (BOARD, TASKS)
+):
+    """Данные доски name для параметров params из кеша или из build()"""
+    key = _board_key(name, get_versions(*scopes), params)
+    cache = get_cache()
+    data = cache.get(key)
+    stats.record(name, hit=data is not None)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.BOARD_CACHE_TIMEOUT)
+    return data
+
+
+async def aget_or_build(
+    name: str, params: dict, build, scopes: tuple[str, ...] = (BOARD, TASKS)
+):
+    """get_or_build() с корутиной build для асинхронных представлений"""
+    key = _board_key(name, await aget_versions(*scopes), params)
+    cache = get_cache()
+    data = await cache.aget(key)
+    stats.record(name, hit=data is not None)
+    if data is None:
+        data = await build()
+        await cache.aset(key, data, settings.BOARD_CACHE_TIMEOUT)
+    return data
+
+
+@staff_member_required
+def board_cache_stats(request):
+    """Метрики кеша досок текущего процесса (POST обнуляет их)"""
+    if request.method == "POST":
+        stats.clear()
+    return JsonResponse(
+        {"version": get_versions(BOARD)[0], "boards": stats.summary()},
+        json_dumps_params={"indent": 2},
+    )
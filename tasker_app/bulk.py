@@ -0,0 +1,461 @@
+"""Массовые операции над задачами
+
+Каждая операция выполняется за постоянное число запросов независимо от
+количества задач: одна выборка затронутых строк, один UPDATE/INSERT/DELETE
+и, для тегов, UPDATE отметки изменения задач (updated_at). Сигналы моделей
+при этом не срабатывают, поэтому события задач записываются, а версии кеша
+досок, поисковые документы и счётчики задач обновляются здесь же.
+"""
+
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from tasker_app import board_cache, counters, events, search
+from tasker_app.models import Task, TaskEvent
+
+
+TaskTag = Task.tags.through
+
+# Зазор между соседними задачами колонки при перенумерации порядка (rank)
+RANK_STEP = 1 << 16
+
+
+def set_fields(ids: list[int], **values) -> int:
+    """Установить значения полей выбранным задачам одним UPDATE"""
+    with transaction.atomic():
+        # Старые ключи счётчиков не должны измениться до UPDATE
+        rows = list(
+            Task.objects.select_for_update()
+            .filter(pk__in=ids)
+            .values_list(
+                "pk", "title", "status", "end_date", *counters.KEY_FIELDS
+            )
+        )
+        values.setdefault("updated_at", timezone.now())
+        updated = Task.objects.filter(pk__in=ids).update(**values)
+        new_status = values.get("status")
+        batch = []
+        for pk, title, status, *_ in rows:
+            if new_status is not None and new_status != status:
+                batch.append(
+                    events.make_event(
+                        TaskEvent.Kind.STATUS_CHANGED,
+                        pk,
+                        title=title,
+                        status=new_status,
+                        previous_status=status,
+                    )
+                )
+            else:
+                batch.append(
+                    events.make_event(
+                        TaskEvent.Kind.UPDATED,
+                        pk,
+                        title=title,
+                        status=new_status or status,
+                    )
+                )
+        events.record(batch)
+        deltas: Counter = Counter()
+        for row in rows:
+            old = row[4:]
+            deltas.update(counters.moved(old, _counter_key(values, old)))
+        counters.apply(deltas)
+        days = [row[3] for row in rows]
+        if "end_date" in values:
+            days.append(Task.end_date.field.to_python(values["end_date"]))
+        board_cache.bump_tasks(days)
+        if {"title", "body"} & set(values):
+            search.update_documents(ids)
+    return updated
+
+
+def add_tag(ids: list[int], tag_id: int) -> int:
+    """Добавить тег выбранным задачам одним INSERT в сквозную таблицу"""
+    with transaction.atomic():
+        rows = list(Task.objects.filter(pk__in=ids).values_list("pk", "end_date"))
+        TaskTag.objects.bulk_create(
+            [TaskTag(task_id=pk, tag_id=tag_id) for pk, _ in rows],
+            ignore_conflicts=True,
+        )
+        _record_updated(rows)
+    return len(rows)
+
+
+def remove_tag(ids: list[int], tag_id: int) -> int:
+    """Снять тег с выбранных задач одним DELETE из сквозной таблицы"""
+    with transaction.atomic():
+        links = TaskTag.objects.filter(task_id__in=ids, tag_id=tag_id)
+        rows = list(links.values_list("task_id", "task__end_date"))
+        links.delete()
+        _record_updated(rows)
+    return len(rows)
+
+
+def create_tasks(
+    tasks: list[Task], tag_ids: list[list[int]], record: bool = False
+) -> list[Task]:
+    """Создать задачи и их связи с тегами двумя bulk_create
+
+    tag_ids[i] - теги задачи tasks[i]. События о создании записываются
+    только с record: без них загружаются данные из других систем
+    (import_tasks).
+    """
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        if record:
+            events.record(
+                [
+                    events.make_event(
+                        TaskEvent.Kind.CREATED,
+                        task.pk,
+                        title=task.title,
+                        status=task.status,
+                        rank=task.rank,
+                    )
+                    for task in tasks
+                ]
+            )
+        counters.apply(Counter(counters.task_key(task) for task in tasks))
+        TaskTag.objects.bulk_create(
+            [
+                TaskTag(task_id=task.pk, tag_id=tag_id)
+                for task, ids in zip(tasks, tag_ids)
+                for tag_id in ids
+            ]
+        )
+        board_cache.bump_tasks([task.end_date for task in tasks])
+        search.update_documents([task.pk for task in tasks])
+    return tasks
+
+
+def update_tasks(
+    changes: dict[int, dict],
+    tag_ids: dict[int, list[int]],
+    versions: dict[int, str] | None = None,
+) -> dict[int, str]:
+    """Изменить задачи за постоянное число запросов
+
+    changes[id] - новые значения полей задачи, tag_ids[id] - её новый набор
+    тегов, versions[id] - версия (Task.version), которую видел клиент.
+    Поля пишутся одним bulk_update, связи с тегами - только изменённые.
+    Возвращает {id: "updated" | "missing" | "conflict"}.
+    """
+    fields = sorted({name for values in changes.values() for name in values})
+    with transaction.atomic():
+        results, rows = _lock_for_update(set(changes) | set(tag_ids), fields, versions or {})
+        if rows:
+            merged = _write_changes(rows, changes, tag_ids, fields)
+            _record_changes(rows, merged)
+            search.update_documents(
+                [
+                    pk
+                    for pk in rows
+                    if pk in tag_ids or {"title", "body"} & changes.get(pk, {}).keys()
+                ]
+            )
+    return results
+
+
+def _lock_for_update(
+    ids: set[int], fields: list[str], versions: dict[int, str]
+) -> tuple[dict[int, str], dict[int, dict]]:
+    # Результаты задач (missing, conflict, updated) и текущие значения
+    # заблокированных строк задач, которые можно изменить
+    selected = {"id", "title", "status", "end_date", "updated_at", *counters.KEY_FIELDS}
+    current = {
+        row["id"]: row
+        for row in Task.objects.select_for_update()
+        .filter(pk__in=ids)
+        .values(*selected.union(fields))
+    }
+    results = {}
+    for pk in ids:
+        if pk not in current:
+            results[pk] = "missing"
+        elif versions.get(pk) not in (None, current[pk]["updated_at"].isoformat()):
+            results[pk] = "conflict"
+        else:
+            results[pk] = "updated"
+    rows = {pk: current[pk] for pk, result in results.items() if result == "updated"}
+    return results, rows
+
+
+def _write_changes(
+    rows: dict[int, dict],
+    changes: dict[int, dict],
+    tag_ids: dict[int, list[int]],
+    fields: list[str],
+) -> dict[int, dict]:
+    # Одно UPDATE с CASE по id (bulk_update) и замена тегов; новые значения строк
+    now = timezone.now()
+    merged = {pk: {**row, **changes.get(pk, {})} for pk, row in rows.items()}
+    Task.objects.bulk_update(
+        [
+            Task(pk=pk, updated_at=now, **{name: values[name] for name in fields})
+            for pk, values in merged.items()
+        ],
+        [*fields, "updated_at"],
+    )
+    _replace_tags({pk: tag_ids[pk] for pk in rows if pk in tag_ids})
+    return merged
+
+
+def _record_changes(rows: dict[int, dict], merged: dict[int, dict]) -> None:
+    # События, счётчики и версии кеша досок изменённых задач
+    batch = []
+    deltas: Counter = Counter()
+    days = []
+    for pk, row in rows.items():
+        new = merged[pk]
+        payload = {"title": new["title"], "status": new["status"]}
+        if new["status"] != row["status"]:
+            kind = TaskEvent.Kind.STATUS_CHANGED
+            payload["previous_status"] = row["status"]
+        else:
+            kind = TaskEvent.Kind.UPDATED
+        batch.append(events.make_event(kind, pk, **payload))
+        deltas.update(
+            counters.moved(
+                tuple(row[name] for name in counters.KEY_FIELDS),
+                tuple(new[name] for name in counters.KEY_FIELDS),
+            )
+        )
+        days += [row["end_date"], new["end_date"]]
+    events.record(batch)
+    counters.apply(deltas)
+    board_cache.bump_tasks(days)
+
+
+def _replace_tags(tag_ids: dict[int, list[int]]) -> None:
+    # Новые наборы тегов задач: DELETE снятых связей и INSERT добавленных
+    if not tag_ids:
+        return
+    wanted = {pk: set(ids) for pk, ids in tag_ids.items()}
+    links = TaskTag.objects.filter(task_id__in=wanted).values_list("pk", "task_id", "tag_id")
+    existing = set()
+    stale = []
+    for link_id, task_id, tag_id in links:
+        existing.add((task_id, tag_id))
+        if tag_id not in wanted[task_id]:
+            stale.append(link_id)
+    TaskTag.objects.filter(pk__in=stale).delete()
+    TaskTag.objects.bulk_create(
+        [
+            TaskTag(task_id=pk, tag_id=tag_id)
+            for pk, ids in wanted.items()
+            for tag_id in sorted(ids)
+            if (pk, tag_id) not in existing
+        ]
+    )
+
+
+def move_tasks(moves: list[tuple[int, str, int]]) -> dict[int, tuple[str, int]]:
+    """Перенести задачи в колонки канбана на заданные места
+
+    moves - тройки (id, статус, позиция в колонке с нуля); применяются по
+    порядку, в котором их сделал пользователь. Новый rank задачи - середина
+    между соседями, поэтому перестановка меняет одну строку; только когда
+    зазор исчерпан, перенумеровывается начало колонки до места вставки, и
+    перенумерованные задачи получают события изменения с новым rank.
+    Запросов постоянное число: блокировка задач, начало каждой целевой
+    колонки, один UPDATE. Возвращает {id: (статус, rank)} перенесённых
+    задач; несуществующие задачи пропускаются.
+    """
+    with transaction.atomic():
+        rows = {
+            pk: rest
+            for pk, *rest in Task.objects.select_for_update()
+            .filter(pk__in={pk for pk, _, _ in moves})
+            .values_list("pk", "title", "end_date", *counters.KEY_FIELDS)
+        }
+        moves = [move for move in moves if move[0] in rows]
+        ranks, statuses = _place(moves)
+        if not ranks:
+            return {}
+        moved = {pk: statuses[pk] for pk, _, _ in moves}
+
+        now = timezone.now()
+        Task.objects.filter(pk__in=ranks).update(
+            rank=Case(
+                *[When(pk=pk, then=Value(rank)) for pk, rank in ranks.items()],
+                output_field=models.BigIntegerField(),
+            ),
+            status=Case(
+                *[When(pk=pk, then=Value(status)) for pk, status in moved.items()],
+                default=F("status"),
+            ),
+            updated_at=Case(
+                When(pk__in=list(moved), then=Value(now)),
+                default=F("updated_at"),
+                output_field=models.DateTimeField(),
+            ),
+        )
+
+        _record_moves(rows, moved, ranks, statuses)
+    return {pk: (status, ranks[pk]) for pk, status in moved.items()}
+
+
+def _record_moves(
+    rows: dict[int, list],
+    moved: dict[int, str],
+    ranks: dict[int, int],
+    statuses: dict[int, str],
+) -> None:
+    # События, счётчики и версии кеша досок перенесённых задач; перенумерованным
+    # соседям меняется только rank
+    batch = [
+        events.make_event(TaskEvent.Kind.UPDATED, pk, status=status, rank=ranks[pk])
+        for pk, status in statuses.items()
+        if pk not in moved
+    ]
+    deltas: Counter = Counter()
+    for pk, status in moved.items():
+        title, _, user_id, old_status, task_type = rows[pk]
+        payload = {"title": title, "status": status, "rank": ranks[pk]}
+        if status != old_status:
+            kind = TaskEvent.Kind.STATUS_CHANGED
+            payload["previous_status"] = old_status
+        else:
+            kind = TaskEvent.Kind.UPDATED
+        batch.append(events.make_event(kind, pk, **payload))
+        deltas.update(
+            counters.moved((user_id, old_status, task_type), (user_id, status, task_type))
+        )
+    events.record(batch)
+    counters.apply(deltas)
+    board_cache.bump_tasks([rows[pk][1] for pk in moved])
+
+
+def _place(moves: list[tuple[int, str, int]]) -> tuple[dict[int, int], dict[int, str]]:
+    # Новые rank и колонки (статусы) всех задач, у которых меняется rank:
+    # перенесённых и перенумерованных. Начала колонок выбираются с запасом
+    # на задачи, которые из них уйдут
+    sizes: dict[str, int] = {}
+    for _, status, position in moves:
+        sizes[status] = max(sizes.get(status, 0), position + len(moves))
+    columns = {status: _ColumnHead(status, size) for status, size in sizes.items()}
+
+    ranks: dict[int, int] = {}
+    statuses: dict[int, str] = {}
+    for pk, status, position in moves:
+        for column in columns.values():
+            column.remove(pk)
+        placed = columns[status].insert(pk, position)
+        ranks.update(placed)
+        statuses.update(dict.fromkeys(placed, status))
+    return ranks, statuses
+
+
+class _ColumnHead:
+    """Первые задачи колонки канбана: [id, rank] по порядку
+
+    Если в колонке больше задач, последняя выбранная - граница: задачи до
+    неё можно перенумеровать, не трогая остальные.
+    """
+
+    def __init__(self, status: str, size: int):
+        self.rows = [
+            list(row)
+            for row in Task.objects.filter(status=status)
+            .order_by("rank", "id")
+            .values_list("pk", "rank")[: size + 1]
+        ]
+        self.complete = len(self.rows) <= size
+
+    def remove(self, pk: int) -> None:
+        """Убрать задачу из колонки"""
+        self.rows = [row for row in self.rows if row[0] != pk]
+
+    def insert(self, pk: int, position: int) -> dict[int, int]:
+        """Поставить задачу на место position; {id: новый rank}"""
+        # Граница остаётся последней: запас в size гарантирует, что
+        # position неполной колонки меньше её длины
+        position = min(position, len(self.rows))
+        before = self.rows[position - 1][1] if position > 0 else None
+        after = self.rows[position][1] if position < len(self.rows) else None
+        rank = _rank_between(before, after)
+        self.rows.insert(position, [pk, rank])
+        if rank is not None:
+            return {pk: rank}
+        return self._renumber()
+
+    def _renumber(self) -> dict[int, int]:
+        if self.complete:
+            ranks = [index * RANK_STEP for index in range(len(self.rows))]
+        else:
+            boundary = self.rows[-1][1]
+            count = len(self.rows) - 1
+            ranks = [boundary - (count - index) * RANK_STEP for index in range(count)]
+        for row, rank in zip(self.rows, ranks):
+            row[1] = rank
+        return dict(self.rows[: len(ranks)])
+
+
+def _rank_between(before: int | None, after: int | None) -> int | None:
+    # rank между соседями или None, если зазора между ними нет
+    if before is None and after is None:
+        return 0
+    if before is None:
+        return after - RANK_STEP
+    if after is None:
+        return before + RANK_STEP
+    if after - before > 1:
+        return (before + after) // 2
+    return None
+
+
+def _counter_key(values: dict, old: tuple) -> tuple:
+    # Ключ счётчика задачи после UPDATE значений values
+    key = []
+    for name, value in zip(counters.KEY_FIELDS, old):
+        if name in values:
+            value = values[name]
+        elif name.removesuffix("_id") in values:
+            value = getattr(values[name.removesuffix("_id")], "pk", None)
+        key.append(value)
+    return tuple(key)
+
+
+def touch(ids) -> int:
+    """Отметить задачи изменёнными (updated_at) одним UPDATE"""
+    return Task.objects.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+def _record_updated(rows: list[tuple]) -> None:
+    # rows - пары (id, end_date) задач, у которых изменились теги
+    ids = [pk for pk, _ in rows]
+    touch(ids)
+    search.update_documents(ids)
+    events.record([events.make_event(TaskEvent.Kind.UPDATED, pk) for pk in ids])
+    board_cache.bump_tasks([day for _, day in rows])
+
+
+OPERATIONS = {
+    "set_fields": set_fields,
+    "add_tag": add_tag,
+    "remove_tag": remove_tag,
+}
+
+
+def chunk_ids(queryset, size: int):
+    """id задач выборки частями по size по возрастанию; каждая часть -
+    отдельный запрос от последнего id (keyset), все id сразу в память
+    не загружаются"""
+    ids = queryset.order_by("pk").values_list("pk", flat=True)
+    last = None
+    while True:
+        chunk = list((ids if last is None else ids.filter(pk__gt=last))[:size])
+        if chunk:
+            yield chunk
+        if len(chunk) < size:
+            return
+        last = chunk[-1]
+
+
+def apply(operation: str, ids: list[int], **params) -> int:
+    """Выполнить операцию из OPERATIONS над задачами ids"""
+    return OPERATIONS[operation](ids, **params)
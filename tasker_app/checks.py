@@ -0,0 +1,29 @@
+"""Проверки настроек приложения (manage.py check)"""
+
+from django.conf import settings
+from django.core import checks
+
+
+# Бэкенды кеша, которые не разделяются между процессами
+PROCESS_LOCAL_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@checks.register(checks.Tags.caches)
+def check_board_cache(app_configs, **kwargs) -> list[checks.CheckMessage]:
+    """Кеш досок должен быть общим, если задачи меняют воркеры celery
+
+    Версии кеша досок увеличивает процесс, который изменил задачи. С кешем
+    в памяти процесса изменения воркеров (массовые операции, архив) не
+    сбрасывают закешированные доски веб-процессов.
+    """
+    cache = settings.CACHES.get(settings.BOARD_CACHE_ALIAS, {})
+    if cache.get("BACKEND") not in PROCESS_LOCAL_BACKENDS or not settings.CELERY_BROKER_URL:
+        return []
+    return [
+        checks.Warning(
+            f"Board cache '{settings.BOARD_CACHE_ALIAS}' is local to each process, "
+            "but Celery workers change tasks from other processes.",
+            hint="Use a shared cache for boards, e.g. CACHE_URL=redis://localhost:6379/1.",
+            id="tasker_app.W001",
+        )
+    ]
@@ -0,0 +1,185 @@
+"""Счётчики задач по исполнителю, статусу и типу
+
+Таблица TaskCounter - денормализованная сводка COUNT(*) задач, сгруппированных
+по (исполнитель, статус, тип). Её размер зависит от числа исполнителей, а не
+задач, поэтому заголовки канбана, фильтр админки и страница загрузки читают
+её вместо подсчёта задач. Счётчики меняются в транзакции записи задач:
+сигналы save()/delete() и операции tasker_app.bulk передают сюда приращения.
+При расхождении (например, после правки БД вручную) таблицу пересобирает
+команда rebuild_task_counters.
+"""
+
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, Q, Sum, When
+
+from tasker_app.models import Task, TaskCounter
+
+
+# Поля задачи, из которых состоит ключ счётчика
+KEY_FIELDS = ("user_name_id", "status", "task_type")
+
+
+def task_key(task: Task) -> tuple:
+    """Ключ счётчика задачи"""
+    return tuple(getattr(task, name) for name in KEY_FIELDS)
+
+
+def loaded_key(task: Task) -> tuple | None:
+    """Ключ счётчика по значениям задачи при загрузке из БД"""
+    loaded = getattr(task, "loaded_values", {})
+    if not all(name in loaded for name in KEY_FIELDS):
+        return None
+    return tuple(loaded[name] for name in KEY_FIELDS)
+
+
+def saved_key(task: Task, update_fields=None) -> tuple | None:
+    """Ключ счётчика задачи после save(update_fields)
+
+    Поля, не вошедшие в update_fields, в БД не менялись - берутся значения
+    при загрузке.
+    """
+    if update_fields is None:
+        return task_key(task)
+    old = loaded_key(task)
+    if old is None:
+        return None
+    return tuple(
+        getattr(task, name)
+        if {name, name.removesuffix("_id")} & set(update_fields)
+        else old[index]
+        for index, name in enumerate(KEY_FIELDS)
+    )
+
+
+def moved(old: tuple | None, new: tuple | None) -> Counter:
+    """Приращения при переходе задачи из счётчика old в new"""
+    deltas: Counter = Counter()
+    if old != new:
+        if old is not None:
+            deltas[old] -= 1
+        if new is not None:
+            deltas[new] += 1
+    return deltas
+
+
+def _key_q(key: tuple) -> Q:
+    user_id, status, task_type = key
+    return Q(user_id=user_id, status=status, task_type=task_type)
+
+
+def apply(deltas: Counter) -> None:
+    """Применить приращения {ключ: delta} двумя запросами
+
+    Недостающие строки создаются INSERT с ignore_conflicts, затем один UPDATE
+    с CASE прибавляет приращения. Отрицательные приращения строк не создают:
+    счётчики удаляемого исполнителя уже удалены каскадом.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic(savepoint=False):
+        new = [key for key, delta in sorted(deltas.items()) if delta > 0]
+        if new:
+            TaskCounter.objects.bulk_create(
+                [
+                    TaskCounter(user_id=user_id, status=status, task_type=task_type)
+                    for user_id, status, task_type in new
+                ],
+                ignore_conflicts=True,
+            )
+        cases = [When(_key_q(key), then=delta) for key, delta in deltas.items()]
+        matched = Q()
+        for key in deltas:
+            matched |= _key_q(key)
+        TaskCounter.objects.filter(matched).update(count=F("count") + Case(*cases))
+
+
+def expected() -> dict[tuple, int]:
+    """Счётчики, посчитанные по таблице задач"""
+    rows = Task.objects.order_by().values_list(*KEY_FIELDS).annotate(total=Count("id"))
+    return {tuple(row[:-1]): row[-1] for row in rows}
+
+
+def rebuild() -> tuple[int, int]:
+    """Пересобрать счётчики по задачам; (число счётчиков, число исправленных)"""
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Запись задач ждёт конца пересборки, чтобы не потерять приращения
+            table = Task._meta.db_table  # pylint: disable=protected-access
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {table} IN SHARE MODE")
+        actual = {
+            (user_id, status, task_type): count
+            for user_id, status, task_type, count in TaskCounter.objects.values_list(
+                "user_id", "status", "task_type", "count"
+            )
+        }
+        counts = expected()
+        stale = {
+            key
+            for key in actual.keys() | counts.keys()
+            if actual.get(key, 0) != counts.get(key, 0)
+        }
+        TaskCounter.objects.all().delete()
+        TaskCounter.objects.bulk_create(
+            TaskCounter(user_id=user_id, status=status, task_type=task_type, count=count)
+            for (user_id, status, task_type), count in counts.items()
+        )
+    return len(counts), len(stale)
+
+
+def _status_totals():
+    return TaskCounter.objects.order_by().values_list("status").annotate(
+        total=Sum("count")
+    )
+
+
+def count_by_status() -> dict[str, int]:
+    """Количество задач по статусам"""
+    counts = dict.fromkeys(Task.TaskStatus.values, 0)
+    counts.update(_status_totals())
+    return counts
+
+
+async def acount_by_status() -> dict[str, int]:
+    """count_by_status() для асинхронных представлений"""
+    counts = dict.fromkeys(Task.TaskStatus.values, 0)
+    counts.update([row async for row in _status_totals()])
+    return counts
+
+
+def count_by_user() -> list[tuple[int, str, int]]:
+    """(id, имя, число задач) исполнителей с задачами по имени"""
+    rows = (
+        TaskCounter.objects.values_list("user_id", "user__full_name")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        .order_by("user__full_name", "user_id")
+    )
+    return list(rows)
+
+
+def workload() -> list[dict]:
+    """Загрузка исполнителей по убыванию числа незакрытых задач
+
+    counts - число задач по статусам в порядке Task.TaskStatus.values.
+    Задачи без статуса (пустая строка из формы) входят только в total и open.
+    """
+    statuses = Task.TaskStatus.values
+    rows: dict[int, dict] = {}
+    queryset = TaskCounter.objects.filter(count__gt=0).values_list(
+        "user_id", "user__full_name", "status", "count"
+    )
+    for user_id, full_name, status, count in queryset:
+        row = rows.setdefault(
+            user_id,
+            {"full_name": full_name, "counts": [0] * len(statuses), "open": 0, "total": 0},
+        )
+        if status in statuses:
+            row["counts"][statuses.index(status)] += count
+        row["total"] += count
+        if status != Task.TaskStatus.CLOSED:
+            row["open"] += count
+    return sorted(rows.values(), key=lambda row: (-row["open"], row["full_name"]))
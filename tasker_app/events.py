@@ -0,0 +1,125 @@
+"""Пакетная отправка событий задач в celery
+
+Вместо сообщения брокеру на каждую запись события копятся в буфере процесса
+и уходят воркеру пачкой (process_task_events), когда набирается
+TASK_EVENTS_BATCH_SIZE событий или проходит TASK_EVENTS_FLUSH_INTERVAL секунд
+с первого события в буфере.
+"""
+
+import atexit
+import functools
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from tasker_app import live
+
+
+class TaskEventBuffer:
+    """Потокобезопасный буфер событий со сбросом по размеру и по времени"""
+
+    def __init__(self, batch_size: int, flush_interval: float, send):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.send = send
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def __len__(self):
+        return len(self._events)
+
+    def add(self, events: list[dict]) -> None:
+        """Добавить события; при заполнении буфера сразу отправить пачку"""
+        with self._lock:
+            self._events.extend(events)
+            if len(self._events) < self.batch_size:
+                self._start_timer()
+                return
+            batch = self._take()
+        self.send(batch)
+
+    def flush(self) -> None:
+        """Отправить всё накопленное"""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self.send(batch)
+
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # Соединения с БД потока таймера (режим без брокера)
+            connections.close_all()
+
+    def _take(self) -> list[dict]:
+        batch, self._events = self._events, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _start_timer(self) -> None:
+        if self._timer is None and self.flush_interval > 0:
+            self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+
+def send_batch(events: list[dict]) -> None:
+    """Отправить пачку событий воркеру"""
+    from tasker_app.tasks import process_task_events, send_task
+
+    send_task(process_task_events, events)
+
+
+@functools.cache
+def get_buffer() -> TaskEventBuffer:
+    """Буфер событий текущего процесса"""
+    return TaskEventBuffer(
+        settings.TASK_EVENTS_BATCH_SIZE,
+        settings.TASK_EVENTS_FLUSH_INTERVAL,
+        send_batch,
+    )
+
+
+@receiver(setting_changed)
+def reset_buffer(*, setting, **kwargs):
+    """Пересоздать буфер при изменении настроек (в тестах)"""
+    if setting.startswith("TASK_EVENTS_"):
+        get_buffer.cache_clear()
+
+
+def flush() -> None:
+    """Отправить накопленные события процесса"""
+    if get_buffer.cache_info().currsize:
+        get_buffer().flush()
+
+
+atexit.register(flush)
+
+
+def make_event(kind: str, task_id: int, **payload) -> dict:
+    """Компактное JSON-сериализуемое событие"""
+    return {
+        "task_id": task_id,
+        "kind": kind,
+        "payload": payload,
+        "occurred_at": timezone.now().isoformat(),
+    }
+
+
+def record(events: list[dict]) -> None:
+    """Поставить события в буфер и разослать доскам после коммита транзакции"""
+    if events:
+        transaction.on_commit(lambda: _committed(events))
+
+
+def _committed(events: list[dict]) -> None:
+    get_buffer().add(events)
+    live.publish(events)
@@ -0,0 +1,111 @@
+"""Потоковая выгрузка задач в CSV и NDJSON
+
+Задачи читаются через iterator(chunk_size) (на PostgreSQL - серверный курсор)
+в виде кортежей values_list, теги подгружаются одним запросом на порцию.
+Память процесса не зависит от размера выгрузки.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from tasker_app.models import Task
+
+
+CHUNK_SIZE = 2000
+
+# Колонки выгрузки и поля выборки, из которых они берутся
+COLUMNS = (
+    "id",
+    "title",
+    "task_type",
+    "status",
+    "end_date",
+    "created_at",
+    "user_email",
+    "user_full_name",
+    "tags",
+    "body",
+)
+FIELDS = (
+    "id",
+    "title",
+    "task_type",
+    "status",
+    "end_date",
+    "created_at",
+    "user_name__email",
+    "user_name__full_name",
+    "body",
+)
+
+TAGS_SEPARATOR = ", "
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def tags_by_task(ids: list[int]) -> dict[int, list[str]]:
+    """Имена тегов задач ids одним запросом к сквозной таблице"""
+    tags: dict[int, list[str]] = {pk: [] for pk in ids}
+    links = (
+        Task.tags.through.objects.filter(task_id__in=ids)
+        .order_by("tag__name")
+        .values_list("task_id", "tag__name")
+    )
+    for task_id, name in links:
+        tags[task_id].append(name)
+    return tags
+
+
+def iter_rows(queryset, chunk_size: int = CHUNK_SIZE):
+    """Словари строк выгрузки в порядке (end_date, id)"""
+    rows = (
+        queryset.order_by("end_date", "id")
+        .values_list(*FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in _chunks(rows, chunk_size):
+        tags = tags_by_task([row[0] for row in chunk])
+        for row in chunk:
+            yield dict(zip(COLUMNS, row[:-1] + (tags[row[0]], row[-1])))
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: writerow возвращает готовую строку"""
+
+    def write(self, value: str) -> str:
+        """Вернуть записанное значение"""
+        return value
+
+
+def csv_lines(rows):
+    """Строки CSV с заголовком"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        row["tags"] = TAGS_SEPARATOR.join(row["tags"])
+        yield writer.writerow([row[column] for column in COLUMNS])
+
+
+def ndjson_lines(rows):
+    """Строки NDJSON: один JSON-объект на задачу"""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv; charset=utf-8"),
+    "ndjson": (ndjson_lines, "application/x-ndjson; charset=utf-8"),
+}
+
+
+def stream(lines, lines_per_chunk: int = 500):
+    """Склеить строки в крупные куски для ответа"""
+    for chunk in _chunks(lines, lines_per_chunk):
+        yield "".join(chunk)
@@ -1,10 +1,31 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from tasker_app.models import Task
+from tasker_app.widgets import AutocompleteSelect, AutocompleteSelectMultiple
+from user_app.models import CustomUser
+
+
+def validate_title(title: str) -> None:
+    """Правила названия задачи (форма и импорт)"""
+    words_list = title.split()
+    if len(words_list) < 2:
+        raise ValidationError("Название должно содержать минимум 2 слова")
 
 
 class TaskModelForm(forms.ModelForm):
-    """Форма для модели Task"""
+    """Форма для модели Task
+
+    При изменении задачи скрытое поле version хранит её версию на момент
+    открытия формы: если задачу успели изменить, форма не сохраняется
+    (ошибка с кодом conflict), а не затирает чужие изменения. Форма без
+    version (старые клиенты) сохраняется без проверки.
+    """
+
+    CONFLICT_MESSAGE = (
+        "Задачу изменили, пока открыта форма. Проверьте значения и сохраните ещё раз"
+    )
+
+    version = forms.CharField(widget=forms.HiddenInput, required=False)
 
     class Meta:
         """Класс для настройки формы"""
@@ -45,7 +66,9 @@ class TaskModelForm(forms.ModelForm):
                     "placeholder": "Введите название задачи",
                 }
             ),
-            "user_name": forms.Select(
+            # Пользователи и теги подгружаются по мере ввода, а не все сразу
+            "user_name": AutocompleteSelect(
+                "autocomplete_users",
                 attrs={
                     "class": "form-control",
                 }
@@ -57,7 +80,8 @@ class TaskModelForm(forms.ModelForm):
                     "placeholder": "Введите содержание задачи",
                 }
             ),
-            "tags": forms.SelectMultiple(
+            "tags": AutocompleteSelectMultiple(
+                "autocomplete_tags",
                 attrs={
                     "class": "form-control",
                 }
@@ -77,11 +101,165 @@ class TaskModelForm(forms.ModelForm):
         if not self.instance.pk:
             # Добавляем атрибут disabled к виджету
             self.fields["status"].widget.attrs["disabled"] = True
+            del self.fields["version"]
+        else:
+            self.initial["version"] = self.instance.version
+
+    def clean(self):
+        cleaned_data = super().clean()
+        version = cleaned_data.get("version")
+        if version and version != self.instance.version:
+            # Повторная отправка формы сохранит значения пользователя поверх
+            # текущей версии задачи
+            self.data = self.data.copy()
+            self.data[self.add_prefix("version")] = self.instance.version
+            raise ValidationError(self.CONFLICT_MESSAGE, code="conflict")
+        return cleaned_data
+
+    def save(self, commit=True):
+        """Сохранить изменённые поля задачи и изменённые связи с тегами
+
+        Новая задача сохраняется целиком. Если ничего не изменилось, запросов
+        на запись нет.
+        """
+        if not commit or not self.instance.pk:
+            return super().save(commit)
+        fields = [name for name in self.changed_data if name not in ("tags", "version")]
+        if fields:
+            self.instance.save(update_fields=[*fields, "updated_at"])
+        if "tags" in self.changed_data:
+            old = set(self.initial["tags"])
+            new = set(self.cleaned_data["tags"])
+            if old - new:
+                self.instance.tags.remove(*(old - new))
+            if new - old:
+                self.instance.tags.add(*(new - old))
+        return self.instance
 
     def clean_title(self):
         """Валидация title на количество слов"""
         title: str = str(self.cleaned_data.get("title"))
-        words_list = title.split()
-        if len(words_list) < 2:
-            raise ValidationError("Название должно содержать минимум 2 слова")
+        validate_title(title)
+        return title
+
+
+class TaskFilterForm(forms.Form):
+    """Фильтры выборки задач (выгрузка и JSON API)"""
+
+    status = forms.ChoiceField(choices=Task.TaskStatus.choices, required=False)
+    task_type = forms.ChoiceField(choices=Task.TaskType.choices, required=False)
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    user = forms.ModelChoiceField(
+        CustomUser.objects.all(), to_field_name="email", required=False
+    )
+    # id тега: проверка существования стоила бы лишнего запроса
+    tag = forms.IntegerField(min_value=1, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError("Начало периода позже его окончания")
+        return cleaned_data
+
+    def filter(self, queryset):
+        """Применить заполненные фильтры к выборке задач"""
+        data = self.cleaned_data
+        lookups = {
+            "status": data.get("status"),
+            "task_type": data.get("task_type"),
+            "end_date__gte": data.get("date_from"),
+            "end_date__lte": data.get("date_to"),
+            "user_name": data.get("user"),
+            "tags": data.get("tag"),
+        }
+        return queryset.filter(**{k: v for k, v in lookups.items() if v})
+
+
+class TaskMoveForm(forms.Form):
+    """Перенос карточки канбана: задача, колонка и место в ней с нуля"""
+
+    id = forms.IntegerField(min_value=1)
+    status = forms.ChoiceField(choices=Task.TaskStatus.choices)
+    position = forms.IntegerField(min_value=0, max_value=10_000)
+
+
+class TaskBatchForm(forms.Form):
+    """Задача в пакетной записи JSON API: поля - как в ответе /api/tasks/
+
+    С id задача изменяется, и меняются только переданные поля; без id -
+    создаётся, и обязательны title, end_date и user. Существование
+    исполнителей и тегов проверяет вызывающий код одним запросом на пакет.
+    """
+
+    # Поля формы и поля модели, в которые они записываются
+    MODEL_FIELDS = {
+        "title": "title",
+        "body": "body",
+        "task_type": "task_type",
+        "status": "status",
+        "end_date": "end_date",
+        "user": "user_name_id",
+    }
+    REQUIRED_ON_CREATE = ("title", "end_date", "user")
+
+    id = forms.IntegerField(min_value=1, required=False)
+    version = forms.CharField(required=False)
+    title = forms.CharField(max_length=Task.title.field.max_length, required=False)
+    body = forms.CharField(required=False, strip=False)
+    task_type = forms.ChoiceField(choices=Task.TaskType.choices, required=False)
+    status = forms.ChoiceField(choices=Task.TaskStatus.choices, required=False)
+    end_date = forms.DateField(required=False)
+    user = forms.IntegerField(min_value=1, required=False)
+    tags = forms.JSONField(required=False)
+
+    def given(self, name: str) -> bool:
+        """Передано ли поле в данных задачи"""
+        return name in self.data
+
+    def clean_title(self):
+        """Валидация title на количество слов"""
+        title = self.cleaned_data["title"]
+        if self.given("title"):
+            validate_title(title)
         return title
+
+    def clean_tags(self):
+        """Список id тегов"""
+        tags = self.cleaned_data["tags"]
+        if tags is None:
+            return None
+        if not isinstance(tags, list) or not all(
+            isinstance(pk, int) and not isinstance(pk, bool) and pk > 0 for pk in tags
+        ):
+            raise ValidationError("Ожидается список id тегов")
+        return list(dict.fromkeys(tags))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        creating = cleaned_data.get("id") is None
+        for name in self.MODEL_FIELDS:
+            if name == "body" or name in self.errors:
+                continue
+            if self.given(name) and cleaned_data.get(name) in (None, ""):
+                self.add_error(name, "Поле не может быть пустым")
+            elif creating and name in self.REQUIRED_ON_CREATE and not self.given(name):
+                self.add_error(name, "Обязательное поле при создании задачи")
+        return cleaned_data
+
+    def get_values(self) -> dict:
+        """Переданные значения полей модели"""
+        return {
+            field: self.cleaned_data[name]
+            for name, field in self.MODEL_FIELDS.items()
+            if self.given(name)
+        }
+
+
+class TaskSearchForm(forms.Form):
+    """Полнотекстовый поиск задач"""
+
+    q = forms.CharField(max_length=200, required=False, strip=True, label="Поиск")
+    page = forms.IntegerField(min_value=1, required=False)
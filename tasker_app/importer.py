@@ -0,0 +1,201 @@
+"""Потоковый импорт задач из CSV и NDJSON
+
+Формат совпадает с выгрузкой (tasker_app.export): title, task_type, status,
+end_date, user_email, tags, body. Файл читается построчно, строки
+обрабатываются пачками: исполнители и теги пачки ищутся одним запросом
+каждый (найденные запоминаются на весь импорт), задачи и связи с тегами
+вставляются через bulk_create.
+"""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+
+from tasker_app import bulk
+from tasker_app.forms import validate_title
+from tasker_app.models import Tag, Task, normalize_tag_name
+from user_app.models import CustomUser
+
+
+BATCH_SIZE = 1000
+
+TITLE_MAX_LENGTH = Task.title.field.max_length
+TAG_MAX_LENGTH = Tag.name.field.max_length
+
+
+class ImportFormatError(Exception):
+    """Файл не удаётся разобрать"""
+
+
+def split_tags(value) -> list[str]:
+    """Имена тегов из списка NDJSON или строки CSV через запятую
+
+    Имена нормализуются, повторы без учёта регистра отбрасываются.
+    """
+    names = value if isinstance(value, list) else str(value or "").split(",")
+    unique: dict[str, str] = {}
+    for name in map(normalize_tag_name, names):
+        if name:
+            unique.setdefault(name.lower(), name)
+    return list(unique.values())
+
+
+def read_csv(file):
+    """Строки CSV-файла как словари"""
+    reader = csv.DictReader(file)
+    try:
+        yield from reader
+    except csv.Error as exc:
+        raise ImportFormatError(f"Строка {reader.line_num + 1}: {exc}") from exc
+
+
+def read_ndjson(file):
+    """Объекты NDJSON-файла, пустые строки пропускаются"""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ImportFormatError(f"Строка {line_number}: {exc}") from exc
+        if not isinstance(row, dict):
+            raise ImportFormatError(f"Строка {line_number}: ожидается объект")
+        yield row
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def clean_row(row: dict) -> dict:
+    """Проверенные значения строки импорта (ValidationError со всеми ошибками)"""
+    errors = []
+    title = str(row.get("title") or "").strip()
+    try:
+        validate_title(title)
+    except ValidationError as exc:
+        errors.extend(exc.messages)
+    if len(title) > TITLE_MAX_LENGTH:
+        errors.append(f"Название длиннее {TITLE_MAX_LENGTH} символов")
+
+    task_type = row.get("task_type") or Task.TaskType.TASK
+    if task_type not in Task.TaskType.values:
+        errors.append(f"Неизвестный тип задачи {task_type}")
+    status = row.get("status") or Task.TaskStatus.NEW
+    if status not in Task.TaskStatus.values:
+        errors.append(f"Неизвестный статус {status}")
+
+    try:
+        end_date = parse_date(str(row.get("end_date") or ""))
+    except ValueError:
+        end_date = None
+    if end_date is None:
+        errors.append("Некорректная дата окончания")
+
+    email = str(row.get("user_email") or "").strip()
+    if not email:
+        errors.append("Не указан email исполнителя")
+
+    tags = split_tags(row.get("tags"))
+    if any(len(name) > TAG_MAX_LENGTH for name in tags):
+        errors.append(f"Имя тега длиннее {TAG_MAX_LENGTH} символов")
+
+    if errors:
+        raise ValidationError(errors)
+    return {
+        "title": title,
+        "task_type": task_type,
+        "status": status,
+        "end_date": end_date,
+        "user_email": email,
+        "tags": tags,
+        "body": str(row.get("body") or ""),
+    }
+
+
+@dataclass
+class ImportResult:
+    """Итоги импорта"""
+
+    rows: int = 0
+    imported: int = 0
+    tags_created: int = 0
+    errors: list[tuple[int, list[str]]] = field(default_factory=list)
+
+
+class TaskImporter:
+    """Импорт пачками с кешем исполнителей и тегов на весь импорт"""
+
+    def __init__(self, batch_size: int = BATCH_SIZE, dry_run: bool = False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.result = ImportResult()
+        self._users: dict[str, int] = {}
+        # Ключи - имена тегов в нижнем регистре
+        self._tags: dict[str, int | None] = {}
+
+    def run(self, rows, on_batch=None) -> ImportResult:
+        """Импортировать строки; on_batch(result) вызывается после каждой пачки"""
+        numbered = enumerate(rows, start=1)
+        while batch := list(islice(numbered, self.batch_size)):
+            self.import_batch(batch)
+            if on_batch is not None:
+                on_batch(self.result)
+        return self.result
+
+    def import_batch(self, batch: list[tuple[int, dict]]) -> None:
+        """Проверить и записать одну пачку пронумерованных строк"""
+        cleaned = []
+        for number, row in batch:
+            self.result.rows += 1
+            try:
+                cleaned.append((number, clean_row(row)))
+            except ValidationError as exc:
+                self.result.errors.append((number, exc.messages))
+
+        self._resolve_users({data["user_email"] for _, data in cleaned})
+        valid = []
+        for number, data in cleaned:
+            if data["user_email"] in self._users:
+                valid.append(data)
+            else:
+                message = f"Пользователь {data['user_email']} не найден"
+                self.result.errors.append((number, [message]))
+        if not valid:
+            return
+
+        self._resolve_tags({name for data in valid for name in data["tags"]})
+        self.result.imported += len(valid)
+        if self.dry_run:
+            return
+        tasks = [
+            Task(
+                title=data["title"],
+                task_type=data["task_type"],
+                status=data["status"],
+                end_date=data["end_date"],
+                user_name_id=self._users[data["user_email"]],
+                body=data["body"],
+            )
+            for data in valid
+        ]
+        tag_ids = [[self._tags[name.lower()] for name in data["tags"]] for data in valid]
+        bulk.create_tasks(tasks, tag_ids)
+
+    def _resolve_users(self, emails: set[str]) -> None:
+        missing = emails - self._users.keys()
+        if missing:
+            self._users.update(
+                CustomUser.objects.filter(email__in=missing).values_list("email", "id")
+            )
+
+    def _resolve_tags(self, names: set[str]) -> None:
+        missing = {name for name in names if name.lower() not in self._tags}
+        if not missing:
+            return
+        tags, created = Tag.objects.get_or_create_many(missing, create=not self.dry_run)
+        self.result.tags_created += len(created)
+        self._tags.update((name.lower(), pk) for name, pk in tags.items())
@@ -0,0 +1,240 @@
+"""Живые обновления канбана: события задач подписчикам Server-Sent Events
+
+События задач (tasker_app.events) после коммита публикуются брокеру
+TASK_LIVE_BROKER одним сообщением на транзакцию. LocalBroker раздаёт их
+подписчикам своего процесса: у каждого подписчика ограниченная очередь
+asyncio, а публикация из любого потока стоит одного call_soon_threadsafe на
+событийный цикл независимо от числа подписчиков в нём. RedisBroker
+публикует в канал Redis, и один поток каждого веб-процесса раздаёт
+сообщения канала локально - так до досок доходят изменения из других
+процессов и воркеров celery.
+
+Последние TASK_LIVE_HISTORY сообщений хранятся для переподключения по
+Last-Event-ID. Подписчик, отставший больше чем на TASK_LIVE_QUEUE_SIZE
+сообщений или пропустивший вытесненные из истории, получает reset и
+перезагружает доску.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import threading
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+# Задержка переподключения браузера, мс
+RETRY_FRAME = "retry: 3000\n\n"
+KEEPALIVE_FRAME = ": keepalive\n\n"
+RESET_FRAME = "event: reset\ndata: {}\n\n"
+
+
+def compact(events: list[dict]) -> list[dict]:
+    """События без служебных полей: id задачи, вид и данные"""
+    return [
+        {"task_id": event["task_id"], "kind": event["kind"], **event["payload"]}
+        for event in events
+    ]
+
+
+def make_frame(event_id: str, events: list[dict]) -> str:
+    """Кадр SSE с пачкой событий"""
+    data = json.dumps(events, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: tasks\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Очередь кадров одного подписчика в его событийном цикле"""
+
+    def __init__(self, loop, size: int):
+        self.loop = loop
+        self.closed = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+    def put(self, frame: str) -> None:
+        """Добавить кадр (в потоке цикла подписчика)"""
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Отставшему подписчику дешевле перезагрузить доску
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESET_FRAME)
+            self.closed = True
+
+    async def get(self) -> str:
+        """Следующий кадр"""
+        return await self._queue.get()
+
+
+def _deliver(subscriptions: list[Subscription], frame: str) -> None:
+    for subscription in subscriptions:
+        subscription.put(frame)
+
+
+class LocalBroker:
+    """Раздача сообщений подписчикам текущего процесса"""
+
+    def __init__(self, history: int, queue_size: int):
+        self.queue_size = queue_size
+        # Номера сообщений другого экземпляра (процесса) не продолжают эти
+        self.epoch = uuid.uuid4().hex[:8]
+        self._sequence = 0
+        self._history: deque[tuple[int, str]] = deque(maxlen=history)
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(map(len, self._subscribers.values()))
+
+    def publish(self, events: list[dict]) -> None:
+        """Разослать события подписчикам (из любого потока)"""
+        if not events:
+            return
+        with self._lock:
+            self._sequence += 1
+            frame = make_frame(f"{self.epoch}-{self._sequence}", compact(events))
+            self._history.append((self._sequence, frame))
+            targets = [(loop, list(subs)) for loop, subs in self._subscribers.items()]
+        for loop, subscriptions in targets:
+            try:
+                loop.call_soon_threadsafe(_deliver, subscriptions, frame)
+            except RuntimeError:
+                # Цикл закрыт; его подписчики уже не читают
+                continue
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscription:
+        """Подписка в текущем событийном цикле с пропущенными сообщениями"""
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(subscription.loop, set()).add(subscription)
+            for frame in self._missed(last_event_id):
+                subscription.put(frame)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Отписаться"""
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.loop, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscribers.pop(subscription.loop, None)
+
+    def _missed(self, last_event_id: str | None) -> list[str]:
+        # Сообщения после last_event_id или reset, если их уже нет
+        if not last_event_id:
+            return []
+        epoch, _, number = last_event_id.partition("-")
+        if epoch != self.epoch or not number.isdigit():
+            return [RESET_FRAME]
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if int(number) < oldest - 1:
+            return [RESET_FRAME]
+        return [frame for sequence, frame in self._history if sequence > int(number)]
+
+
+class RedisBroker(LocalBroker):
+    """Публикация в канал Redis, раздача - подписчикам всех процессов"""
+
+    channel = "tasker:live"
+    # Пауза перед переподключением к Redis, с
+    reconnect_delay = 1.0
+
+    def __init__(self, history: int, queue_size: int, url: str | None = None):
+        import redis  # pylint: disable=import-outside-toplevel
+
+        super().__init__(history, queue_size)
+        self.redis = redis.Redis.from_url(url or settings.TASK_LIVE_REDIS_URL)
+        self._errors = (redis.RedisError, ValueError)
+        self._listener: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def publish(self, events: list[dict]) -> None:
+        if not events:
+            return
+        try:
+            self.redis.publish(self.channel, json.dumps(events))
+        except self._errors:
+            # Задача уже сохранена: доски увидят её после перезагрузки
+            logger.exception("Live update was not published")
+
+    def subscribe(self, last_event_id: str | None = None) -> Subscription:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="task-live-redis", daemon=True
+                )
+                self._listener.start()
+        return super().subscribe(last_event_id)
+
+    def close(self) -> None:
+        """Остановить поток чтения канала"""
+        self._stopped.set()
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        super().publish(json.loads(message["data"]))
+            except self._errors:
+                logger.exception("Live updates channel failed, reconnecting")
+            self._stopped.wait(self.reconnect_delay)
+
+
+@functools.cache
+def get_broker() -> LocalBroker:
+    """Брокер текущего процесса"""
+    return import_string(settings.TASK_LIVE_BROKER)(
+        settings.TASK_LIVE_HISTORY, settings.TASK_LIVE_QUEUE_SIZE
+    )
+
+
+@receiver(setting_changed)
+def reset_broker(*, setting, **kwargs):
+    """Пересоздать брокер при изменении настроек (в тестах)"""
+    if setting.startswith("TASK_LIVE_"):
+        get_broker.cache_clear()
+
+
+def publish(events: list[dict]) -> None:
+    """Разослать закоммиченные события задач"""
+    get_broker().publish(events)
+
+
+async def stream(last_event_id: str | None = None):
+    """Кадры SSE для одного подписчика
+
+    Без сообщений раз в TASK_LIVE_KEEPALIVE секунд уходит комментарий:
+    прокси не закрывают соединение, а отключение клиента обнаруживается.
+    После reset поток заканчивается.
+    """
+    broker = get_broker()
+    subscription = broker.subscribe(last_event_id)
+    try:
+        yield RETRY_FRAME
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    subscription.get(), settings.TASK_LIVE_KEEPALIVE
+                )
+            except TimeoutError:
+                frame = KEEPALIVE_FRAME
+            yield frame
+            if frame == RESET_FRAME:
+                return
+    finally:
+        broker.unsubscribe(subscription)
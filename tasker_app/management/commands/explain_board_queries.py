@@ -0,0 +1,123 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tasker_app.models import Task
+from tasker_app.pagination import KeysetPaginator
+from tasker_app.views import (
+    BoardPaginationMixin,
+    KanbanTemplateView,
+    TagAutocompleteView,
+    UserAutocompleteView,
+)
+
+
+# Оба индекса с ведущим end_date подходят для диапазона по сроку; какой из них
+# выберет планировщик, зависит от статистики таблицы
+END_DATE_INDEXES = ("task_end_date_idx", "task_end_date_title_idx")
+# Индексы по префиксу имени (text_pattern_ops) создают только миграции
+# для PostgreSQL (tasker_app 0008, user_app 0004): на других СУБД их
+# использование не проверяется
+POSTGRESQL_INDEXES = ("customuser_full_name_prefix_idx", "tag_name_prefix_idx")
+
+
+def board_queries():
+    """Запросы представлений и индексы, которыми они должны обслуживаться"""
+    board = Task.objects.for_board()
+    paginator = KeysetPaginator(board, BoardPaginationMixin.paginate_by)
+    cursor = paginator.encode_cursor({"end_date": date.today(), "id": 0})
+
+    yield "index", paginator.page_queryset(board, None), ("task_end_date_idx",)
+    yield "index:cursor", paginator.page_queryset(board, cursor), END_DATE_INDEXES
+    yield (
+        "today",
+        paginator.page_queryset(Task.get_by_date(date.today()).for_board(), None),
+        END_DATE_INDEXES,
+    )
+    columns = KeysetPaginator(
+        board, KanbanTemplateView.paginate_by, ordering=KanbanTemplateView.ordering
+    )
+    column_cursor = columns.encode_cursor({"rank": 0, "id": 0})
+    for status in Task.TaskStatus.values:
+        yield (
+            f"kanban:{status}",
+            columns.page_queryset(board.filter(status=status), column_cursor),
+            ("task_status_rank_idx",),
+        )
+    yield (
+        "open",
+        Task.objects.open().order_by("end_date", "id")[: paginator.per_page],
+        ("task_open_end_date_idx",),
+    )
+    yield (
+        "user",
+        Task.objects.filter(user_name_id=0).order_by("end_date"),
+        ("task_user_end_date_idx",),
+    )
+    yield (
+        "admin",
+        Task.objects.order_by("end_date", "title")[:100],
+        ("task_end_date_title_idx",),
+    )
+    yield (
+        "autocomplete:users",
+        UserAutocompleteView().get_results_queryset("ив")[: UserAutocompleteView.limit],
+        ("customuser_full_name_prefix_idx",),
+    )
+    yield (
+        "autocomplete:tags",
+        TagAutocompleteView().get_results_queryset("ба")[: TagAutocompleteView.limit],
+        ("tag_name_prefix_idx",),
+    )
+
+
+class Command(BaseCommand):
+    """Вывод EXPLAIN для запросов досок и проверка использования индексов"""
+
+    help = "Run EXPLAIN for every board queryset and optionally check index usage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if a query plan does not use its expected index",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Explain only the given query name (can be repeated)",
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if options["check"] and connection.vendor == "postgresql":
+                # На маленьких таблицах CI планировщик предпочтёт seq scan
+                # или сортировку, поэтому проверяем, что индекс применим
+                # в принципе
+                with connection.cursor() as cursor:
+                    table = Task._meta.db_table  # pylint: disable=protected-access
+                    cursor.execute(f"ANALYZE {table}")
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                    cursor.execute("SET LOCAL enable_sort = off")
+                    cursor.execute("SET LOCAL enable_incremental_sort = off")
+
+            for name, queryset, indexes in board_queries():
+                if options["queries"] and name not in options["queries"]:
+                    continue
+                plan = queryset.explain()
+                self.stdout.write(f"== {name} ==\n{plan}\n")
+                if connection.vendor != "postgresql":
+                    indexes = [i for i in indexes if i not in POSTGRESQL_INDEXES]
+                    if not indexes:
+                        self.stdout.write(f"(index check skipped on {connection.vendor})\n")
+                        continue
+                if not any(index in plan for index in indexes):
+                    failures.append(f"{name}: expected {', '.join(indexes)}")
+
+        if options["check"] and failures:
+            raise CommandError("Indexes are not used:\n" + "\n".join(failures))
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS("All board queries use indexes"))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasker_app import export
+from tasker_app.forms import TaskFilterForm
+from tasker_app.models import Task
+
+
+class Command(BaseCommand):
+    """Потоковая выгрузка задач в CSV или NDJSON"""
+
+    help = "Stream tasks with tags and assignee as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(export.FORMATS), default="csv", dest="fmt"
+        )
+        parser.add_argument("--status", default="")
+        parser.add_argument("--type", default="", dest="task_type")
+        parser.add_argument("--from", default="", dest="date_from", help="YYYY-MM-DD")
+        parser.add_argument("--to", default="", dest="date_to", help="YYYY-MM-DD")
+        parser.add_argument("--user", default="", help="Assignee email")
+        parser.add_argument("--output", help="File path (stdout by default)")
+        parser.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        form = TaskFilterForm(
+            {
+                "status": options["status"],
+                "task_type": options["task_type"],
+                "date_from": options["date_from"],
+                "date_to": options["date_to"],
+                "user": options["user"],
+            }
+        )
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        serialize, _ = export.FORMATS[options["fmt"]]
+        rows = export.iter_rows(
+            form.filter(Task.objects.all()), chunk_size=options["chunk_size"]
+        )
+        exported = 0
+
+        def counted(rows):
+            nonlocal exported
+            for exported, row in enumerate(rows, start=1):
+                yield row
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(serialize(counted(rows)))
+        else:
+            for line in serialize(counted(rows)):
+                self.stdout.write(line, ending="")
+        self.stderr.write(f"Exported {exported} tasks")
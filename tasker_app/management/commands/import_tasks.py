@@ -0,0 +1,85 @@
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasker_app import importer
+
+
+class Command(BaseCommand):
+    """Потоковый импорт задач из CSV или NDJSON"""
+
+    help = "Import tasks from a CSV or NDJSON file in batches"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = self.last_report = 0.0
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File path or - for stdin")
+        parser.add_argument(
+            "--format",
+            choices=sorted(importer.READERS),
+            dest="fmt",
+            help="Input format (by file extension by default)",
+        )
+        parser.add_argument("--batch-size", type=int, default=importer.BATCH_SIZE)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate rows and resolve users and tags without writing",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=20,
+            help="How many invalid rows to print",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["fmt"] or Path(path).suffix.lstrip(".").lower()
+        if fmt not in importer.READERS:
+            raise CommandError("Unknown input format, use --format csv|ndjson")
+
+        task_importer = importer.TaskImporter(
+            batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+        self.started = self.last_report = time.perf_counter()
+        if path == "-":
+            result = self.import_file(task_importer, sys.stdin, fmt)
+        else:
+            with open(path, encoding="utf-8", newline="") as file:
+                result = self.import_file(task_importer, file, fmt)
+
+        elapsed = time.perf_counter() - self.started
+        for number, messages in result.errors[: options["max_errors"]]:
+            self.stderr.write(f"Row {number}: {'; '.join(messages)}")
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            f"{verb} {result.imported} of {result.rows} rows in {elapsed:.1f}s "
+            f"({self.rate(result, elapsed)} rows/s), new tags: {result.tags_created}"
+        )
+        if result.errors:
+            raise CommandError(f"{len(result.errors)} rows are invalid and skipped")
+
+    def import_file(self, task_importer, file, fmt: str):
+        """Импортировать открытый файл"""
+        try:
+            return task_importer.run(importer.READERS[fmt](file), self.report)
+        except importer.ImportFormatError as exc:
+            raise CommandError(str(exc)) from exc
+
+    def report(self, result) -> None:
+        """Прогресс не чаще раза в секунду"""
+        now = time.perf_counter()
+        if now - self.last_report >= 1:
+            self.last_report = now
+            rate = self.rate(result, now - self.started)
+            self.stderr.write(f"{result.rows} rows ({rate} rows/s)")
+
+    @staticmethod
+    def rate(result, elapsed: float) -> str:
+        """Скорость обработки строк"""
+        return f"{result.rows / elapsed if elapsed else 0:.0f}"
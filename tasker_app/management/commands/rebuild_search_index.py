@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tasker_app import search
+
+
+class Command(BaseCommand):
+    """Пересчёт поисковых документов всех задач"""
+
+    help = "Rebuild full-text search documents of all tasks"
+
+    def handle(self, *args, **options):
+        count = search.rebuild()
+        self.stdout.write(f"Indexed {count} tasks")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tasker_app import counters
+
+
+class Command(BaseCommand):
+    """Пересборка счётчиков задач по исполнителю, статусу и типу"""
+
+    help = "Rebuild task counters from the tasks table and report drifted counters"
+
+    def handle(self, *args, **options):
+        total, stale = counters.rebuild()
+        self.stdout.write(f"Rebuilt {total} counters, {stale} were out of sync")
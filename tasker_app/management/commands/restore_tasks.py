@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasker_app import archive
+from tasker_app.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    """Возврат задач из архива в таблицу задач"""
+
+    help = "Restore archived tasks by id (or all of them) back into the tasks table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Archived task ids")
+        parser.add_argument(
+            "--all", action="store_true", help="Restore every archived task"
+        )
+
+    def handle(self, *args, **options):
+        ids = options["ids"]
+        if options["all"]:
+            ids = list(ArchivedTask.objects.values_list("pk", flat=True))
+        elif not ids:
+            raise CommandError("Pass task ids or --all")
+        restored = archive.restore(ids)
+        self.stdout.write(f"Restored {len(restored)} tasks")
+        missing = sorted(set(ids) - set(restored))
+        if missing:
+            self.stdout.write(f"Not in archive: {', '.join(map(str, missing))}")
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasker_app import seeding
+
+
+class Command(BaseCommand):
+    """Генерация пользователей, тегов и задач для нагрузочной проверки"""
+
+    help = "Generate users, tags and tasks with realistic distributions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--tags", type=int, default=30)
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--batch-size", type=int, default=seeding.BATCH_SIZE)
+        parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+        parser.add_argument("--locale", default="ru_RU", help="Faker locale")
+
+    def handle(self, *args, **options):
+        try:
+            from faker import Faker
+        except ImportError as exc:
+            raise CommandError("seed_tasks requires faker (dev dependencies)") from exc
+
+        started = time.perf_counter()
+        try:
+            result = seeding.seed(
+                Faker(options["locale"]),
+                options["users"],
+                options["tags"],
+                options["tasks"],
+                random_seed=options["seed"],
+                batch_size=options["batch_size"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.users} users, {result.tags} tags and "
+                f"{result.tasks} tasks in {time.perf_counter() - started:.1f}s"
+            )
+        )
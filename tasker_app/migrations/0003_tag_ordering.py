@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='tag',
+            options={'ordering': ['id']},
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+from django.conf import settings
+from django.db import migrations
+
+# Схема поискового индекса зависит от СУБД (см. tasker_app.search). SQL
+# миграции не зависит от текущего кода модуля поиска
+SCHEMA = {
+    "postgresql": (
+        [
+            """
+            CREATE TABLE tasker_app_task_search (
+                task_id bigint PRIMARY KEY
+                    REFERENCES tasker_app_task (id) ON DELETE CASCADE
+                    DEFERRABLE INITIALLY DEFERRED,
+                document tsvector NOT NULL
+            )
+            """,
+            """
+            CREATE INDEX task_search_document_idx
+                ON tasker_app_task_search USING gin (document)
+            """,
+        ],
+        ["DROP TABLE tasker_app_task_search"],
+    ),
+    "sqlite": (
+        [
+            """
+            CREATE VIRTUAL TABLE tasker_app_task_fts USING fts5(
+                title, body, tags, tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """,
+        ],
+        ["DROP TABLE tasker_app_task_fts"],
+    ),
+}
+
+
+# Документы всех задач: название, описание и имена тегов. %s в PostgreSQL -
+# конфигурация полнотекстового поиска TASK_SEARCH_CONFIG
+POPULATE = {
+    "postgresql": """
+        INSERT INTO tasker_app_task_search (task_id, document)
+        SELECT t.id,
+            setweight(to_tsvector(%s::regconfig, t.title), 'A')
+            || setweight(to_tsvector(%s::regconfig, t.body), 'B')
+            || setweight(to_tsvector(%s::regconfig, coalesce((
+                SELECT string_agg(g.name, ' ')
+                FROM tasker_app_task_tags tt JOIN tasker_app_tag g ON g.id = tt.tag_id
+                WHERE tt.task_id = t.id
+            ), '')), 'C')
+        FROM tasker_app_task t
+    """,
+    "sqlite": """
+        INSERT INTO tasker_app_task_fts (rowid, title, body, tags)
+        SELECT t.id, t.title, t.body, coalesce((
+            SELECT group_concat(g.name, ' ')
+            FROM tasker_app_task_tags tt JOIN tasker_app_tag g ON g.id = tt.tag_id
+            WHERE tt.task_id = t.id
+        ), '')
+        FROM tasker_app_task t
+    """,
+}
+
+
+def create_index(apps, schema_editor):
+    """Таблица поиска и документы существующих задач"""
+    create, _ = SCHEMA[schema_editor.connection.vendor]
+    for sql in create:
+        schema_editor.execute(sql)
+    sql = POPULATE[schema_editor.connection.vendor]
+    schema_editor.execute(sql, [settings.TASK_SEARCH_CONFIG] * sql.count("%s"))
+
+
+def drop_index(apps, schema_editor):
+    """Удалить таблицу поиска"""
+    _, drop = SCHEMA[schema_editor.connection.vendor]
+    for sql in drop:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0006_task_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:00
+
+from django.db import migrations
+
+# Индекс под поиск по началу имени (full_name__istartswith -
+# UPPER(name::text) LIKE UPPER('...%')). text_pattern_ops нужен для
+# LIKE при локали БД, отличной от C. В SQLite поиск идёт без индекса.
+INDEXES = {
+    "postgresql": (
+        "CREATE INDEX tag_name_prefix_idx ON tasker_app_tag "
+        "(upper(name::text) text_pattern_ops)",
+        "DROP INDEX tag_name_prefix_idx",
+    ),
+}
+
+
+def create_index(apps, schema_editor):
+    """Создать индекс, если СУБД его поддерживает"""
+    if schema_editor.connection.vendor in INDEXES:
+        schema_editor.execute(INDEXES[schema_editor.connection.vendor][0])
+
+
+def drop_index(apps, schema_editor):
+    """Удалить индекс"""
+    if schema_editor.connection.vendor in INDEXES:
+        schema_editor.execute(INDEXES[schema_editor.connection.vendor][1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0007_task_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:30
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import migrations
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+# Пересчёт поисковых документов задач из списка id (как в миграции 0007, без
+# кода модуля поиска). {marks} - по %s на каждый id
+UPDATE_DOCUMENTS = {
+    "postgresql": [
+        """
+        INSERT INTO tasker_app_task_search (task_id, document)
+        SELECT t.id,
+            setweight(to_tsvector(%s::regconfig, t.title), 'A')
+            || setweight(to_tsvector(%s::regconfig, t.body), 'B')
+            || setweight(to_tsvector(%s::regconfig, coalesce((
+                SELECT string_agg(g.name, ' ')
+                FROM tasker_app_task_tags tt JOIN tasker_app_tag g ON g.id = tt.tag_id
+                WHERE tt.task_id = t.id
+            ), '')), 'C')
+        FROM tasker_app_task t
+        WHERE t.id IN ({marks})
+        ON CONFLICT (task_id) DO UPDATE SET document = EXCLUDED.document
+        """,
+    ],
+    "sqlite": [
+        "DELETE FROM tasker_app_task_fts WHERE rowid IN ({marks})",
+        """
+        INSERT INTO tasker_app_task_fts (rowid, title, body, tags)
+        SELECT t.id, t.title, t.body, coalesce((
+            SELECT group_concat(g.name, ' ')
+            FROM tasker_app_task_tags tt JOIN tasker_app_tag g ON g.id = tt.tag_id
+            WHERE tt.task_id = t.id
+        ), '')
+        FROM tasker_app_task t
+        WHERE t.id IN ({marks})
+        """,
+    ],
+}
+# Ключи версии кеша всех досок (tasker_app.board_cache): без них доски
+# получат новую версию и не отдадут закешированные страницы со старыми тегами
+BOARD_CACHE_KEYS = ["boards:version:board", "boards:modified:board"]
+
+
+def update_documents(schema_editor, ids: list[int]) -> None:
+    """Пересчитать поисковые документы задач ids"""
+    statements = UPDATE_DOCUMENTS[schema_editor.connection.vendor]
+    for start in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[start : start + BATCH_SIZE]
+        marks = ", ".join(["%s"] * len(chunk))
+        for sql in statements:
+            sql = sql.format(marks=marks)
+            config = [settings.TASK_SEARCH_CONFIG] * sql.count("%s::regconfig")
+            schema_editor.execute(sql, [*config, *chunk])
+
+
+def merge_duplicates(apps, schema_editor):
+    """Слить теги, совпадающие без учёта регистра и пробелов
+
+    Остаётся тег с наименьшим id, связи задач с дублями переносятся на него
+    пачками, повторяющиеся связи отбрасываются.
+    """
+    alias = schema_editor.connection.alias
+    Tag = apps.get_model("tasker_app", "Tag")
+    Task = apps.get_model("tasker_app", "Task")
+    Link = Task.tags.through
+
+    survivors = {}
+    renamed = []
+    replace = {}
+    for tag in Tag.objects.using(alias).order_by("pk"):
+        name = " ".join(tag.name.split())
+        survivor = survivors.setdefault(name.lower(), tag)
+        if survivor is not tag:
+            replace[tag.pk] = survivor.pk
+        elif name != tag.name:
+            tag.name = name
+            renamed.append(tag)
+
+    affected = set(
+        Link.objects.using(alias)
+        .filter(tag_id__in=[tag.pk for tag in renamed] + list(replace))
+        .values_list("task_id", flat=True)
+    )
+    if replace:
+        links = Link.objects.using(alias).filter(tag_id__in=list(replace))
+        Link.objects.using(alias).bulk_create(
+            (
+                Link(task_id=task_id, tag_id=replace[tag_id])
+                for task_id, tag_id in links.values_list("task_id", "tag_id")
+            ),
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        links.delete()
+        Tag.objects.using(alias).filter(pk__in=list(replace)).delete()
+    Tag.objects.using(alias).bulk_update(renamed, ["name"], batch_size=BATCH_SIZE)
+
+    if affected:
+        Task.objects.using(alias).filter(pk__in=affected).update(
+            updated_at=timezone.now()
+        )
+        update_documents(schema_editor, sorted(affected))
+        caches[settings.BOARD_CACHE_ALIAS].delete_many(BOARD_CACHE_KEYS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0008_tag_name_prefix'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+    ]
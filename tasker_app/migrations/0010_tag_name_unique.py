@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0009_merge_duplicate_tags'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='tag_name_ci_unique', violation_error_message='Тег с таким именем уже существует'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_counters(apps, schema_editor):
+    """Счётчики существующих задач"""
+    alias = schema_editor.connection.alias
+    Task = apps.get_model("tasker_app", "Task")
+    TaskCounter = apps.get_model("tasker_app", "TaskCounter")
+    rows = (
+        Task.objects.using(alias)
+        .order_by()
+        .values_list("user_name_id", "status", "task_type")
+        .annotate(total=models.Count("id"))
+    )
+    TaskCounter.objects.using(alias).bulk_create(
+        [
+            TaskCounter(user_id=user_id, status=status, task_type=task_type, count=total)
+            for user_id, status, task_type, total in rows
+        ],
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0010_tag_name_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('closed', 'Closed'), ('new', 'New')], max_length=20)),
+                ('task_type', models.CharField(choices=[('task', 'Task'), ('bug', 'Bug'), ('feature', 'Feature'), ('pbi', 'Product Backlog Item'), ('epic', 'Epic')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'status', 'task_type'), name='taskcounter_key_unique')],
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
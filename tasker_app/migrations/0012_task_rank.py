@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:00
+
+import tasker_app.models
+from django.conf import settings
+from django.db import migrations, models
+
+# Зазор между соседними задачами колонки (tasker_app.bulk.RANK_STEP)
+RANK_STEP = 1 << 16
+
+
+def fill_rank(apps, schema_editor):
+    """Порядок существующих задач в колонке - прежний, по сроку"""
+    table = apps.get_model("tasker_app", "Task")._meta.db_table
+    schema_editor.execute(
+        f"""
+        UPDATE {table} SET "rank" = ordered.n * %s
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY status ORDER BY end_date, id) AS n
+            FROM {table}
+        ) AS ordered
+        WHERE {table}.id = ordered.id
+        """,
+        [RANK_STEP],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0011_taskcounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_status_end_date_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.BigIntegerField(default=tasker_app.models.default_rank, verbose_name='Порядок'),
+        ),
+        migrations.RunPython(fill_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'rank', 'id'], name='task_status_rank_idx'),
+        ),
+    ]
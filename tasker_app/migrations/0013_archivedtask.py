@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasker_app', '0012_task_rank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100)),
+                ('body', models.TextField()),
+                ('end_date', models.DateField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('task_type', models.CharField(choices=[('task', 'Task'), ('bug', 'Bug'), ('feature', 'Feature'), ('pbi', 'Product Backlog Item'), ('epic', 'Epic')], max_length=20, verbose_name='Тип задачи')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('closed', 'Closed'), ('new', 'New')], max_length=20, verbose_name='Статус задачи')),
+                ('rank', models.BigIntegerField(verbose_name='Порядок')),
+                ('archived_at', models.DateTimeField(verbose_name='В архиве с')),
+                ('tags', models.ManyToManyField(blank=True, related_name='archived_tasks', to='tasker_app.tag')),
+                ('user_name', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
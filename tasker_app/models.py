@@ -1,9 +1,35 @@
+import time
 from datetime import date
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 from user_app.models import CustomUser
 
 
+def default_rank() -> int:
+    """Порядок новой задачи в колонке канбана - после всех существующих
+
+    Время в микросекундах растёт без запроса к БД, оставляет между соседними
+    задачами зазор для вставки перетаскиванием (tasker_app.bulk.move_tasks)
+    и точно представимо числом JavaScript.
+    """
+    return time.time_ns() // 1000
+
+
+class TaskQuerySet(models.QuerySet):
+    """QuerySet задач с готовыми выборками для досок"""
+
+    def for_board(self):
+        """Задачи с исполнителем и тегами за фиксированное число запросов"""
+        return self.select_related("user_name").prefetch_related("tags")
+
+    def open(self):
+        """Незакрытые задачи (покрываются частичным индексом по end_date)"""
+        return self.exclude(status=Task.TaskStatus.CLOSED)
+
+
 class Task(models.Model):
     """Модель задачи"""
 
@@ -32,6 +58,9 @@ class Task(models.Model):
     body = models.TextField()
     end_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Обновляется при save(); UPDATE и изменения тегов в обход save()
+    # выставляют его сами (tasker_app.bulk, сигналы m2m_changed)
+    updated_at = models.DateTimeField(auto_now=True)
     tags = models.ManyToManyField("Tag", related_name="tasks", blank=True)
     task_type = models.CharField(
         max_length=20,
@@ -46,17 +75,81 @@ class Task(models.Model):
         verbose_name="Статус задачи",
         blank=True,
     )
+    # Порядок в колонке канбана: задачи колонки идут по (rank, id)
+    rank = models.BigIntegerField(default=default_rank, verbose_name="Порядок")
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        """Индексы под пути доступа досок и админки"""
+
+        indexes = [
+            # Колонки канбана: status = X ORDER BY rank, id
+            models.Index(fields=["status", "rank", "id"], name="task_status_rank_idx"),
+            # Главная и "Сегодня": end_date = X / ORDER BY end_date, id
+            models.Index(fields=["end_date", "id"], name="task_end_date_idx"),
+            # Незакрытые задачи по сроку
+            models.Index(
+                fields=["end_date", "id"],
+                name="task_open_end_date_idx",
+                condition=~Q(status="closed"),
+            ),
+            # Задачи исполнителя по сроку
+            models.Index(fields=["user_name", "end_date"], name="task_user_end_date_idx"),
+            # Валидаторы условных GET: последнее изменение задач
+            models.Index(fields=["updated_at"], name="task_updated_at_idx"),
+            # Сортировка списка в админке
+            models.Index(fields=["end_date", "title"], name="task_end_date_title_idx"),
+        ]
 
     def __str__(self):
         return str(self.title)
 
+    # Поля, исходные значения которых запоминаются при загрузке из БД
+    TRACKED_FIELDS = ("status", "task_type", "user_name_id", "end_date")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Сигналы сравнивают с ними новые значения (например, смену статуса)
+        instance.loaded_values = {
+            name: instance.__dict__[name]
+            for name in cls.TRACKED_FIELDS
+            if name in instance.__dict__
+        }
+        return instance
+
+    @property
+    def version(self) -> str:
+        """Версия для проверки одновременного изменения - отметка updated_at
+
+        Её меняют все пути записи задачи, включая массовые операции и теги.
+        """
+        return self.updated_at.isoformat()
+
+    def save(self, *args, **kwargs):
+        # Сигналы post_save (счётчики tasker_app.counters) пишут в той же
+        # транзакции, что и задача; delete() уже выполняется в транзакции
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
     @classmethod
-    def get_by_date(cls, target_date: date = date.today()):
-        """Получить задачи по конкретной дате"""
+    def get_by_date(cls, target_date: date | None = None):
+        """Получить задачи по конкретной дате (по умолчанию - на сегодня)
+
+        "Сегодня" считается в активном часовом поясе запроса и на момент
+        вызова, а не импорта модуля.
+        """
+        if target_date is None:
+            target_date = timezone.localdate()
         return Task.objects.filter(end_date=target_date)
 
     def get_tags_list(self) -> list:
-        """Получить список тегов задачи"""
+        """Получить список тегов задачи
+
+        Если теги загружены через prefetch_related (см. TaskQuerySet.for_board),
+        повторного запроса к БД не будет.
+        """
         return [tag.name for tag in self.tags.all()]
 
     def get_str_with_all_tags(self) -> str:
@@ -64,10 +157,154 @@ class Task(models.Model):
         return ", ".join(self.get_tags_list())
 
 
+class TaskCounter(models.Model):
+    """Число задач исполнителя со статусом и типом (tasker_app.counters)"""
+
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="task_counters"
+    )
+    status = models.CharField(max_length=20, choices=Task.TaskStatus.choices)
+    task_type = models.CharField(max_length=20, choices=Task.TaskType.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        """Один счётчик на исполнителя, статус и тип"""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "status", "task_type"], name="taskcounter_key_unique"
+            ),
+        ]
+
+
+def normalize_tag_name(name: str) -> str:
+    """Имя тега без крайних и повторных пробелов"""
+    return " ".join(str(name).split())
+
+
+class TagManager(models.Manager):
+    """Менеджер тегов с разрешением имён пачкой"""
+
+    def get_or_create_many(self, names, create: bool = True):
+        """Теги по именам за постоянное число запросов
+
+        Имена сравниваются после нормализации и без учёта регистра. Возвращает
+        (словарь имя -> id, список имён новых тегов). С create=False новые теги
+        не создаются, их id - None (проверка импорта без записи).
+        """
+        keys = {name: normalize_tag_name(name) for name in names}
+        keys = {name: key for name, key in keys.items() if key}
+        found = self._find(set(keys.values())) if keys else {}
+        # Первое написание нового имени становится именем тега
+        new_names: dict[str, str] = {}
+        for key in keys.values():
+            if key.lower() not in found:
+                new_names.setdefault(key.lower(), key)
+        if new_names and create:
+            # Параллельно созданные теги пропускаются и находятся повторным запросом
+            self.bulk_create(
+                [self.model(name=name) for name in new_names.values()],
+                ignore_conflicts=True,
+            )
+            found.update(self._find(set(new_names.values())))
+        tags = {name: found.get(key.lower()) for name, key in keys.items()}
+        return tags, list(new_names.values())
+
+    def _find(self, names: set[str]) -> dict[str, int]:
+        # SQLite понижает регистр только латиницы, поэтому в запросе есть и
+        # исходные написания, а сопоставление идёт по lower() Python
+        lowered = {name.lower() for name in names} | names
+        queryset = self.annotate(key=Lower("name")).filter(key__in=lowered)
+        rows = queryset.order_by("-pk").values_list("name", "pk")
+        return {name.lower(): pk for name, pk in rows}
+
+
 class Tag(models.Model):
-    """Модель тегов для задач"""
+    """Модель тегов для задач
+
+    Имена нормализуются при сохранении и уникальны без учёта регистра.
+    """
 
     name = models.CharField(max_length=50)
 
+    objects = TagManager()
+
+    class Meta:
+        """Теги выводятся в порядке создания"""
+
+        ordering = ["id"]
+        constraints = [
+            models.UniqueConstraint(
+                Lower("name"),
+                name="tag_name_ci_unique",
+                violation_error_message="Тег с таким именем уже существует",
+            ),
+        ]
+
     def __str__(self):
         return str(self.name)
+
+    def clean(self):
+        self.name = normalize_tag_name(self.name)
+
+    def save(self, *args, **kwargs):
+        self.name = normalize_tag_name(self.name)
+        super().save(*args, **kwargs)
+
+
+class TaskEvent(models.Model):
+    """Журнал событий задач, записываемый воркером пачками"""
+
+    class Kind(models.TextChoices):
+        """Виды событий"""
+
+        CREATED = "created", "Created"
+        UPDATED = "updated", "Updated"
+        STATUS_CHANGED = "status_changed", "Status changed"
+        DELETED = "deleted", "Deleted"
+
+    # Без внешнего ключа: события удалённых задач тоже хранятся
+    task_id = models.BigIntegerField(db_index=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    payload = models.JSONField(default=dict)
+    occurred_at = models.DateTimeField()
+    recorded_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.kind} #{self.task_id}"
+
+
+class ArchivedTask(models.Model):
+    """Закрытая задача, перенесённая из таблицы задач (tasker_app.archive)
+
+    id - прежний id задачи: ссылки на карточку остаются рабочими, а
+    восстановленная задача получает тот же id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    user_name = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name="archived_tasks",
+    )
+    body = models.TextField()
+    end_date = models.DateField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    tags = models.ManyToManyField("Tag", related_name="archived_tasks", blank=True)
+    task_type = models.CharField(
+        max_length=20, choices=Task.TaskType.choices, verbose_name="Тип задачи"
+    )
+    status = models.CharField(
+        max_length=20, choices=Task.TaskStatus.choices, verbose_name="Статус задачи"
+    )
+    rank = models.BigIntegerField(verbose_name="Порядок")
+    archived_at = models.DateTimeField(verbose_name="В архиве с")
+
+    def __str__(self):
+        return str(self.title)
+
+    # Теги выводятся так же, как у задачи
+    get_tags_list = Task.get_tags_list
+    get_str_with_all_tags = Task.get_str_with_all_tags
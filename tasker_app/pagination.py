@@ -0,0 +1,150 @@
+"""Курсорная (keyset) пагинация задач
+
+Вместо OFFSET страница выбирается условием "после последней показанной
+записи" по стабильной сортировке, поэтому глубокие страницы стоят столько же,
+сколько первая. Курсор - непрозрачная строка с ключом сортировки последней
+записи страницы.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, aprefetch_related_objects, prefetch_related_objects
+
+
+class InvalidCursor(InvalidPage):
+    """Курсор повреждён или не соответствует сортировке"""
+
+
+@dataclass
+class KeysetPage:
+    """Страница выборки и курсор следующей страницы"""
+
+    object_list: list
+    next_cursor: str | None = None
+    total: int | None = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        """Есть ли записи после этой страницы"""
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """Пагинатор по возрастающей сортировке из уникального набора полей"""
+
+    def __init__(self, queryset, per_page: int, ordering=("end_date", "id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self._fields = [queryset.model._meta.get_field(name) for name in ordering]
+
+    def encode_cursor(self, obj) -> str:
+        """Курсор, указывающий на запись obj (модель или словарь values())"""
+        if isinstance(obj, dict):
+            key = [obj[name] for name in self.ordering]
+        else:
+            key = [getattr(obj, f.attname) for f in self._fields]
+        raw = json.dumps(key, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> list:
+        """Значения ключа сортировки из курсора"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(key, list) or len(key) != len(self._fields):
+                raise ValueError("wrong cursor length")
+            return [f.to_python(value) for f, value in zip(self._fields, key)]
+        except (ValueError, TypeError, binascii.Error, ValidationError) as exc:
+            raise InvalidCursor("Некорректный курсор страницы") from exc
+
+    def after(self, cursor: str | None) -> Q:
+        """Условие "строго после курсора" для лексикографической сортировки"""
+        if not cursor:
+            return Q()
+        key = self.decode_cursor(cursor)
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            step = Q(**{f"{name}__gt": key[i]})
+            for prev_name, prev_value in zip(self.ordering[:i], key[:i]):
+                step &= Q(**{prev_name: prev_value})
+            condition |= step
+        # Избыточное условие по первому полю даёт планировщику границу
+        # диапазона индекса: OR-ветки сами по себе в Index Cond не попадают
+        return Q(**{f"{self.ordering[0]}__gte": key[0]}) & condition
+
+    def page_queryset(self, queryset, cursor: str | None):
+        """Выборка одной страницы с запасом в одну запись для признака next"""
+        queryset = queryset.filter(self.after(cursor)).order_by(*self.ordering)
+        return queryset[: self.per_page + 1]
+
+    def make_page(self, rows: list) -> KeysetPage:
+        """Страница из выборки page_queryset"""
+        if len(rows) <= self.per_page:
+            return KeysetPage(rows)
+        rows = rows[: self.per_page]
+        return KeysetPage(rows, self.encode_cursor(rows[-1]))
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        """Страница после курсора (первая, если курсора нет)"""
+        return self.make_page(list(self.page_queryset(self.queryset, cursor)))
+
+    async def apage(self, cursor: str | None = None) -> KeysetPage:
+        """page() для асинхронных представлений"""
+        queryset = self.page_queryset(self.queryset, cursor)
+        # Размер пачки - вся страница: prefetch_related одним запросом
+        rows = [obj async for obj in queryset.aiterator(chunk_size=self.per_page + 1)]
+        return self.make_page(rows)
+
+    def column_pages(self, column: str, cursors: dict) -> dict[str, KeysetPage]:
+        """Страницы нескольких колонок (например, статусов канбана)
+
+        cursors - словарь {значение колонки: курсор или None}. Там, где СУБД
+        позволяет LIMIT внутри UNION, все колонки выбираются одним запросом.
+        """
+        rows = [obj for part in self._column_parts(column, cursors) for obj in part]
+        # prefetch_related выполняется один раз для строк всех колонок
+        prefetch_related_objects(rows, *self._prefetch_lookups())
+        return self._group_columns(rows, column, cursors)
+
+    async def acolumn_pages(self, column: str, cursors: dict) -> dict[str, KeysetPage]:
+        """column_pages() для асинхронных представлений"""
+        rows = []
+        for part in self._column_parts(column, cursors):
+            rows += [obj async for obj in part]
+        await aprefetch_related_objects(rows, *self._prefetch_lookups())
+        return self._group_columns(rows, column, cursors)
+
+    def _prefetch_lookups(self) -> tuple:
+        return self.queryset._prefetch_related_lookups  # pylint: disable=protected-access
+
+    def _column_parts(self, column: str, cursors: dict) -> list:
+        # Выборки колонок без prefetch_related: одна с UNION или по колонке
+        queryset = self.queryset.prefetch_related(None)
+        parts = [
+            self.page_queryset(queryset.filter(**{column: value}), cursor)
+            for value, cursor in cursors.items()
+        ]
+        features = connections[queryset.db].features
+        if len(parts) > 1 and features.supports_slicing_ordering_in_compound:
+            return [parts[0].union(*parts[1:], all=True)]
+        return parts
+
+    def _group_columns(self, rows: list, column: str, cursors: dict) -> dict:
+        grouped: dict[str, list] = {value: [] for value in cursors}
+        for obj in rows:
+            value = obj[column] if isinstance(obj, dict) else getattr(obj, column)
+            grouped[value].append(obj)
+        return {value: self.make_page(objs) for value, objs in grouped.items()}
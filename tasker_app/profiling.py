@@ -0,0 +1,246 @@
+"""Профилирование запросов: SQL, шаблоны и Python по представлениям
+
+RequestProfilingMiddleware (включается настройкой REQUEST_PROFILING) считает
+для каждого запроса число и время SQL-запросов, время рендеринга шаблона и
+оставшееся время Python. Итоги запроса уходят в заголовок Server-Timing и в
+скользящую сводку процесса по представлениям (последние
+REQUEST_PROFILING_WINDOW запросов каждого), доступную администраторам.
+
+Повторы одного и того же SQL из одного места кода (N+1, например
+Task.get_tags_list без prefetch_related) помечаются с местом вызова.
+"""
+
+import functools
+import threading
+import time
+import traceback
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from django.http import JsonResponse
+
+
+def call_site() -> str:
+    """Ближайший к запросу кадр кода проекта: "путь:строка в функции" """
+    root = str(settings.BASE_DIR)
+    for frame, lineno in traceback.walk_stack(None):
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(root)
+            and filename != __file__
+            and "site-packages" not in filename
+        ):
+            path = Path(filename).relative_to(root)
+            return f"{path}:{lineno} in {frame.f_code.co_name}"
+    return "unknown"
+
+
+@dataclass
+class QueryRecord:
+    """Выполненный SQL-запрос"""
+
+    sql: str
+    params: str
+    duration: float
+    site: str
+
+
+@dataclass
+class RequestProfile:
+    """Метрики одного запроса; служит и обёрткой execute_wrapper"""
+
+    queries: list[QueryRecord] = field(default_factory=list)
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    total_time: float = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.sql_time += duration
+            self.queries.append(QueryRecord(sql, repr(params), duration, call_site()))
+
+    @property
+    def python_time(self) -> float:
+        """Время вне БД и шаблонов"""
+        return max(self.total_time - self.sql_time - self.template_time, 0.0)
+
+    def duplicates(self) -> list[dict]:
+        """SQL, выполненный из одного места больше одного раза"""
+        groups: dict[tuple, list[str]] = defaultdict(list)
+        for query in self.queries:
+            groups[(query.site, query.sql)].append(query.params)
+        return [
+            {
+                "site": site,
+                "sql": sql,
+                "count": len(params),
+                # True - те же параметры, т.е. результат можно было переиспользовать
+                "identical": len(set(params)) < len(params),
+            }
+            for (site, sql), params in groups.items()
+            if len(params) > 1
+        ]
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing"""
+        metrics = [
+            f'db;dur={self.sql_time * 1000:.1f};desc="{len(self.queries)} queries"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+            f"app;dur={self.python_time * 1000:.1f}",
+            f"total;dur={self.total_time * 1000:.1f}",
+        ]
+        duplicates = sum(item["count"] - 1 for item in self.duplicates())
+        if duplicates:
+            metrics.append(f'dup;desc="{duplicates} repeated queries"')
+        return ", ".join(metrics)
+
+
+@dataclass
+class Sample:
+    """Итоги запроса в сводке"""
+
+    queries: int
+    sql_ms: float
+    template_ms: float
+    python_ms: float
+    total_ms: float
+    duplicates: list[dict]
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    p95 = ordered[max(0, round(0.95 * len(ordered)) - 1)]
+    return {
+        "avg": round(sum(ordered) / len(ordered), 2),
+        "p95": round(p95, 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+class ProfileStore:
+    """Скользящая сводка процесса по представлениям"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._samples: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def add(self, view: str, profile: RequestProfile) -> None:
+        """Добавить итоги запроса к представлению view"""
+        sample = Sample(
+            queries=len(profile.queries),
+            sql_ms=profile.sql_time * 1000,
+            template_ms=profile.template_time * 1000,
+            python_ms=profile.python_time * 1000,
+            total_ms=profile.total_time * 1000,
+            duplicates=profile.duplicates(),
+        )
+        with self._lock:
+            self._samples[view].append(sample)
+
+    def clear(self) -> None:
+        """Сбросить сводку"""
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> dict[str, dict]:
+        """Статистика по каждому представлению"""
+        with self._lock:
+            views = {view: list(samples) for view, samples in self._samples.items()}
+        result = {}
+        for view, samples in sorted(views.items()):
+            duplicates: dict[tuple, dict] = {}
+            for sample in samples:
+                for item in sample.duplicates:
+                    entry = duplicates.setdefault(
+                        (item["site"], item["sql"]),
+                        {**item, "requests": 0, "count": 0},
+                    )
+                    entry["requests"] += 1
+                    entry["count"] = max(entry["count"], item["count"])
+            result[view] = {
+                "requests": len(samples),
+                **{
+                    metric: _stats([getattr(sample, metric) for sample in samples])
+                    for metric in (
+                        "queries",
+                        "sql_ms",
+                        "template_ms",
+                        "python_ms",
+                        "total_ms",
+                    )
+                },
+                "duplicates": list(duplicates.values()),
+            }
+        return result
+
+
+@functools.cache
+def get_store() -> ProfileStore:
+    """Сводка текущего процесса"""
+    return ProfileStore(settings.REQUEST_PROFILING_WINDOW)
+
+
+@receiver(setting_changed)
+def reset_store(*, setting, **kwargs):
+    """Пересоздать сводку при изменении настроек (в тестах)"""
+    if setting.startswith("REQUEST_PROFILING"):
+        get_store.cache_clear()
+
+
+class RequestProfilingMiddleware:
+    """Метрики запроса в Server-Timing и в сводке по представлениям"""
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = request.profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        # Для потоковых ответов время чтения данных не учитывается
+        profile.total_time = time.perf_counter() - started
+
+        match = request.resolver_match
+        get_store().add(match.view_name if match else "<unresolved>", profile)
+        response["Server-Timing"] = profile.server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        """Отрендерить шаблон здесь, чтобы замерить время рендеринга"""
+        profile = request.profile
+        sql_before = profile.sql_time
+        started = time.perf_counter()
+        response.render()
+        # SQL ленивых выборок в шаблоне уже учтён во времени БД
+        elapsed = time.perf_counter() - started
+        profile.template_time += elapsed - (profile.sql_time - sql_before)
+        return response
+
+
+@staff_member_required
+def profiling_summary(request):
+    """Сводка профилирования (POST сбрасывает её)"""
+    if request.method == "POST":
+        get_store().clear()
+    return JsonResponse(
+        {"enabled": settings.REQUEST_PROFILING, "views": get_store().summary()},
+        json_dumps_params={"ensure_ascii": False, "indent": 2},
+    )
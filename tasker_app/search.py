@@ -0,0 +1,188 @@
+"""Полнотекстовый поиск задач
+
+Для каждой задачи хранится поисковый документ из названия (самый большой
+вес), описания и имён тегов. В PostgreSQL это tsvector в таблице
+tasker_app_task_search с GIN-индексом, в SQLite (локальная проверка) -
+виртуальная таблица FTS5 tasker_app_task_fts. Документы обновляются на всех
+путях записи (сигналы и tasker_app.bulk) одним запросом на пачку задач.
+Результаты ранжируются: ts_rank_cd в PostgreSQL, bm25 в SQLite.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from tasker_app.models import Tag, Task
+
+
+CHUNK_SIZE = 1000
+PER_PAGE = 20
+
+TASK_TABLE = Task._meta.db_table  # pylint: disable=protected-access
+TAG_TABLE = Tag._meta.db_table  # pylint: disable=protected-access
+LINK_TABLE = Task.tags.through._meta.db_table  # pylint: disable=protected-access
+
+
+class PostgresSearch:
+    """tsvector с весами A (название), B (описание), C (теги)"""
+
+    table = "tasker_app_task_search"
+
+    def update_sql(self, ids: list[int]) -> list[tuple[str, list]]:
+        """Пересчёт документов задач ids; удалённые задачи удаляет каскад FK"""
+        config = settings.TASK_SEARCH_CONFIG
+        sql = f"""
+            INSERT INTO {self.table} (task_id, document)
+            SELECT t.id,
+                setweight(to_tsvector(%s::regconfig, t.title), 'A')
+                || setweight(to_tsvector(%s::regconfig, t.body), 'B')
+                || setweight(to_tsvector(%s::regconfig, coalesce((
+                    SELECT string_agg(g.name, ' ')
+                    FROM {LINK_TABLE} tt JOIN {TAG_TABLE} g ON g.id = tt.tag_id
+                    WHERE tt.task_id = t.id
+                ), '')), 'C')
+            FROM {TASK_TABLE} t
+            WHERE t.id = ANY(%s)
+            ON CONFLICT (task_id) DO UPDATE SET document = EXCLUDED.document
+        """
+        return [(sql, [config, config, config, list(ids)])]
+
+    def match_sql(self, query: str) -> tuple[str, list]:
+        """id задач, подходящих под запрос"""
+        sql = (
+            f"SELECT task_id FROM {self.table} "
+            "WHERE document @@ websearch_to_tsquery(%s::regconfig, %s)"
+        )
+        return sql, [settings.TASK_SEARCH_CONFIG, query]
+
+    def ranked_sql(self, query: str, limit: int, offset: int) -> tuple[str, list]:
+        """id задач по убыванию релевантности"""
+        config = settings.TASK_SEARCH_CONFIG
+        sql = f"""
+            SELECT s.task_id
+            FROM {self.table} s, websearch_to_tsquery(%s::regconfig, %s) q
+            WHERE s.document @@ q
+            ORDER BY ts_rank_cd(s.document, q) DESC, s.task_id
+            LIMIT %s OFFSET %s
+        """
+        return sql, [config, query, limit, offset]
+
+
+class SqliteSearch:
+    """FTS5 с колонками title, body, tags и весами bm25"""
+
+    table = "tasker_app_task_fts"
+
+    def update_sql(self, ids: list[int]) -> list[tuple[str, list]]:
+        """Удаление старых документов задач ids и вставка новых"""
+        marks = ", ".join(["%s"] * len(ids))
+        return [
+            (f"DELETE FROM {self.table} WHERE rowid IN ({marks})", list(ids)),
+            (
+                f"""
+                INSERT INTO {self.table} (rowid, title, body, tags)
+                SELECT t.id, t.title, t.body, coalesce((
+                    SELECT group_concat(g.name, ' ')
+                    FROM {LINK_TABLE} tt JOIN {TAG_TABLE} g ON g.id = tt.tag_id
+                    WHERE tt.task_id = t.id
+                ), '')
+                FROM {TASK_TABLE} t
+                WHERE t.id IN ({marks})
+                """,
+                list(ids),
+            ),
+        ]
+
+    @staticmethod
+    def fts_query(query: str) -> str:
+        """Запрос FTS5: все слова, каждое как префикс"""
+        words = re.findall(r"\w+", query)
+        # Пустая фраза ничего не находит
+        return " ".join(f'"{word}"*' for word in words) or '""'
+
+    def match_sql(self, query: str) -> tuple[str, list]:
+        """id задач, подходящих под запрос"""
+        sql = f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s"
+        return sql, [self.fts_query(query)]
+
+    def ranked_sql(self, query: str, limit: int, offset: int) -> tuple[str, list]:
+        """id задач по убыванию релевантности"""
+        sql = f"""
+            SELECT rowid FROM {self.table}
+            WHERE {self.table} MATCH %s
+            ORDER BY bm25({self.table}, 5.0, 2.0, 1.0), rowid
+            LIMIT %s OFFSET %s
+        """
+        return sql, [self.fts_query(query), limit, offset]
+
+
+BACKENDS = {"postgresql": PostgresSearch, "sqlite": SqliteSearch}
+
+
+def get_backend(using: str = "default"):
+    """Поисковый бэкенд СУБД подключения using"""
+    return BACKENDS[connections[using].vendor]()
+
+
+def _chunks(ids: list[int]):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start : start + CHUNK_SIZE]
+
+
+def update_documents(ids, using: str = "default") -> None:
+    """Пересчитать документы задач ids (удалённые задачи - убрать из индекса)"""
+    ids = sorted(set(ids))
+    if not ids:
+        return
+    backend = get_backend(using)
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(ids):
+            for sql, params in backend.update_sql(chunk):
+                cursor.execute(sql, params)
+
+
+def rebuild(using: str = "default") -> int:
+    """Пересчитать документы всех задач"""
+    ids = list(Task.objects.using(using).values_list("pk", flat=True))
+    update_documents(ids, using)
+    return len(ids)
+
+
+def filter_tasks(queryset, query: str):
+    """Задачи queryset, подходящие под запрос (без ранжирования)"""
+    sql, params = get_backend(queryset.db).match_sql(query)
+    return queryset.filter(pk__in=RawSQL(sql, params))
+
+
+@dataclass
+class SearchPage:
+    """Страница результатов поиска"""
+
+    object_list: list
+    number: int
+    has_next: bool
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def search(query: str, page: int = 1, per_page: int = PER_PAGE) -> SearchPage:
+    """Страница page задач по убыванию релевантности запросу"""
+    if not query.strip():
+        return SearchPage([], page, has_next=False)
+    sql, params = get_backend().ranked_sql(query, per_page + 1, (page - 1) * per_page)
+    with connections["default"].cursor() as cursor:
+        cursor.execute(sql, params)
+        ids = [row[0] for row in cursor.fetchall()]
+    tasks = Task.objects.for_board().in_bulk(ids[:per_page])
+    return SearchPage(
+        [tasks[pk] for pk in ids[:per_page] if pk in tasks],
+        page,
+        has_next=len(ids) > per_page,
+    )
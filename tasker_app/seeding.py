@@ -0,0 +1,169 @@
+"""Генерация больших наборов данных для нагрузочной проверки
+
+Распределения приближены к живому трекеру: почти половина задач закрыта,
+у закрытых срок в прошлом, у открытых - около сегодняшнего дня; нагрузка
+на исполнителей и популярность тегов неравномерны (степенной закон).
+Тексты берутся из заранее сгенерированных faker пулов, вставка - пачками
+через bulk_create.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+
+from tasker_app import bulk
+from tasker_app.models import Tag, Task
+from user_app.models import CustomUser
+
+
+BATCH_SIZE = 5000
+PASSWORD = "password"
+
+STATUS_WEIGHTS = {
+    Task.TaskStatus.NEW: 30,
+    Task.TaskStatus.ACTIVE: 25,
+    Task.TaskStatus.CLOSED: 45,
+}
+TYPE_WEIGHTS = {
+    Task.TaskType.TASK: 50,
+    Task.TaskType.BUG: 25,
+    Task.TaskType.FEATURE: 15,
+    Task.TaskType.PBI: 7,
+    Task.TaskType.EPIC: 3,
+}
+# Количество тегов у задачи
+TAG_COUNT_WEIGHTS = {0: 20, 1: 40, 2: 25, 3: 10, 4: 4, 5: 1}
+
+TEXT_POOL_SIZE = 1000
+
+
+@dataclass
+class SeedResult:
+    """Количество созданных записей"""
+
+    users: int = 0
+    tags: int = 0
+    tasks: int = 0
+
+
+def zipf_weights(count: int, exponent: float = 1.0) -> list[float]:
+    """Веса степенного распределения: первый элемент самый частый"""
+    return [1 / (rank**exponent) for rank in range(1, count + 1)]
+
+
+class Seeder:
+    """Генератор пользователей, тегов и задач"""
+
+    def __init__(
+        self, faker, random_seed: int | None = None, batch_size: int = BATCH_SIZE
+    ):
+        self.faker = faker
+        self.random = random.Random(random_seed)
+        self.batch_size = batch_size
+        if random_seed is not None:
+            faker.seed_instance(random_seed)
+
+    def create_users(self, count: int) -> list[int]:
+        """Пользователи с общим паролем PASSWORD (хешируется один раз)"""
+        password = make_password(PASSWORD)
+        offset = CustomUser.objects.count()
+        users = [
+            CustomUser(
+                email=f"user{offset + i}@{self.faker.free_email_domain()}",
+                full_name=self.faker.name(),
+                password=password,
+            )
+            for i in range(count)
+        ]
+        CustomUser.objects.bulk_create(users, batch_size=self.batch_size)
+        return [user.pk for user in users]
+
+    def create_tags(self, count: int) -> list[int]:
+        """Теги с уникальными (без учёта регистра) именами"""
+        existing = {name.lower() for name in Tag.objects.values_list("name", flat=True)}
+        names: list[str] = []
+        while len(names) < count:
+            word = name = self.faker.word().capitalize()
+            suffix = 1
+            while name.lower() in existing:
+                suffix += 1
+                name = f"{word} {suffix}"
+            existing.add(name.lower())
+            names.append(name)
+        tags = Tag.objects.bulk_create([Tag(name=name) for name in names])
+        return [tag.pk for tag in tags]
+
+    def create_tasks(self, count: int, user_ids: list[int], tag_ids: list[int]) -> int:
+        """Задачи пачками по batch_size"""
+        titles = [
+            self.faker.sentence(nb_words=4).rstrip(".") for _ in range(TEXT_POOL_SIZE)
+        ]
+        bodies = [self.faker.paragraph() for _ in range(TEXT_POOL_SIZE)]
+        user_weights = zipf_weights(len(user_ids), 0.8)
+        tag_weights = zipf_weights(len(tag_ids))
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            statuses = self._choices(STATUS_WEIGHTS, size)
+            tasks = [
+                Task(
+                    title=self.random.choice(titles),
+                    body=self.random.choice(bodies),
+                    status=status,
+                    task_type=task_type,
+                    end_date=self._end_date(status),
+                    user_name_id=user_id,
+                )
+                for status, task_type, user_id in zip(
+                    statuses,
+                    self._choices(TYPE_WEIGHTS, size),
+                    self.random.choices(user_ids, user_weights, k=size),
+                )
+            ]
+            links = [
+                self._sample(tag_ids, tag_weights, tag_count) if tag_ids else []
+                for tag_count in self._choices(TAG_COUNT_WEIGHTS, size)
+            ]
+            bulk.create_tasks(tasks, links)
+            created += size
+        return created
+
+    def _choices(self, weights: dict, size: int) -> list:
+        return self.random.choices(list(weights), list(weights.values()), k=size)
+
+    def _sample(self, population: list, weights: list, count: int) -> list:
+        # Выбор без повторов с учётом весов
+        count = min(count, len(population))
+        chosen: set = set()
+        while len(chosen) < count:
+            chosen.update(self.random.choices(population, weights, k=count - len(chosen)))
+        return list(chosen)
+
+    def _end_date(self, status: str) -> date:
+        if status == Task.TaskStatus.CLOSED:
+            offset = -int(self.random.expovariate(1 / 60))
+        else:
+            offset = int(self.random.gauss(7, 21))
+        return date.today() + timedelta(days=offset)
+
+
+def seed(faker, users: int, tags: int, tasks: int, **options) -> SeedResult:
+    """Создать users пользователей, tags тегов и tasks задач
+
+    Задачи распределяются между новыми пользователями и тегами, а если
+    их не создаётся - между уже существующими.
+    """
+    seeder = Seeder(faker, **options)
+    result = SeedResult()
+    user_ids = seeder.create_users(users)
+    tag_ids = seeder.create_tags(tags)
+    result.users, result.tags = len(user_ids), len(tag_ids)
+    if tasks:
+        user_ids = user_ids or list(CustomUser.objects.values_list("pk", flat=True))
+        tag_ids = tag_ids or list(Tag.objects.values_list("pk", flat=True))
+        if not user_ids:
+            raise ValueError("Нет пользователей для задач")
+        result.tasks = seeder.create_tasks(tasks, user_ids, tag_ids)
+    return result
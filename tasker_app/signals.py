@@ -0,0 +1,155 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from tasker_app import board_cache, bulk, counters, events, search
+from tasker_app.models import Tag, Task, TaskEvent
+from user_app.models import CustomUser
+
+
+@receiver(post_save, sender=Task)
+def task_board_changed(sender, instance, **kwargs):
+    """Устарели доски со старым и новым сроком задачи
+
+    Подключён раньше task_saved: тот обновляет loaded_values.
+    """
+    previous = getattr(instance, "loaded_values", {}).get("end_date")
+    board_cache.bump_tasks([previous, instance.end_date])
+
+
+@receiver(pre_save, sender=Task)
+def task_counter_loading(sender, instance, raw, **kwargs):
+    """Прежний ключ счётчика задачи, загруженной не из БД или не целиком"""
+    if raw or instance.pk is None or counters.loaded_key(instance) is not None:
+        return
+    previous = (
+        Task.objects.filter(pk=instance.pk).values(*counters.KEY_FIELDS).first() or {}
+    )
+    instance.loaded_values = {**getattr(instance, "loaded_values", {}), **previous}
+
+
+@receiver(post_save, sender=Task)
+def task_counter_changed(sender, instance, created, raw, update_fields=None, **kwargs):
+    """Задача перешла в другой счётчик (до task_saved, см. loaded_values)"""
+    if raw:
+        return
+    if created:
+        counters.apply(counters.moved(None, counters.task_key(instance)))
+        return
+    old = counters.loaded_key(instance)
+    new = counters.saved_key(instance, update_fields)
+    counters.apply(counters.moved(old, new))
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, **kwargs):
+    """Событие создания, изменения или смены статуса задачи"""
+    previous_status = getattr(instance, "loaded_values", {}).get("status")
+    payload = {"title": instance.title, "status": instance.status}
+    if created:
+        kind = TaskEvent.Kind.CREATED
+        payload["rank"] = instance.rank
+    elif previous_status is not None and previous_status != instance.status:
+        kind = TaskEvent.Kind.STATUS_CHANGED
+        payload["previous_status"] = previous_status
+    else:
+        kind = TaskEvent.Kind.UPDATED
+    instance.loaded_values = {
+        name: getattr(instance, name) for name in Task.TRACKED_FIELDS
+    }
+    events.record([events.make_event(kind, instance.pk, **payload)])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    """Событие удаления задачи"""
+    events.record(
+        [events.make_event(TaskEvent.Kind.DELETED, instance.pk, title=instance.title)]
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_counter_deleted(sender, instance, **kwargs):
+    """Удалённая задача выходит из счётчика"""
+    counters.apply(counters.moved(counters.task_key(instance), None))
+
+
+@receiver(post_delete, sender=Task)
+def task_board_deleted(sender, instance, **kwargs):
+    """Устарели доски со сроком удалённой задачи"""
+    board_cache.bump_tasks([instance.end_date])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=CustomUser)
+def board_changed(sender, **kwargs):
+    """Данные досок устарели"""
+    board_cache.bump_version()
+
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, update_fields=None, **kwargs):
+    """Имя исполнителя показывается на досках; вход пользователя их не меняет"""
+    if update_fields is None or set(update_fields) != {"last_login"}:
+        board_cache.bump_version()
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def task_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Теги задачи изменились: отметка изменения, поиск и доски"""
+    if reverse and action == "pre_clear":
+        # instance - тег; задачи, с которых его снимут, известны только до очистки
+        instance.cleared_task_ids = list(instance.tasks.values_list("pk", flat=True))
+        return
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        if action == "post_clear":
+            ids = instance.__dict__.pop("cleared_task_ids", [])
+        else:
+            ids = list(pk_set)
+        # Сроки задач тега неизвестны без лишнего запроса
+        board_cache.bump_version()
+    else:
+        ids = [instance.pk]
+        board_cache.bump_tasks([instance.end_date])
+    bulk.touch(ids)
+    search.update_documents(ids)
+
+
+@receiver(post_save, sender=Task)
+def task_search_changed(sender, instance, update_fields=None, **kwargs):
+    """Поисковый документ задачи: название и описание"""
+    if update_fields is None or {"title", "body"} & set(update_fields):
+        search.update_documents([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def task_search_deleted(sender, instance, **kwargs):
+    """Удалённая задача пропадает из поиска"""
+    search.update_documents([instance.pk])
+
+
+@receiver(post_save, sender=Tag)
+def tag_search_changed(sender, instance, created, **kwargs):
+    """Имя тега входит в документы его задач"""
+    if not created:
+        search.update_documents(instance.tasks.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleting(sender, instance, **kwargs):
+    """Задачи удаляемого тега (связи удаляются без m2m_changed)"""
+    instance.deleted_task_ids = list(instance.tasks.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def tag_search_deleted(sender, instance, **kwargs):
+    """Удалённый тег пропадает из документов его задач"""
+    search.update_documents(instance.__dict__.pop("deleted_task_ids", []))
@@ -0,0 +1,33 @@
+// Автодополнение для select[data-autocomplete-url] (tasker_app.widgets).
+// Сервер рендерит только выбранные варианты; остальные подгружаются из
+// эндпоинта по мере ввода в поле поиска над списком.
+document.querySelectorAll('select[data-autocomplete-url]').forEach(function (select) {
+    const input = document.createElement('input');
+    input.type = 'search';
+    input.className = 'form-control mb-1';
+    input.placeholder = 'Начните вводить имя';
+    select.before(input);
+
+    let timer;
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(async function () {
+            const url = new URL(select.dataset.autocompleteUrl, window.location.href);
+            url.searchParams.set('q', input.value);
+            const { results } = await (await fetch(url)).json();
+
+            // Выбранные варианты остаются, остальные заменяются найденными
+            select.querySelectorAll('option:not(:checked)').forEach(function (option) {
+                if (option.value) {
+                    option.remove();
+                }
+            });
+            const present = new Set(Array.from(select.options, (option) => option.value));
+            results.forEach(function ({ id, text }) {
+                if (!present.has(String(id))) {
+                    select.append(new Option(text, id));
+                }
+            });
+        }, 250);
+    });
+});
@@ -0,0 +1,29 @@
+// Часовой пояс браузера для страницы "Сегодня" (user_app.middleware)
+document.cookie = 'timezone=' + encodeURIComponent(Intl.DateTimeFormat().resolvedOptions().timeZone) +
+    '; path=/; max-age=31536000; samesite=lax';
+
+// Подгрузка следующей страницы доски по ссылке "Показать ещё".
+// Ссылка работает и без JS (обычный переход), а со скриптом карточки
+// следующей страницы дописываются в контейнер из data-load-more.
+document.addEventListener('click', async function (event) {
+    const link = event.target.closest('[data-load-more]');
+    if (!link) {
+        return;
+    }
+    event.preventDefault();
+
+    const selector = link.dataset.loadMore;
+    const response = await fetch(link.href);
+    const doc = new DOMParser().parseFromString(await response.text(), 'text/html');
+    const source = doc.querySelector(selector);
+    if (source) {
+        document.querySelector(selector).append(...source.children);
+    }
+
+    const next = doc.querySelector(`[data-load-more="${selector}"]`);
+    if (next) {
+        link.href = new URL(next.getAttribute('href'), link.href).href;
+    } else {
+        link.remove();
+    }
+});
@@ -0,0 +1,105 @@
+// Живые обновления канбана по событиям задач (Server-Sent Events).
+// Карточки переносятся между колонками, переименовываются и удаляются без
+// перезагрузки страницы; после reset (пропущены события) доска
+// перезагружается. Под WSGI сервер отвечает 204, и браузер не переподключается.
+(function () {
+    const board = document.querySelector('[data-live-url]');
+    if (!board || !window.EventSource) {
+        return;
+    }
+
+    function column(status) {
+        return document.getElementById(`${status}-column`);
+    }
+
+    function addToTotal(status, delta) {
+        const total = document.querySelector(`[data-column-total="${status}"]`);
+        if (total) {
+            total.textContent = Number(total.textContent) + delta;
+        }
+    }
+
+    // Карточка встаёт в колонку по rank (порядок перетаскивания), без
+    // rank - в начало колонки
+    function place(card, status, rank) {
+        const target = column(status);
+        if (!target) {
+            return;
+        }
+        if (rank === undefined) {
+            target.prepend(card);
+            return;
+        }
+        card.dataset.rank = rank;
+        const next = [...target.querySelectorAll('[data-task-id]')].find(function (other) {
+            return other !== card && Number(other.dataset.rank) > rank;
+        });
+        if (next || !document.querySelector(`[data-load-more="#${target.id}"]`)) {
+            target.insertBefore(card, next || null);
+        } else {
+            // Место карточки - на ещё не загруженной странице колонки
+            card.remove();
+        }
+    }
+
+    function cardStatus(card) {
+        return card.closest('[id$="-column"]').id.replace(/-column$/, '');
+    }
+
+    // Новая задача: короткая карточка со ссылкой, остальное - после перезагрузки
+    function createCard(event) {
+        const card = document.createElement('div');
+        card.className = 'card mb-3 shadow-sm hover-shadow';
+        card.dataset.taskId = event.task_id;
+        const body = document.createElement('div');
+        body.className = 'card-body';
+        const link = document.createElement('a');
+        link.href = board.dataset.taskUrl.replace('/0/', `/${event.task_id}/`);
+        link.className = 'link-dark';
+        link.dataset.taskTitle = '';
+        link.textContent = event.title;
+        body.append(link);
+        card.append(body);
+        return card;
+    }
+
+    function apply(event) {
+        const card = document.querySelector(`[data-task-id="${event.task_id}"]`);
+        const previous = card ? cardStatus(card) : event.previous_status;
+        if (event.kind === 'deleted') {
+            if (card) {
+                addToTotal(previous, -1);
+                card.remove();
+            }
+            return;
+        }
+        if (event.kind === 'created') {
+            addToTotal(event.status, 1);
+            place(createCard(event), event.status, event.rank);
+            return;
+        }
+        if (card && event.title) {
+            card.querySelector('[data-task-title]').textContent = event.title;
+        }
+        // Смена статуса: задача переходит в другую колонку
+        if (event.status && previous && previous !== event.status) {
+            addToTotal(previous, -1);
+            addToTotal(event.status, 1);
+            if (card) {
+                place(card, event.status, event.rank);
+            }
+        } else if (card && event.rank !== undefined) {
+            // Перестановка внутри колонки
+            place(card, cardStatus(card), event.rank);
+        }
+    }
+
+    const source = new EventSource(board.dataset.liveUrl);
+    source.addEventListener('tasks', function (message) {
+        JSON.parse(message.data).forEach(apply);
+    });
+    source.addEventListener('reset', function () {
+        source.close();
+        window.location.reload();
+    });
+})();
@@ -0,0 +1,110 @@
+// Перетаскивание карточек канбана между колонками и внутри колонки.
+// Карточка сразу встаёт на новое место, а переносы копятся и уходят на
+// сервер одной пачкой (KanbanMoveView) после паузы. Позиция - номер среди
+// карточек колонки, загруженных на страницу; они всегда начало колонки.
+// Если сервер пачку не принял, доска перезагружается.
+(function () {
+    const board = document.querySelector('[data-move-url]');
+    if (!board) {
+        return;
+    }
+    const DELAY = 300;
+    let pending = [];
+    let timer = null;
+    let dragged = null;
+
+    function cards(column) {
+        return [...column.querySelectorAll('[data-task-id]')];
+    }
+
+    // Карточка, перед которой встанет перетаскиваемая, по высоте курсора
+    function cardAfter(column, y) {
+        return cards(column).find(function (card) {
+            const box = card.getBoundingClientRect();
+            return card !== dragged && y < box.top + box.height / 2;
+        });
+    }
+
+    // Токен CSRF из cookie: в разметке он маскируется заново при каждом
+    // рендеринге, и страница перестала бы совпадать с кешем
+    function csrfToken() {
+        const cookie = document.cookie.split('; ').find(function (item) {
+            return item.startsWith('csrftoken=');
+        });
+        return cookie ? decodeURIComponent(cookie.split('=')[1]) : '';
+    }
+
+    async function send() {
+        const moves = pending;
+        pending = [];
+        timer = null;
+        try {
+            const response = await fetch(board.dataset.moveUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': csrfToken(),
+                },
+                body: JSON.stringify({moves: moves}),
+            });
+            if (!response.ok) {
+                throw new Error(`status ${response.status}`);
+            }
+            (await response.json()).moved.forEach(function (moved) {
+                const card = document.querySelector(`[data-task-id="${moved.id}"]`);
+                if (card) {
+                    card.dataset.rank = moved.rank;
+                }
+            });
+        } catch (error) {
+            window.location.reload();
+        }
+    }
+
+    board.addEventListener('dragstart', function (event) {
+        dragged = event.target.closest('[data-task-id]');
+        if (dragged) {
+            event.dataTransfer.effectAllowed = 'move';
+            event.dataTransfer.setData('text/plain', dragged.dataset.taskId);
+        }
+    });
+
+    board.addEventListener('dragover', function (event) {
+        if (dragged && event.target.closest('[data-column]')) {
+            event.preventDefault();
+        }
+    });
+
+    board.addEventListener('drop', function (event) {
+        const column = event.target.closest('[data-column]');
+        if (!dragged || !column) {
+            return;
+        }
+        event.preventDefault();
+        const previous = dragged.closest('[data-column]');
+        const before = cardAfter(column, event.clientY);
+        column.insertBefore(dragged, before || null);
+        if (previous !== column) {
+            const totals = document.querySelectorAll('[data-column-total]');
+            totals.forEach(function (total) {
+                if (total.dataset.columnTotal === previous.dataset.column) {
+                    total.textContent = Number(total.textContent) - 1;
+                } else if (total.dataset.columnTotal === column.dataset.column) {
+                    total.textContent = Number(total.textContent) + 1;
+                }
+            });
+        }
+        pending.push({
+            id: Number(dragged.dataset.taskId),
+            status: column.dataset.column,
+            position: cards(column).indexOf(dragged),
+        });
+        dragged = null;
+        clearTimeout(timer);
+        timer = setTimeout(send, DELAY);
+    });
+
+    board.addEventListener('dragend', function () {
+        dragged = null;
+    });
+})();
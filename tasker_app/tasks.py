@@ -1,9 +1,78 @@
+import logging
+from collections import Counter
+
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from kombu.exceptions import OperationalError
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_task_events(events: list[dict]) -> dict[str, int]:
+    """Записывает пачку событий задач одним bulk_create"""
+    from tasker_app.models import TaskEvent
+
+    TaskEvent.objects.bulk_create(
+        [
+            TaskEvent(
+                task_id=event["task_id"],
+                kind=event["kind"],
+                payload=event["payload"],
+                occurred_at=parse_datetime(event["occurred_at"]),
+            )
+            for event in events
+        ],
+        batch_size=500,
+    )
+    for event in events:
+        if event["kind"] == TaskEvent.Kind.CREATED:
+            # Вывод сообщения в консоль воркера
+            print(f"Создана новая задача: {event['payload']['title']}")
+    return dict(Counter(event["kind"] for event in events))
+
+
+@shared_task(bind=True)
+def bulk_update_tasks(self, operation: str, ids: list[int], params: dict) -> dict:
+    """Массовая операция над большой выборкой задач по частям с прогрессом"""
+    from tasker_app import bulk  # pylint: disable=cyclic-import
+
+    chunk_size = settings.TASK_BULK_CHUNK_SIZE
+    progress = {"done": 0, "total": len(ids)}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        bulk.apply(operation, chunk, **params)
+        progress["done"] += len(chunk)
+        self.update_state(state="PROGRESS", meta=progress)
+    return progress
 
 
 @shared_task
-def log_new_task(task_name: str) -> str:
-    """Выводит в консоль сообщение о создании задачи"""
-    msg = f"Создана новая задача: {task_name}"
-    print(msg)  # Вывод сообщения в консоль воркера
-    return msg  # Возвращаем сообщение для вывода в консоль сервера
+def archive_closed_tasks() -> int:
+    """Периодический перенос старых закрытых задач в архив (CELERY_BEAT_SCHEDULE)"""
+    from tasker_app import archive  # pylint: disable=cyclic-import
+
+    return archive.archive_closed()
+
+
+def send_task(task, *args, **kwargs):
+    """Отправить задачу celery, не дожидаясь результата
+
+    Без брокера (CELERY_TASK_ALWAYS_EAGER) celery сам выполнит задачу в
+    процессе. Если брокер настроен, но недоступен, задача тоже выполняется
+    в процессе, чтобы запрос не падал из-за фоновой работы. Повторные
+    попытки отправки отключены: иначе запрос ждал бы их все перед откатом.
+    """
+    try:
+        return task.apply_async(args=args, kwargs=kwargs, retry=False)
+    except OperationalError:
+        logger.warning("Брокер недоступен, задача %s выполнена в процессе", task.name)
+        return task.apply(args=args, kwargs=kwargs)
+
+
+def send_task_on_commit(task, *args, **kwargs) -> None:
+    """Отправить задачу celery после коммита текущей транзакции"""
+    transaction.on_commit(lambda: send_task(task, *args, **kwargs))
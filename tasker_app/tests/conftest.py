@@ -0,0 +1,67 @@
+# pylint: disable=redefined-outer-name
+from datetime import date
+import pytest
+
+from config.celery import app
+from tasker_app import board_cache
+from tasker_app.models import Task, Tag
+from user_app.models import CustomUser
+
+
+@pytest.fixture(autouse=True)
+def celery_eager(settings, monkeypatch):
+    """Задачи celery выполняются в процессе, события - без таймера сброса"""
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    settings.TASK_EVENTS_FLUSH_INTERVAL = 0
+
+
+@pytest.fixture(autouse=True)
+def clear_board_cache():
+    """Кеш досок переживает откат транзакции теста - очищаем его"""
+    board_cache.get_cache().clear()
+    board_cache.stats.clear()
+
+
+@pytest.fixture
+def board_user(db):
+    """Фикстура для создания исполнителя задач"""
+    return CustomUser.objects.create_user(
+        email="board@example.com", password="testpass123", full_name="Board User"
+    )  # type: ignore
+
+
+@pytest.fixture
+def board_tags(db):
+    """Фикстура для создания тегов досок"""
+    return [Tag.objects.create(name=name) for name in ("Бэкенд", "Фронтенд", "Баг")]
+
+
+@pytest.fixture
+def make_tasks(board_user, board_tags):
+    """Фабрика задач с тегами: make_tasks(count, **fields)"""
+
+    def factory(count: int, **fields) -> list[Task]:
+        fields.setdefault("user_name", board_user)
+        fields.setdefault("end_date", date.today())
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(
+                title=f"Задача номер {i}",
+                body=f"Описание {i}",
+                **fields,
+            )
+            task.tags.set(board_tags[: i % (len(board_tags) + 1)])
+            tasks.append(task)
+        return tasks
+
+    return factory
+
+
+@pytest.fixture
+def staff_client(client, db):
+    """Клиент, авторизованный под администратором"""
+    admin = CustomUser.objects.create_superuser(
+        email="admin@example.com", password="adminpass123", full_name="Admin User"
+    )  # type: ignore
+    client.force_login(admin)
+    return client
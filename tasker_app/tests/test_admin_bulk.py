@@ -0,0 +1,237 @@
+from datetime import date, timedelta
+
+from celery.result import AsyncResult, GroupResult
+from celery.utils import uuid
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk
+from tasker_app.models import Task, Tag, TaskEvent
+from tasker_app.tasks import bulk_update_tasks
+from user_app.models import CustomUser
+
+
+CHANGELIST_URL = reverse("admin:tasker_app_task_changelist")
+
+
+def run_action(client, action: str, tasks, **params):
+    """Выполнить действие админки над задачами"""
+    data = {"action": action, "_selected_action": [task.pk for task in tasks]}
+    data.update(params)
+    return client.post(CHANGELIST_URL, data, follow=True)
+
+
+def count_queries(func, *args, **kwargs) -> int:
+    """Количество SQL-запросов при вызове func"""
+    with CaptureQueriesContext(connection) as ctx:
+        func(*args, **kwargs)
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestBulkOperations:
+    """Массовые операции выполняются за постоянное число запросов"""
+
+    @pytest.mark.parametrize(
+        "operation, params",
+        [
+            ("set_fields", {"status": "closed"}),
+            ("set_fields", {"end_date": "2030-01-01"}),
+            ("add_tag", {}),
+            ("remove_tag", {}),
+        ],
+    )
+    def test_constant_queries(self, make_tasks, board_tags, operation, params):
+        """Число запросов не зависит от размера выборки"""
+        if operation != "set_fields":
+            params = {"tag_id": board_tags[0].pk}
+        small = [task.pk for task in make_tasks(3)]
+        large = [task.pk for task in make_tasks(40)]
+
+        assert count_queries(bulk.apply, operation, small, **params) == count_queries(
+            bulk.apply, operation, large, **params
+        )
+
+    def test_chunk_ids(self, make_tasks):
+        """Id выборки отдаются частями по возрастанию, каждая часть -
+        один запрос"""
+        tasks = make_tasks(7)
+        queryset = Task.objects.exclude(pk=tasks[3].pk).order_by("-pk")
+
+        with CaptureQueriesContext(connection) as ctx:
+            chunks = list(bulk.chunk_ids(queryset, 3))
+
+        assert chunks == [
+            [tasks[0].pk, tasks[1].pk, tasks[2].pk],
+            [tasks[4].pk, tasks[5].pk, tasks[6].pk],
+        ]
+        # Последняя полная часть требует проверочного запроса
+        assert len(ctx.captured_queries) == 3
+
+    def test_add_and_remove_tag(self, make_tasks, board_tags):
+        """Тег добавляется без дублей и снимается только с выбранных задач"""
+        tasks = make_tasks(4)
+        tag = board_tags[2]
+        ids = [task.pk for task in tasks]
+
+        assert bulk.add_tag(ids, tag.pk) == 4
+        assert tag.tasks.count() == 4
+        assert bulk.remove_tag(ids[:2], tag.pk) == 2
+        assert set(tag.tasks.values_list("pk", flat=True)) == set(ids[2:])
+
+    def test_status_change_events(
+        self, make_tasks, settings, django_capture_on_commit_callbacks
+    ):
+        """Смена статуса записывается в журнал как status_changed"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        tasks = make_tasks(2, status=Task.TaskStatus.ACTIVE)
+        ids = [task.pk for task in tasks]
+        TaskEvent.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            bulk.set_fields(ids, status=Task.TaskStatus.ACTIVE)
+            bulk.set_fields(ids, status=Task.TaskStatus.CLOSED)
+
+        kinds = TaskEvent.objects.order_by("pk").values_list("kind", flat=True)
+        assert list(kinds) == ["updated", "updated", "status_changed", "status_changed"]
+
+    @pytest.mark.skipif(
+        not connection.features.has_select_for_update, reason="нет SELECT FOR UPDATE"
+    )
+    def test_set_fields_locks_rows(self, make_tasks):
+        """Строки для ключей счётчиков читаются с блокировкой"""
+        ids = [task.pk for task in make_tasks(2)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            bulk.set_fields(ids, status=Task.TaskStatus.CLOSED)
+
+        select = next(q["sql"] for q in ctx.captured_queries if "SELECT" in q["sql"])
+        assert select.endswith("FOR UPDATE")
+
+
+@pytest.mark.django_db
+class TestTaskAdminActions:
+    """Тесты массовых действий админки задач"""
+
+    def test_set_end_date_today(self, staff_client, make_tasks):
+        """Дата окончания переносится на сегодня"""
+        tasks = make_tasks(2, end_date=date.today() + timedelta(days=3))
+
+        response = run_action(staff_client, "set_end_date_today", tasks)
+
+        assert "Изменено задач: 2" in response.content.decode()
+        assert Task.objects.filter(end_date=date.today()).count() == 2
+
+    def test_set_status_and_type(self, staff_client, make_tasks):
+        """Статус и тип берутся из формы действий"""
+        tasks = make_tasks(3)
+
+        run_action(staff_client, "set_status", tasks, status="closed")
+        run_action(staff_client, "set_task_type", tasks[:1], task_type="bug")
+
+        assert Task.objects.filter(status="closed").count() == 3
+        assert Task.objects.filter(task_type="bug").count() == 1
+
+    def test_missing_param(self, staff_client, make_tasks):
+        """Без параметра действие не выполняется"""
+        tasks = make_tasks(1)
+
+        for action in ("set_status", "set_task_type", "reassign_user", "remove_tag"):
+            response = run_action(staff_client, action, tasks)
+            assert "Укажите поле" in response.content.decode()
+        assert Task.objects.get().status == Task.TaskStatus.NEW
+
+    def test_reassign_user(self, staff_client, make_tasks):
+        """Задачи переназначаются на пользователя по email"""
+        tasks = make_tasks(2)
+        other = CustomUser.objects.create_user(
+            email="other@example.com", password="pass12345", full_name="Other"
+        )  # type: ignore
+
+        run_action(staff_client, "reassign_user", tasks, user_email="OTHER@example.com")
+        response = run_action(
+            staff_client, "reassign_user", tasks, user_email="nobody@example.com"
+        )
+
+        assert "не найден" in response.content.decode()
+        assert set(Task.objects.values_list("user_name", flat=True)) == {other.pk}
+
+    def test_add_and_remove_tag(self, staff_client, make_tasks):
+        """Тег добавляется (с созданием) и снимается, регистр не важен"""
+        tasks = make_tasks(2)
+
+        run_action(staff_client, "add_tag", tasks, tag_name="Release")
+        run_action(staff_client, "add_tag", tasks, tag_name="release")
+        assert Tag.objects.get(name="Release").tasks.count() == 2
+
+        run_action(staff_client, "remove_tag", tasks[:1], tag_name="RELEASE")
+        response = run_action(staff_client, "remove_tag", tasks, tag_name="Нет такого")
+
+        assert "Тег Нет такого не найден" in response.content.decode()
+        assert Tag.objects.get(name="Release").tasks.count() == 1
+
+    def test_large_selection_runs_in_celery(
+        self, staff_client, make_tasks, settings, mocker
+    ):
+        """Большая выборка уходит в celery несколькими заданиями, общий
+        прогресс доступен в админке"""
+        settings.TASK_BULK_ASYNC_THRESHOLD = 2
+        settings.TASK_BULK_JOB_SIZE = 2
+        settings.TASK_BULK_CHUNK_SIZE = 1
+        tasks = make_tasks(5)
+        # Задачу выполняет "воркер", админка видит только бэкенд результатов
+        send = mocker.patch(
+            "tasker_app.admin.send_task",
+            side_effect=lambda task, *args: AsyncResult(task.apply(args=args).id),
+        )
+
+        response = run_action(staff_client, "set_status", tasks, status="active")
+
+        job_url = str(list(response.context["messages"])[0])
+        assert "Изменение 5 задач запущено в фоне" in job_url
+        assert [len(call.args[2]) for call in send.call_args_list] == [2, 2, 1]
+        assert Task.objects.filter(status="active").count() == 5
+        status_url = job_url.split('href="')[1].split('"')[0]
+        progress = staff_client.get(status_url).json()
+        assert progress == {"state": "PROGRESS", "done": 5, "total": 5}
+
+    def test_job_progress_with_pending_part(self, staff_client, make_tasks):
+        """Пока не все задания начаты, общее число задач неизвестно"""
+        ids = [task.pk for task in make_tasks(2)]
+        started = AsyncResult(bulk_update_tasks.apply(("set_fields", ids, {})).id)
+        group = GroupResult(uuid(), [started, AsyncResult(uuid())])
+        group.save()
+
+        url = reverse("admin:tasker_app_task_bulk_job", args=[group.id])
+
+        assert staff_client.get(url).json() == {
+            "state": "PROGRESS",
+            "done": 2,
+            "total": None,
+        }
+
+    def test_large_selection_eager(self, staff_client, make_tasks, settings, mocker):
+        """Без брокера итог всех заданий большой выборки сообщается сразу"""
+        settings.TASK_BULK_ASYNC_THRESHOLD = 2
+        settings.TASK_BULK_JOB_SIZE = 2
+        tasks = make_tasks(3)
+
+        response = run_action(staff_client, "set_status", tasks, status="active")
+        mocker.patch("tasker_app.bulk.apply", side_effect=ValueError("Ошибка"))
+        failed = run_action(staff_client, "set_status", tasks, status="closed")
+
+        assert "Изменено задач: 3" in response.content.decode()
+        assert "Массовая операция не выполнена: Ошибка" in failed.content.decode()
+        assert Task.objects.filter(status="active").count() == 3
+
+    def test_unknown_job(self, staff_client):
+        """Неизвестное задание отдаёт состояние PENDING"""
+        url = reverse("admin:tasker_app_task_bulk_job", args=["missing"])
+
+        assert staff_client.get(url).json() == {
+            "state": "PENDING",
+            "done": 0,
+            "total": None,
+        }
@@ -0,0 +1,300 @@
+import json
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk, counters, search
+from tasker_app.models import Task, TaskEvent
+
+
+TASKS_URL = reverse("api_tasks")
+
+
+@pytest.mark.django_db
+class TestTaskListView:
+    """Список задач JSON API"""
+
+    def test_default_fields(self, client, make_tasks, board_tags, board_user):
+        """Поля по умолчанию: без описания, исполнитель и теги - id"""
+        first, second = make_tasks(2)
+
+        response = client.get(TASKS_URL)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "results": [
+                {
+                    "id": pk,
+                    "title": title,
+                    "task_type": "task",
+                    "status": "new",
+                    "end_date": date.today().isoformat(),
+                    "user": board_user.pk,
+                    "tags": tags,
+                }
+                for pk, title, tags in [
+                    (first.pk, "Задача номер 0", []),
+                    (second.pk, "Задача номер 1", [board_tags[0].pk]),
+                ]
+            ],
+            "next": None,
+        }
+
+    def test_sparse_fields(self, client, make_tasks, django_assert_num_queries):
+        """Выбираются только запрошенные поля и ключ сортировки, один запрос"""
+        make_tasks(3)
+
+        with django_assert_num_queries(1) as ctx:
+            response = client.get(TASKS_URL, {"fields": "title, user_full_name,title"})
+
+        sql = ctx.captured_queries[0]["sql"]
+        assert '"body"' not in sql and '"status"' not in sql
+        assert response.json()["results"][0] == {
+            "title": "Задача номер 0",
+            "user_full_name": "Board User",
+        }
+
+    def test_cursor_pages(self, client, make_tasks, django_assert_max_num_queries):
+        """Страницы по курсору с тегами: два запроса на страницу"""
+        today = date.today()
+        make_tasks(3, end_date=today + timedelta(days=1))
+        make_tasks(2)
+        seen = []
+        cursor = ""
+
+        while True:
+            with django_assert_max_num_queries(2):
+                data = client.get(
+                    TASKS_URL, {"limit": 2, "cursor": cursor, "fields": "id,end_date,tags"}
+                ).json()
+            seen += data["results"]
+            cursor = data["next"]
+            if not cursor:
+                break
+
+        assert [row["id"] for row in seen] == list(
+            Task.objects.order_by("end_date", "id").values_list("pk", flat=True)
+        )
+
+    def test_filters(self, client, make_tasks, board_tags):
+        """Фильтры по статусу, тегу и периоду"""
+        tasks = make_tasks(4, status=Task.TaskStatus.ACTIVE)
+        make_tasks(2)
+        make_tasks(1, status=Task.TaskStatus.ACTIVE, end_date=date(2000, 1, 1))
+
+        response = client.get(
+            TASKS_URL,
+            {
+                "status": "active",
+                "tag": board_tags[1].pk,
+                "date_from": date.today().isoformat(),
+                "fields": "id",
+            },
+        )
+
+        assert response.json()["results"] == [{"id": tasks[2].pk}, {"id": tasks[3].pk}]
+
+    @pytest.mark.parametrize(
+        "params, error",
+        [
+            ({"fields": "id,password"}, "fields"),
+            ({"status": "lost"}, "status"),
+            ({"cursor": "broken"}, "cursor"),
+        ],
+    )
+    def test_invalid(self, client, db, params, error):
+        """Неизвестные поля, фильтры и курсор - 400"""
+        response = client.get(TASKS_URL, params)
+
+        assert response.status_code == 400
+        assert list(response.json()["errors"]) == [error]
+
+    def test_limit(self, client, make_tasks):
+        """Размер страницы ограничен, некорректный - по умолчанию"""
+        make_tasks(3)
+
+        assert len(client.get(TASKS_URL, {"limit": "x"}).json()["results"]) == 3
+        assert len(client.get(TASKS_URL, {"limit": 0}).json()["results"]) == 1
+
+
+@pytest.mark.django_db
+class TestTagAndUserLists:
+    """Списки тегов и исполнителей"""
+
+    def test_tags(self, client, board_tags, django_assert_num_queries):
+        """Теги по id"""
+        with django_assert_num_queries(1):
+            response = client.get(reverse("api_tags"), {"fields": "name"})
+
+        assert response.json() == {
+            "results": [{"name": tag.name} for tag in board_tags],
+            "next": None,
+        }
+
+    def test_users(self, client, board_user):
+        """Исполнители без почты"""
+        response = client.get(reverse("api_users"))
+
+        assert response.json()["results"] == [
+            {"id": board_user.pk, "full_name": board_user.full_name}
+        ]
+        assert client.get(reverse("api_users"), {"fields": "email"}).status_code == 400
+
+
+def post_batch(client, tasks):
+    """POST пакета задач"""
+    return client.post(
+        reverse("api_tasks_batch"), json.dumps({"tasks": tasks}), content_type="application/json"
+    )
+
+
+@pytest.mark.django_db
+class TestTaskBatchView:
+    """Пакетная запись задач"""
+
+    def new_task(self, assignee, tags=(), **fields) -> dict:
+        """Данные новой задачи пакета"""
+        data = {
+            "title": "Задача из интеграции",
+            "end_date": date.today().isoformat(),
+            "user": assignee.pk,
+            "tags": [tag.pk for tag in tags],
+        }
+        data.update(fields)
+        return data
+
+    def test_create(
+        self, client, board_user, board_tags, settings, django_capture_on_commit_callbacks
+    ):
+        """Задачи, связи с тегами, счётчики и события создания"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        with django_capture_on_commit_callbacks(execute=True):
+            response = post_batch(
+                client,
+                [
+                    self.new_task(board_user, board_tags[:2], task_type="bug"),
+                    self.new_task(board_user, status="active", body="Описание"),
+                ],
+            )
+
+        results = response.json()["results"]
+        assert [result["result"] for result in results] == ["created", "created"]
+        first, second = (Task.objects.get(pk=result["id"]) for result in results)
+        assert first.get_tags_list() == ["Бэкенд", "Фронтенд"]
+        assert (first.task_type, first.status) == ("bug", "new")
+        assert (second.status, second.body) == ("active", "Описание")
+        assert counters.count_by_status() == {"new": 1, "active": 1, "closed": 0}
+        assert TaskEvent.objects.filter(kind="created").count() == 2
+
+    def test_update(self, client, make_tasks, board_tags, board_user):
+        """Меняются только переданные поля и изменённые теги"""
+        first, second = make_tasks(2)
+        link = Task.tags.through.objects.get(task=second)
+        listed = client.get(TASKS_URL, {"fields": "version"}).json()["results"]
+        assert listed[0]["version"] == first.version
+
+        response = post_batch(
+            client,
+            [
+                {"id": first.pk, "status": "closed", "version": listed[0]["version"]},
+                {
+                    "id": second.pk,
+                    "title": "Новое название",
+                    "tags": [board_tags[0].pk, board_tags[2].pk],
+                },
+            ],
+        )
+
+        assert response.json()["results"] == [
+            {"result": "updated", "id": first.pk},
+            {"result": "updated", "id": second.pk},
+        ]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.status, first.title) == ("closed", "Задача номер 0")
+        assert (second.status, second.title) == ("new", "Новое название")
+        assert sorted(second.tags.values_list("pk", flat=True)) == [
+            board_tags[0].pk,
+            board_tags[2].pk,
+        ]
+        assert Task.tags.through.objects.filter(pk=link.pk).exists()
+        assert counters.count_by_status() == {"new": 1, "active": 0, "closed": 1}
+        assert search.search("Новое").object_list[0].pk == second.pk
+
+    def test_errors(self, client, make_tasks, board_user):
+        """Ошибки каждой задачи отдельно, корректные записываются"""
+        task = make_tasks(1)[0]
+        stale = task.version
+        bulk.set_fields([task.pk], status="active")
+
+        results = post_batch(
+            client,
+            [
+                self.new_task(board_user, title="Одно"),
+                dict(self.new_task(board_user, user=board_user.pk + 100), tags=[999999]),
+                {"title": "Без срока и исполнителя"},
+                {"id": task.pk, "status": "closed", "version": stale},
+                {"id": task.pk + 100, "title": "Нет такой задачи"},
+                {"id": task.pk, "end_date": None},
+                "задача",
+                self.new_task(board_user),
+            ],
+        ).json()["results"]
+
+        assert [result["result"] for result in results] == [
+            "invalid",
+            "invalid",
+            "invalid",
+            "conflict",
+            "missing",
+            "invalid",
+            "invalid",
+            "created",
+        ]
+        assert list(results[1]["errors"]) == ["user", "tags"]
+        assert list(results[2]["errors"]) == ["end_date", "user"]
+        assert list(results[5]["errors"]) == ["end_date"]
+        assert Task.objects.get(pk=task.pk).status == "active"
+        assert Task.objects.count() == 2
+
+    def test_duplicate_id(self, client, make_tasks):
+        """Задача меняется в пакете один раз"""
+        task = make_tasks(1)[0]
+
+        results = post_batch(
+            client, [{"id": task.pk, "status": "active"}, {"id": task.pk, "status": "closed"}]
+        ).json()["results"]
+
+        assert [result["result"] for result in results] == ["updated", "invalid"]
+        assert Task.objects.get().status == "active"
+
+    def test_constant_queries(self, client, make_tasks, board_user, board_tags):
+        """Число запросов не зависит от размера пакета"""
+        tasks = make_tasks(30)
+
+        def count(size: int) -> int:
+            batch = [self.new_task(board_user, board_tags[:1]) for _ in range(size)]
+            batch += [
+                {"id": task.pk, "status": "active", "tags": [board_tags[2].pk]}
+                for task in tasks[:size]
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                assert post_batch(client, batch).status_code == 200
+            return len(ctx.captured_queries)
+
+        assert count(2) == count(30)
+
+    @pytest.mark.parametrize(
+        "body",
+        ["not json", json.dumps({"tasks": {}}), json.dumps({"tasks": [{}] * 501})],
+    )
+    def test_invalid_body(self, client, db, body):
+        """Некорректный пакет - 400"""
+        response = client.post(
+            reverse("api_tasks_batch"), body, content_type="application/json"
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,169 @@
+# pylint: disable=redefined-outer-name
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from tasker_app import archive, counters, search
+from tasker_app.models import ArchivedTask, Task, TaskEvent
+from tasker_app.tasks import archive_closed_tasks
+
+
+CLOSED = Task.TaskStatus.CLOSED
+
+
+def make_old(tasks: list[Task], days: int = 100) -> None:
+    """Отодвинуть последнее изменение задач на days дней назад"""
+    Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+        updated_at=timezone.now() - timedelta(days=days)
+    )
+
+
+@pytest.fixture
+def old_closed(make_tasks):
+    """Три закрытые задачи, не менявшиеся 100 дней"""
+    tasks = make_tasks(3, status=CLOSED)
+    make_old(tasks)
+    return tasks
+
+
+@pytest.mark.django_db
+class TestArchiveClosed:
+    """Перенос старых закрытых задач в архив"""
+
+    def test_moved_with_tags(self, old_closed, make_tasks, settings):
+        """Переносятся только старые закрытые задачи, вместе с тегами"""
+        settings.TASK_ARCHIVE_AFTER_DAYS = 90
+        recent = make_tasks(1, status=CLOSED)
+        active = make_tasks(1, status=Task.TaskStatus.ACTIVE)
+        make_old(active)
+
+        assert archive.archive_closed() == 3
+
+        assert set(Task.objects.values_list("pk", flat=True)) == {
+            recent[0].pk,
+            active[0].pk,
+        }
+        archived = ArchivedTask.objects.get(pk=old_closed[2].pk)
+        assert archived.get_tags_list() == ["Бэкенд", "Фронтенд"]
+        assert (archived.title, archived.body) == ("Задача номер 2", "Описание 2")
+        assert archived.created_at == old_closed[2].created_at
+        assert archived.rank == old_closed[2].rank
+        assert not Task.tags.through.objects.filter(
+            task_id__in=[task.pk for task in old_closed]
+        ).exists()
+
+    def test_counters_search_events(
+        self, old_closed, settings, django_capture_on_commit_callbacks
+    ):
+        """Задачи выходят из счётчиков и поиска, канбан получает удаление"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        TaskEvent.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            archive.archive_closed(days=30)
+
+        assert counters.count_by_status()[CLOSED] == 0
+        assert counters.rebuild()[1] == 0
+        assert not search.search("Задача").object_list
+        assert set(TaskEvent.objects.values_list("kind", flat=True)) == {"deleted"}
+
+    def test_chunks(self, old_closed, settings):
+        """Части по TASK_ARCHIVE_CHUNK_SIZE за постоянное число запросов"""
+        settings.TASK_ARCHIVE_CHUNK_SIZE = 2
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert archive.archive_closed() == 3
+
+        assert ArchivedTask.objects.count() == 3
+        inserts = [
+            query
+            for query in ctx.captured_queries
+            if query["sql"].startswith('INSERT INTO "tasker_app_archivedtask" ')
+        ]
+        assert len(inserts) == 2
+
+    def test_celery_task(self, old_closed):
+        """Периодическая задача celery"""
+        assert archive_closed_tasks.apply().get() == 3
+        assert not archive.archive_closed()
+
+
+@pytest.mark.django_db
+class TestRestore:
+    """Возврат задач из архива"""
+
+    def test_restore(self, old_closed, settings, django_capture_on_commit_callbacks):
+        """Прежние id, поля и теги; новая отметка изменения"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        archive.archive_closed()
+        task = old_closed[2]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            restored = archive.restore([task.pk, task.pk, 0])
+
+        assert restored == [task.pk]
+        restored_task = Task.objects.get(pk=task.pk)
+        assert restored_task.get_tags_list() == ["Бэкенд", "Фронтенд"]
+        assert restored_task.created_at == task.created_at
+        assert restored_task.updated_at > timezone.now() - timedelta(minutes=1)
+        assert (restored_task.status, restored_task.rank) == (CLOSED, task.rank)
+        assert not ArchivedTask.objects.filter(pk=task.pk).exists()
+        assert ArchivedTask.objects.count() == 2
+        assert counters.count_by_status()[CLOSED] == 1
+        assert search.search("Фронтенд").object_list[0].pk == task.pk
+        assert TaskEvent.objects.filter(task_id=task.pk, kind="created").exists()
+        # Восстановленная задача не уходит в архив при следующем переносе
+        assert not archive.archive_closed()
+
+    def test_command(self, old_closed):
+        """Команда restore_tasks: по id и все сразу"""
+        archive.archive_closed()
+        out = StringIO()
+
+        call_command("restore_tasks", str(old_closed[0].pk), "0", stdout=out)
+        call_command("restore_tasks", "--all", stdout=out)
+
+        assert out.getvalue().splitlines() == [
+            "Restored 1 tasks",
+            "Not in archive: 0",
+            "Restored 2 tasks",
+        ]
+        assert not ArchivedTask.objects.exists()
+        assert Task.objects.count() == 3
+        with pytest.raises(CommandError):
+            call_command("restore_tasks")
+
+
+@pytest.mark.django_db
+class TestArchivedTaskDetail:
+    """Карточка задачи из архива"""
+
+    def test_detail(self, client, old_closed):
+        """Карточка открывается по прежней ссылке, без изменения и удаления"""
+        archive.archive_closed()
+        url = reverse("task_detail", kwargs={"pk": old_closed[2].pk})
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.context["archived"]
+        content = response.content.decode()
+        assert "Теги: Бэкенд, Фронтенд" in content
+        assert "В архиве с" in content
+        assert reverse("task_edit", kwargs={"pk": old_closed[2].pk}) not in content
+        assert client.get(reverse("task_detail", kwargs={"pk": 0})).status_code == 404
+
+    def test_live_task(self, client, make_tasks):
+        """Обычная задача - с кнопкой изменения"""
+        task = make_tasks(1)[0]
+
+        response = client.get(reverse("task_detail", kwargs={"pk": task.pk}))
+
+        assert not response.context["archived"]
+        assert reverse("task_edit", kwargs={"pk": task.pk}) in response.content.decode()
@@ -0,0 +1,177 @@
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from tasker_app import archive, board_cache
+from tasker_app.async_views import (
+    AsyncConditionalGetMixin,
+    AsyncIndexTemplateView,
+    AsyncKanbanTemplateView,
+)
+from tasker_app.models import Task
+from tasker_app.views import AboutTemplateView
+from user_app.middleware import TimezoneMiddleware
+
+
+BOARD_VIEWS = ("index", "today", "kanban")
+
+
+def aget(async_client, url: str, **kwargs):
+    """GET через ASGI-обработчик с маршрутами config/asgi.py"""
+    with override_settings(ROOT_URLCONF="config.urls_asgi"):
+        return async_to_sync(async_client.get)(url, **kwargs)
+
+
+def board_data(response) -> list:
+    """Задачи страницы: (id, исполнитель, теги) по колонкам"""
+    context = response.context
+    pages = context["columns"].values() if "columns" in context else [context["page"]]
+    return [
+        [(task.pk, task.user_name.full_name, task.get_tags_list()) for task in page]
+        for page in pages
+    ]
+
+
+@pytest.mark.django_db
+class TestAsyncBoards:
+    """Асинхронные доски отдают то же, что синхронные"""
+
+    @pytest.mark.parametrize("view_name", BOARD_VIEWS)
+    def test_same_as_sync(self, client, async_client, make_tasks, view_name):
+        """Данные, ETag и число запросов совпадают с WSGI-версией"""
+        for status in Task.TaskStatus.values:
+            make_tasks(3, status=status)
+        url = reverse(view_name)
+
+        with CaptureQueriesContext(connection) as async_queries:
+            response = aget(async_client, url)
+        # Другой ключ кеша досок при той же версии: синхронная доска не из кеша
+        with CaptureQueriesContext(connection) as sync_queries:
+            expected = client.get(url, {"from": "wsgi"})
+
+        assert response.status_code == 200
+        assert response.context["view"].view_is_async
+        assert not expected.context["view"].view_is_async
+        assert board_data(response) == board_data(expected)
+        assert response["ETag"] == expected["ETag"]
+        assert len(async_queries) == len(sync_queries)
+
+    def test_cursor_pages(self, async_client, make_tasks):
+        """Курсор следующей страницы и неверный курсор"""
+        make_tasks(5)
+        url = reverse("index")
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(AsyncIndexTemplateView, "paginate_by", 3)
+            first = aget(async_client, url)
+            cursor = first.context["page"].next_cursor
+            second = aget(async_client, url, data={"cursor": cursor})
+
+        assert len(first.context["tasks"]) == 3 and len(second.context["tasks"]) == 2
+        assert aget(async_client, url, data={"cursor": "x"}).status_code == 404
+        assert aget(async_client, reverse("kanban"), data={"new": "x"}).status_code == 404
+
+    def test_not_modified_and_cache(self, async_client, make_tasks):
+        """304 по ETag и данные доски из кеша досок"""
+        make_tasks(2)
+        url = reverse("kanban")
+        response = aget(async_client, url)
+
+        cached = aget(async_client, url, headers={"if-none-match": response["ETag"]})
+        aget(async_client, url)
+
+        assert cached.status_code == 304
+        assert board_cache.stats.summary()["kanban"] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_task_detail(self, async_client, make_tasks):
+        """Карточка задачи и 404 для несуществующей"""
+        task = make_tasks(3)[2]
+
+        response = aget(async_client, reverse("task_detail", kwargs={"pk": task.pk}))
+        missing = aget(async_client, reverse("task_detail", kwargs={"pk": task.pk + 1}))
+
+        assert response.context["task"] == task
+        assert "Теги: Бэкенд, Фронтенд" in response.content.decode()
+        assert missing.status_code == 404
+
+    def test_archived_task_detail(self, async_client, make_tasks):
+        """Карточка задачи из архива"""
+        task = make_tasks(3, status=Task.TaskStatus.CLOSED)[2]
+        archive.archive_closed(days=-1)
+
+        response = aget(async_client, reverse("task_detail", kwargs={"pk": task.pk}))
+
+        assert response.context["archived"]
+        assert "Теги: Бэкенд, Фронтенд" in response.content.decode()
+
+    def test_messages_skip_not_modified(self, async_client, make_tasks, mocker):
+        """Непоказанные сообщения не дают ответить 304"""
+        make_tasks(1)
+        url = reverse("index")
+        etag = aget(async_client, url)["ETag"]
+        mocker.patch("tasker_app.async_views._has_messages", return_value=True)
+
+        assert aget(async_client, url, headers={"if-none-match": etag}).status_code == 200
+
+    def test_default_context(self, rf: RequestFactory, make_tasks):
+        """Без aget_context_data контекст строит синхронный get_context_data"""
+        make_tasks(1)
+        view = type("AsyncAboutView", (AsyncConditionalGetMixin, AboutTemplateView), {})()
+        view.setup(rf.get("/"))
+
+        context = async_to_sync(view.aget_context_data)()
+
+        assert context["active_page"] == "about"
+        assert async_to_sync(view.aget_validation_state)()[0][1] == 1
+
+    def test_kanban_status_counts_without_validators(self, make_tasks):
+        """Без прочитанного состояния валидаторов числа берутся из счётчиков"""
+        make_tasks(2)
+
+        counts = async_to_sync(AsyncKanbanTemplateView().aget_status_counts)()
+
+        assert counts[Task.TaskStatus.NEW] == 2
+
+
+class TestTimezoneMiddleware:
+    """Часовой пояс в асинхронной цепочке middleware"""
+
+    def test_async(self, rf: RequestFactory):
+        """Пояс пользователя включается до асинхронного представления"""
+
+        async def get_response(request):
+            return HttpResponse(timezone.get_current_timezone_name())
+
+        async def auser():
+            return user
+
+        user = type("User", (), {"timezone": "Asia/Tokyo"})()
+        request = rf.get("/")
+        request.auser = auser
+        middleware = TimezoneMiddleware(get_response)
+
+        response = async_to_sync(middleware)(request)
+
+        assert response.content == b"Asia/Tokyo"
+        assert request.user is user
+
+    def test_async_without_auth(self, rf: RequestFactory):
+        """Без пользователя - пояс из cookie браузера"""
+
+        async def get_response(request):
+            return HttpResponse(timezone.get_current_timezone_name())
+
+        request = rf.get("/")
+        request.COOKIES["timezone"] = "Europe/Samara"
+
+        response = async_to_sync(TimezoneMiddleware(get_response))(request)
+
+        assert response.content == b"Europe/Samara"
@@ -0,0 +1,121 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app.forms import TaskModelForm
+from tasker_app.models import Tag
+from user_app.models import CustomUser
+
+
+def make_users(count: int) -> None:
+    """Создать count пользователей одним запросом"""
+    CustomUser.objects.bulk_create(
+        CustomUser(email=f"user{i}@example.com", username=f"user{i}", full_name=f"Иван {i}")
+        for i in range(count)
+    )
+
+
+def results(client, name: str, **params) -> list[dict]:
+    """Варианты эндпоинта автодополнения"""
+    response = client.get(reverse(name), params)
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+@pytest.mark.django_db
+class TestAutocompleteEndpoints:
+    """Тесты эндпоинтов автодополнения"""
+
+    def test_users(self, client, board_user):
+        """Поиск по началу имени без учёта регистра, без почты"""
+        make_users(3)
+
+        found = results(client, "autocomplete_users", q="Иван 1")
+        assert found == [
+            {"id": CustomUser.objects.get(full_name="Иван 1").pk, "text": "Иван 1"}
+        ]
+        assert results(client, "autocomplete_users", q="board") == [
+            {"id": board_user.pk, "text": "Board User"}
+        ]
+        assert not results(client, "autocomplete_users", q="User")
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql",
+        reason="LIKE в SQLite не учитывает регистр только для ASCII",
+    )
+    def test_cyrillic_case(self, client, board_tags):
+        """Регистр кириллицы тоже не учитывается"""
+        make_users(3)
+
+        users = results(client, "autocomplete_users", q="иван 1")
+        tags = results(client, "autocomplete_tags", q="б")
+
+        assert [user["text"] for user in users] == ["Иван 1"]
+        assert [tag["text"] for tag in tags] == ["Баг", "Бэкенд"]
+
+    def test_tags(self, client, board_tags):
+        """Теги по началу названия в алфавитном порядке"""
+        assert [tag["text"] for tag in results(client, "autocomplete_tags", q="Б")] == [
+            "Баг",
+            "Бэкенд",
+        ]
+
+    @pytest.mark.parametrize("limit, expected", [("2", 2), ("1000", 20), ("x", 20)])
+    def test_limit(self, client, limit, expected):
+        """Число вариантов ограничено сверху"""
+        make_users(25)
+
+        assert len(results(client, "autocomplete_users", q="Иван", limit=limit)) == expected
+
+    def test_empty_query(self, client, board_user, django_assert_num_queries):
+        """Пустой запрос не обращается к БД"""
+        with django_assert_num_queries(0):
+            assert not results(client, "autocomplete_users", q="  ")
+
+
+@pytest.mark.django_db
+class TestAutocompleteWidgets:
+    """Тесты формы задачи с виджетами автодополнения"""
+
+    def test_add_form_has_no_options(self, client, board_user, board_tags):
+        """Форма создания не выбирает пользователей и теги"""
+        make_users(50)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(reverse("add_task_form"))
+
+        content = response.content.decode()
+        assert "Иван" not in content and "Бэкенд" not in content
+        assert 'data-autocomplete-url="/autocomplete/users/"' in content
+        tables = " ".join(q["sql"] for q in ctx.captured_queries)
+        assert "user_app_customuser" not in tables and "tasker_app_tag" not in tables
+
+    def test_edit_form_shows_selected(self, client, make_tasks, board_tags):
+        """Форма изменения показывает только выбранные варианты"""
+        task = make_tasks(1)[0]
+        task.tags.add(board_tags[0])
+        make_users(5)
+
+        content = client.get(reverse("task_edit", kwargs={"pk": task.pk})).content.decode()
+
+        assert "Board User" in content and "Бэкенд" in content
+        assert "Иван" not in content and "Фронтенд" not in content
+
+    def test_unknown_ids_are_rejected(self, board_user):
+        """Проверка выбранных id по-прежнему идёт по БД"""
+        form = TaskModelForm(
+            {
+                "task_type": "bug",
+                "title": "Починить вход",
+                "body": "Описание",
+                "user_name": board_user.pk + 100,
+                "tags": [Tag.objects.count() + 100],
+                "end_date": "2030-01-01",
+            }
+        )
+
+        assert not form.is_valid()
+        assert set(form.errors) == {"user_name", "tags"}
+        # Несуществующие значения рендерятся без вариантов
+        assert "<option" not in str(form["tags"])
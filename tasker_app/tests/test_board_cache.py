@@ -0,0 +1,200 @@
+from datetime import date
+
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app import board_cache, bulk
+from tasker_app.checks import check_board_cache
+from tasker_app.models import Tag, Task
+
+
+BOARD_VIEWS = ("index", "today", "kanban")
+# Запросы валидаторов условного GET: счётчики и MAX(updated_at), у страницы
+# "Сегодня" - один агрегат по задачам дня
+VALIDATOR_QUERIES = {"index": 2, "today": 1, "kanban": 2}
+
+
+def get_board(client, url: str) -> tuple[str, int]:
+    """Содержимое доски и число SQL-запросов к задачам"""
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    task_queries = [q for q in ctx.captured_queries if "tasker_app_task" in q["sql"]]
+    return response.content.decode(), len(task_queries)
+
+
+@pytest.mark.django_db
+class TestBoardCache:
+    """Тесты кеша досок"""
+
+    @pytest.mark.parametrize("view_name", BOARD_VIEWS)
+    def test_second_request_is_cached(self, client, make_tasks, view_name):
+        """Повторный запрос доски не выбирает задачи"""
+        make_tasks(3)
+        url = reverse(view_name)
+
+        first, first_queries = get_board(client, url)
+        second, second_queries = get_board(client, url)
+
+        assert first_queries > 0
+        # Остаются только запросы валидаторов условного GET
+        assert second_queries == VALIDATOR_QUERIES[view_name]
+        assert first == second
+        assert board_cache.stats.summary()[view_name] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_params_are_part_of_key(self, client, make_tasks, settings):
+        """Разные страницы кешируются отдельно"""
+        settings.BOARD_CACHE_TIMEOUT = 60
+        make_tasks(3)
+        url = reverse("index")
+        get_board(client, url)
+
+        _, queries = get_board(client, f"{url}?cursor=")
+
+        assert queries > 0
+
+    def test_task_save_invalidates(self, client, make_tasks):
+        """Изменение задачи видно на доске сразу"""
+        task = make_tasks(1)[0]
+        get_board(client, reverse("index"))
+
+        task.title = "Новое название"
+        task.save()
+
+        content, queries = get_board(client, reverse("index"))
+        assert queries > 0
+        assert "Новое название" in content
+
+    def test_task_delete_invalidates(self, client, make_tasks):
+        """Удалённая задача пропадает с доски"""
+        task = make_tasks(1)[0]
+        get_board(client, reverse("index"))
+
+        task.delete()
+
+        content, _ = get_board(client, reverse("index"))
+        assert task.title not in content
+
+    def test_tag_and_relation_invalidate(self, client, make_tasks, board_tags):
+        """Переименование тега и смена тегов задачи сбрасывают кеш"""
+        task = make_tasks(1)[0]
+        get_board(client, reverse("index"))
+
+        task.tags.add(board_tags[0])
+        content, _ = get_board(client, reverse("index"))
+        assert "Теги: Бэкенд" in content
+
+        board_tags[0].name = "Бэк"
+        board_tags[0].save()
+        content, _ = get_board(client, reverse("index"))
+        assert "Теги: Бэк" in content and "Бэкенд" not in content
+
+    def test_user_login_keeps_cache(self, client, make_tasks, board_user):
+        """Имя исполнителя сбрасывает кеш, вход пользователя - нет"""
+        make_tasks(1)
+        version = board_cache.get_versions(board_cache.BOARD)
+
+        board_user.save(update_fields=["last_login"])
+        assert board_cache.get_versions(board_cache.BOARD) == version
+
+        board_user.full_name = "Renamed User"
+        board_user.save()
+        content, _ = get_board(client, reverse("index"))
+        assert "Renamed User" in content
+
+    def test_bulk_operations_invalidate(self, client, make_tasks, board_user):
+        """Массовые операции без сигналов тоже сбрасывают кеш"""
+        task = make_tasks(1)[0]
+        get_board(client, reverse("index"))
+
+        bulk.set_fields([task.pk], title="Массово")
+        content, _ = get_board(client, reverse("index"))
+        assert "Массово" in content
+
+        bulk.create_tasks(
+            [
+                Task(
+                    title="Импортированная",
+                    body="",
+                    end_date=date.today(),
+                    user_name=board_user,
+                )
+            ],
+            [[]],
+        )
+        content, _ = get_board(client, reverse("index"))
+        assert "Импортированная" in content
+
+    def test_version_bumped_after_commit(self, db, django_capture_on_commit_callbacks):
+        """Внутри транзакции версия увеличивается ещё раз после коммита"""
+        (before,) = board_cache.get_versions(board_cache.BOARD)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                Tag.objects.create(name="Новый")
+                (inside,) = board_cache.get_versions(board_cache.BOARD)
+
+        (after,) = board_cache.get_versions(board_cache.BOARD)
+        assert before < inside < after
+
+    def test_missing_version_key(self):
+        """Вытесненный счётчик версии создаётся заново"""
+        board_cache.bump_version()
+        (version,) = board_cache.get_versions(board_cache.BOARD)
+
+        board_cache.get_cache().delete("boards:version:board")
+        board_cache.bump_version()
+
+        (recreated,) = board_cache.get_versions(board_cache.BOARD)
+        assert recreated != version
+
+    def test_stats_view(self, staff_client, make_tasks):
+        """Метрики кеша доступны администратору, POST обнуляет их"""
+        make_tasks(1)
+        staff_client.get(reverse("index"))
+        staff_client.get(reverse("index"))
+
+        data = staff_client.get(reverse("board_cache_stats")).json()
+        assert data["boards"]["index"]["hit_ratio"] == 0.5
+        assert isinstance(data["version"], int)
+
+        data = staff_client.post(reverse("board_cache_stats")).json()
+        assert data["boards"] == {}
+
+    def test_stats_view_requires_staff(self, db):
+        """Анонимный пользователь перенаправляется на вход"""
+        response = Client().get(reverse("board_cache_stats"))
+
+        assert response.status_code == 302
+
+
+class TestBoardCacheCheck:
+    """Проверка настроек кеша досок"""
+
+    LOCMEM = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    REDIS = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+    }
+
+    def test_locmem_with_broker(self, settings):
+        """Кеш в памяти процесса при воркерах celery - предупреждение"""
+        settings.CACHES = {"default": self.LOCMEM}
+        settings.CELERY_BROKER_URL = "redis://localhost:6379/0"
+
+        assert [message.id for message in check_board_cache(None)] == ["tasker_app.W001"]
+
+    @pytest.mark.parametrize("cache, broker", [(LOCMEM, ""), (REDIS, "redis://")])
+    def test_ok(self, settings, cache, broker):
+        """Без брокера или с общим кешем предупреждения нет"""
+        settings.CACHES = {"default": cache}
+        settings.CELERY_BROKER_URL = broker
+
+        assert not check_board_cache(None)
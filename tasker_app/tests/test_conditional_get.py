@@ -0,0 +1,202 @@
+from datetime import timedelta
+
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from tasker_app import bulk
+from tasker_app.models import Task
+from tasker_app.views import ConditionalGetMixin
+
+
+BOARD_VIEWS = ("index", "today", "kanban")
+VALIDATOR_QUERIES = {"index": 2, "today": 1, "kanban": 2}
+
+
+def updated_at(task: Task):
+    """Отметка изменения задачи из БД"""
+    return Task.objects.values_list("updated_at", flat=True).get(pk=task.pk)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Тесты ответов 304 Not Modified"""
+
+    @pytest.mark.parametrize("view_name", BOARD_VIEWS)
+    def test_not_modified(self, client, make_tasks, django_assert_num_queries, view_name):
+        """Неизменившаяся доска отдаётся кодом 304 без выборки задач"""
+        make_tasks(3)
+        url = reverse(view_name)
+        response = client.get(url)
+        assert response["Cache-Control"] == "private, no-cache"
+        assert response["ETag"].startswith('W/"')
+
+        with django_assert_num_queries(VALIDATOR_QUERIES[view_name]) as ctx:
+            cached = client.get(url, headers={"if-none-match": response["ETag"]})
+
+        # Только агрегаты: счётчики и MAX(updated_at) по индексу
+        assert all(
+            "tasker_app_taskcounter" in query["sql"] or "MAX(" in query["sql"]
+            for query in ctx.captured_queries
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+    def test_change_from_other_process(self, client, make_tasks):
+        """Изменение задачи без увеличения версий кеша досок (другой процесс
+        с кешем locmem) меняет ETag и не отдаёт устаревшую доску"""
+        task = make_tasks(2)[0]
+        etag = client.get(reverse("index"))["ETag"]
+
+        Task.objects.filter(pk=task.pk).update(
+            title="Изменена воркером", updated_at=timezone.now()
+        )
+        response = client.get(reverse("index"), headers={"if-none-match": etag})
+
+        assert response.status_code == 200
+        assert "Изменена воркером" in response.content.decode()
+
+    def test_if_modified_since(self, client, make_tasks):
+        """Last-Modified - последнее изменение задач"""
+        make_tasks(2)
+        response = client.get(reverse("index"))
+
+        cached = client.get(
+            reverse("index"),
+            headers={"if-modified-since": response["Last-Modified"]},
+        )
+
+        assert cached.status_code == 304
+
+    def test_empty_board(self, client, db):
+        """Пустая доска тоже отвечает 304 по ETag и Last-Modified"""
+        response = client.get(reverse("index"))
+
+        cached = client.get(reverse("index"), headers={"if-none-match": response["ETag"]})
+        assert cached.status_code == 304
+        cached = client.get(
+            reverse("index"),
+            headers={"if-modified-since": response["Last-Modified"]},
+        )
+        assert cached.status_code == 304
+
+    def test_changes_update_etag(self, client, make_tasks, board_tags):
+        """Изменение задачи, её удаление или переименование тега меняют ETag"""
+        tasks = make_tasks(2)
+        etags = [client.get(reverse("index"))["ETag"]]
+
+        tasks[0].title = "Новое название"
+        tasks[0].save()
+        etags.append(client.get(reverse("index"))["ETag"])
+
+        tasks[1].delete()
+        etags.append(client.get(reverse("index"))["ETag"])
+
+        board_tags[0].name = "Бэк"
+        board_tags[0].save()
+        etags.append(client.get(reverse("index"))["ETag"])
+
+        assert len(set(etags)) == len(etags)
+        response = client.get(reverse("index"), headers={"if-none-match": etags[0]})
+        assert response.status_code == 200
+
+    def test_etag_depends_on_user(self, client, staff_client, make_tasks):
+        """Шапка страницы зависит от пользователя - ETag тоже"""
+        make_tasks(1)
+        staff_etag = staff_client.get(reverse("index"))["ETag"]
+
+        response = Client().get(reverse("index"), headers={"if-none-match": staff_etag})
+
+        assert response.status_code == 200
+
+    def test_pending_messages_are_rendered(self, client, make_tasks, monkeypatch):
+        """Непоказанные сообщения не теряются за ответом 304"""
+        task = make_tasks(1)[0]
+        url = reverse("task_detail", kwargs={"pk": task.pk})
+        etag = client.get(url)["ETag"]
+        monkeypatch.setattr(
+            "tasker_app.views.messages.get_messages", lambda request: ["Сообщение"]
+        )
+
+        response = client.get(url, headers={"if-none-match": etag})
+
+        assert response.status_code == 200
+
+    def test_detail(self, client, make_tasks):
+        """Детальная страница: 304 для неизменной задачи, 404 для удалённой"""
+        task = make_tasks(1)[0]
+        url = reverse("task_detail", kwargs={"pk": task.pk})
+        etag = client.get(url)["ETag"]
+
+        assert client.get(url, headers={"if-none-match": etag}).status_code == 304
+
+        task.delete()
+        assert client.get(url, headers={"if-none-match": etag}).status_code == 404
+
+    def test_default_validation_queryset(self, make_tasks):
+        """По умолчанию страница зависит от всех объектов model"""
+        make_tasks(2)
+
+        assert ConditionalGetMixin().get_validation_queryset().count() == 2
+
+
+@pytest.mark.django_db
+class TestUpdatedAt:
+    """Тесты отметки изменения задачи на всех путях записи"""
+
+    @pytest.fixture
+    def task(self, make_tasks):
+        """Задача с отметкой изменения в прошлом"""
+        task = make_tasks(1)[0]
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+        return task
+
+    def test_save(self, task):
+        """save() обновляет отметку"""
+        before = updated_at(task)
+        task.title = "Новое"
+        task.save()
+
+        assert updated_at(task) > before
+
+    def test_bulk_set_fields(self, task):
+        """Массовое изменение полей обновляет отметку"""
+        before = updated_at(task)
+        bulk.set_fields([task.pk], status=Task.TaskStatus.CLOSED)
+
+        assert updated_at(task) > before
+
+    @pytest.mark.parametrize("operation", ["add_tag", "remove_tag"])
+    def test_bulk_tags(self, task, board_tags, operation):
+        """Массовые изменения тегов обновляют отметку"""
+        if operation == "remove_tag":
+            Task.tags.through.objects.create(task=task, tag=board_tags[0])
+        before = updated_at(task)
+        getattr(bulk, operation)([task.pk], board_tags[0].pk)
+
+        assert updated_at(task) > before
+
+    def test_task_tags(self, task, board_tags):
+        """Изменение тегов задачи обновляет отметку"""
+        before = updated_at(task)
+        task.tags.add(board_tags[0])
+
+        assert updated_at(task) > before
+
+    @pytest.mark.parametrize("action", ["add", "remove", "clear"])
+    def test_tag_tasks(self, task, board_tags, action):
+        """Изменение задач тега (обратная сторона связи) обновляет отметку"""
+        tag = board_tags[0]
+        if action != "add":
+            Task.tags.through.objects.create(task=task, tag=tag)
+        before = updated_at(task)
+
+        if action == "clear":
+            tag.tasks.clear()
+        else:
+            getattr(tag.tasks, action)(task)
+
+        assert updated_at(task) > before
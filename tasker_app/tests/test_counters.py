@@ -0,0 +1,193 @@
+# pylint: disable=redefined-outer-name
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk, counters, search
+from tasker_app.models import Task, TaskCounter
+from user_app.models import CustomUser
+
+
+ACTIVE, CLOSED, NEW = Task.TaskStatus.ACTIVE, Task.TaskStatus.CLOSED, Task.TaskStatus.NEW
+
+
+def stored() -> dict[tuple, int]:
+    """Ненулевые счётчики из таблицы"""
+    return {
+        (user_id, status, task_type): count
+        for user_id, status, task_type, count in TaskCounter.objects.filter(
+            count__gt=0
+        ).values_list("user_id", "status", "task_type", "count")
+    }
+
+
+@pytest.fixture
+def other_user(db):
+    """Второй исполнитель"""
+    return CustomUser.objects.create_user(
+        email="other@example.com", password="testpass123", full_name="Another User"
+    )  # type: ignore
+
+
+@pytest.mark.django_db
+class TestCounterUpdates:
+    """Счётчики совпадают с COUNT(*) после любых путей записи"""
+
+    def test_save_and_delete(self, make_tasks, other_user):
+        """Создание, смена статуса, типа и исполнителя, удаление"""
+        first, second = make_tasks(2)
+        assert stored() == counters.expected()
+
+        first.status = ACTIVE
+        first.task_type = Task.TaskType.BUG
+        first.save()
+        second.user_name = other_user
+        second.save()
+        assert stored() == counters.expected()
+
+        first.delete()
+        assert stored() == counters.expected()
+
+    def test_update_fields(self, make_tasks):
+        """Поля вне update_fields не попадают в счётчик"""
+        task = make_tasks(1)[0]
+        task.status = CLOSED
+        task.task_type = Task.TaskType.EPIC
+        task.save(update_fields=["status"])
+
+        assert stored() == counters.expected()
+
+    def test_instance_not_from_db(self, make_tasks):
+        """Прежний ключ задачи, созданной в памяти, читается из БД"""
+        task = make_tasks(1)[0]
+        copy = Task.objects.only("pk", "title").get(pk=task.pk)
+        copy.status = CLOSED
+        copy.save()
+
+        assert stored() == counters.expected()
+
+    def test_unchanged_key_writes_nothing(self, make_tasks, django_assert_num_queries):
+        """Сохранение без смены ключа не трогает счётчики"""
+        task = make_tasks(1)[0]
+        task.title = "Новое название"
+
+        # UPDATE задачи и пересчёт поискового документа запросами
+        # поискового бэкенда БД
+        search_queries = len(search.get_backend().update_sql([task.pk]))
+        with django_assert_num_queries(1 + search_queries):
+            task.save()
+
+    def test_bulk(self, make_tasks, board_user, other_user):
+        """Массовые операции и импорт"""
+        tasks = make_tasks(3)
+        ids = [task.pk for task in tasks]
+
+        bulk.set_fields(ids[:2], status=CLOSED)
+        bulk.set_fields(ids[1:], user_name_id=other_user.pk, task_type="bug")
+        bulk.set_fields(ids, user_name=board_user)
+        bulk.create_tasks(
+            [
+                Task(title="Импорт", body="", end_date=date.today(), user_name=other_user),
+                Task(title="Импорт", body="", end_date=date.today(), user_name=other_user),
+            ],
+            [[], []],
+        )
+
+        assert stored() == counters.expected()
+        assert stored()[(other_user.pk, NEW, Task.TaskType.TASK)] == 2
+
+    def test_user_delete(self, make_tasks, other_user):
+        """Удаление исполнителя удаляет его задачи и счётчики"""
+        make_tasks(2, user_name=other_user)
+        make_tasks(1)
+
+        other_user.delete()
+
+        assert stored() == counters.expected()
+        assert not TaskCounter.objects.filter(user_id=other_user.pk).exists()
+
+    def test_rolled_back_with_task(self, make_tasks, mocker):
+        """Счётчики пишутся в транзакции задачи"""
+        task = make_tasks(1)[0]
+        before = stored()
+        mocker.patch("tasker_app.search.update_documents", side_effect=ValueError)
+        task.status = CLOSED
+
+        # Точка сохранения вместо транзакции, которую откатил бы save()
+        with pytest.raises(ValueError), transaction.atomic():
+            task.save()
+
+        assert stored() == before
+        assert Task.objects.get(pk=task.pk).status == NEW
+
+
+@pytest.mark.django_db
+class TestCounterReads:
+    """Чтение счётчиков: канбан, загрузка, админка, пересборка"""
+
+    def test_rebuild_command(self, make_tasks):
+        """Команда исправляет разошедшиеся счётчики"""
+        make_tasks(3)
+        TaskCounter.objects.update(count=100)
+        out = StringIO()
+
+        call_command("rebuild_task_counters", stdout=out)
+
+        assert out.getvalue().strip() == "Rebuilt 1 counters, 1 were out of sync"
+        assert stored() == counters.expected()
+
+    def test_kanban_totals(self, client, make_tasks):
+        """Заголовки колонок канбана берутся из счётчиков"""
+        make_tasks(2)
+        make_tasks(1, status=CLOSED)
+
+        columns = client.get(reverse("kanban")).context["columns"]
+
+        assert {status: page.total for status, page in columns.items()} == {
+            ACTIVE: 0,
+            CLOSED: 1,
+            NEW: 2,
+        }
+
+    def test_workload(self, client, make_tasks, other_user, django_assert_num_queries):
+        """Страница загрузки одним запросом к счётчикам"""
+        make_tasks(1, status=CLOSED)
+        make_tasks(2, user_name=other_user, status=ACTIVE)
+        make_tasks(1, user_name=other_user)
+
+        with django_assert_num_queries(1):
+            response = client.get(reverse("workload"))
+
+        rows = response.context["rows"]
+        assert [row["full_name"] for row in rows] == ["Another User", "Board User"]
+        assert rows[0]["counts"] == [2, 0, 1] and rows[0]["total"] == 3
+        assert "Загрузка исполнителей" in response.content.decode()
+
+    def test_workload_blank_status(self, client, make_tasks):
+        """Задача без статуса не роняет страницу и считается открытой"""
+        make_tasks(1)
+        make_tasks(1, status="")
+
+        response = client.get(reverse("workload"))
+
+        assert response.status_code == 200
+        (row,) = response.context["rows"]
+        assert row["counts"] == [int(status == NEW) for status in Task.TaskStatus.values]
+        assert (row["open"], row["total"]) == (2, 2)
+
+    def test_admin_filter(self, staff_client, make_tasks, other_user):
+        """Фильтр по исполнителю в админке показывает число задач"""
+        make_tasks(2)
+        make_tasks(1, user_name=other_user)
+        url = reverse("admin:tasker_app_task_changelist")
+
+        content = staff_client.get(url).content.decode()
+        filtered = staff_client.get(url, {"user_name": other_user.pk})
+
+        assert "Another User (1)" in content and "Board User (2)" in content
+        assert filtered.context["cl"].result_count == 1
+        assert staff_client.get(url, {"user_name": "x"}).context["cl"].result_count == 3
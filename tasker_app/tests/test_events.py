@@ -0,0 +1,103 @@
+import threading
+import pytest
+
+from tasker_app import events
+from tasker_app.events import TaskEventBuffer
+from tasker_app.models import Task, TaskEvent
+
+
+class TestTaskEventBuffer:
+    """Тесты буфера событий"""
+
+    def test_flush_by_size(self, mocker):
+        """Пачка уходит, когда набирается batch_size событий"""
+        send = mocker.Mock()
+        buffer = TaskEventBuffer(batch_size=3, flush_interval=0, send=send)
+
+        buffer.add([{"n": 1}, {"n": 2}])
+        send.assert_not_called()
+        buffer.add([{"n": 3}])
+
+        send.assert_called_once_with([{"n": 1}, {"n": 2}, {"n": 3}])
+        assert len(buffer) == 0
+
+    def test_flush_by_time(self):
+        """Неполная пачка уходит по таймеру"""
+        sent = threading.Event()
+        batches = []
+
+        def send(batch):
+            batches.append(batch)
+            sent.set()
+
+        buffer = TaskEventBuffer(batch_size=100, flush_interval=0.05, send=send)
+        buffer.add([{"n": 1}])
+
+        assert sent.wait(5)
+        assert batches == [[{"n": 1}]]
+
+    def test_manual_flush(self, mocker):
+        """flush отправляет накопленное и ничего не шлёт для пустого буфера"""
+        send = mocker.Mock()
+        buffer = TaskEventBuffer(batch_size=100, flush_interval=0, send=send)
+
+        buffer.flush()
+        buffer.add([{"n": 1}])
+        buffer.flush()
+
+        send.assert_called_once_with([{"n": 1}])
+
+
+@pytest.mark.django_db
+class TestTaskSignals:
+    """События создания, изменения, смены статуса и удаления задач"""
+
+    def test_lifecycle_events_in_one_batch(
+        self, make_tasks, settings, django_capture_on_commit_callbacks
+    ):
+        """События пишутся воркером одной пачкой после коммита"""
+        settings.TASK_EVENTS_BATCH_SIZE = 4
+        with django_capture_on_commit_callbacks(execute=True):
+            task = make_tasks(1)[0]
+            task = Task.objects.get(pk=task.pk)
+            task.title = "Новое название"
+            task.save()
+            task.status = Task.TaskStatus.ACTIVE
+            task.save()
+            task_id = task.pk
+            task.delete()
+
+        kinds = list(
+            TaskEvent.objects.filter(task_id=task_id)
+            .order_by("id")
+            .values_list("kind", flat=True)
+        )
+        assert kinds == ["created", "updated", "status_changed", "deleted"]
+        status_event = TaskEvent.objects.get(kind="status_changed")
+        assert str(status_event) == f"status_changed #{task_id}"
+        assert status_event.payload == {
+            "title": "Новое название",
+            "status": "active",
+            "previous_status": "new",
+        }
+
+    def test_rolled_back_writes_are_not_recorded(
+        self, make_tasks, django_capture_on_commit_callbacks
+    ):
+        """Без коммита события в буфер не попадают"""
+        with django_capture_on_commit_callbacks() as callbacks:
+            make_tasks(2)
+
+        # События двух задач и одно увеличение версий кеша досок
+        assert len(callbacks) == 3
+        assert len(events.get_buffer()) == 0
+
+    def test_module_flush(self, make_tasks, django_capture_on_commit_callbacks):
+        """events.flush отправляет остаток буфера процесса"""
+        with django_capture_on_commit_callbacks(execute=True):
+            make_tasks(2)
+        assert not TaskEvent.objects.exists()
+
+        events.flush()
+
+        assert TaskEvent.objects.count() == 2
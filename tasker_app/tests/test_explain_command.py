@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+import pytest
+
+from tasker_app.models import Task
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(db):
+    """Индексы задач без раздувания от предыдущих тестов
+
+    Откаченные транзакции других тестов оставляют в индексах мёртвые
+    страницы, и на крошечной таблице выбор планировщика между равными по
+    стоимости индексами зависит от порядка тестов. REINDEX откатывается
+    вместе с транзакцией теста.
+    """
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"REINDEX TABLE {Task._meta.db_table}")  # pylint: disable=protected-access
+
+
+@pytest.mark.django_db
+class TestExplainBoardQueries:
+    """Тесты команды explain_board_queries"""
+
+    def test_board_queries_use_indexes(self, make_tasks):
+        """Все запросы досок используют свои индексы"""
+        # Разные сроки и статусы, чтобы статистика после ANALYZE
+        # была похожа на настоящую таблицу
+        for day in range(30):
+            make_tasks(
+                2,
+                status=Task.TaskStatus.values[day % 3],
+                end_date=date.today() + timedelta(days=day - 15),
+            )
+        out = StringIO()
+
+        call_command("explain_board_queries", "--check", stdout=out)
+
+        assert "== kanban:new ==" in out.getvalue()
+        assert "All board queries use indexes" in out.getvalue()
+
+    def test_single_query(self):
+        """Можно вывести план одного запроса"""
+        out = StringIO()
+
+        call_command(
+            "explain_board_queries", "--check", "--query", "open", stdout=out
+        )
+
+        assert out.getvalue().startswith("== open ==")
+        assert "task_open_end_date_idx" in out.getvalue()
+
+    def test_postgresql_indexes_skipped(self, mocker):
+        """Индексы только для PostgreSQL на других СУБД не проверяются"""
+        mocker.patch.object(connection, "vendor", "sqlite")
+        out = StringIO()
+
+        call_command(
+            "explain_board_queries", "--check", "--query", "autocomplete:tags", stdout=out
+        )
+
+        assert "(index check skipped on sqlite)" in out.getvalue()
+
+    def test_check_fails_without_index(self, mocker):
+        """--check падает, если план не использует ожидаемый индекс"""
+        mocker.patch(
+            "tasker_app.management.commands.explain_board_queries.board_queries",
+            return_value=[("missing", Task.objects.all(), ("no_such_idx",))],
+        )
+
+        with pytest.raises(CommandError, match="missing: expected no_such_idx"):
+            call_command("explain_board_queries", "--check", stdout=StringIO())
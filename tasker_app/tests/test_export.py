@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+import pytest
+
+from tasker_app import export
+from tasker_app.models import Task
+
+
+def export_content(client, fmt: str, **params) -> str:
+    """Содержимое потоковой выгрузки"""
+    response = client.get(reverse("task_export", args=[fmt]), params)
+    assert response.streaming
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestTaskExport:
+    """Тесты выгрузки задач"""
+
+    def test_csv(self, staff_client, make_tasks, board_user):
+        """CSV содержит заголовок, исполнителя и теги задач"""
+        make_tasks(3)
+
+        rows = list(csv.DictReader(io.StringIO(export_content(staff_client, "csv"))))
+
+        assert len(rows) == 3
+        assert rows[0]["user_email"] == board_user.email
+        assert rows[0]["tags"] == ""
+        assert rows[2]["tags"] == "Бэкенд, Фронтенд"
+
+    def test_ndjson(self, staff_client, make_tasks):
+        """NDJSON - один объект на строку, теги списком"""
+        tasks = make_tasks(2)
+
+        lines = export_content(staff_client, "ndjson").splitlines()
+        first = json.loads(lines[0])
+
+        assert len(lines) == 2
+        assert first["id"] == tasks[0].pk
+        assert first["end_date"] == tasks[0].end_date.isoformat()
+        assert json.loads(lines[1])["tags"] == ["Бэкенд"]
+
+    def test_filters(self, staff_client, make_tasks, board_user):
+        """Фильтры по статусу, типу, периоду и исполнителю"""
+        today = date.today()
+        make_tasks(2, status="closed", end_date=today)
+        make_tasks(3, task_type="bug", end_date=today + timedelta(days=10))
+
+        def count(**params):
+            return len(export_content(staff_client, "ndjson", **params).splitlines())
+
+        assert count(status="closed") == 2
+        assert count(task_type="bug") == 3
+        assert count(date_from=today + timedelta(days=1)) == 3
+        assert count(date_to=today) == 2
+        assert count(user=board_user.email) == 5
+
+    def test_invalid_filters(self, staff_client):
+        """Некорректные фильтры возвращают ошибки формы"""
+        response = staff_client.get(
+            reverse("task_export", args=["csv"]),
+            {"status": "done", "date_from": "2030-01-02", "date_to": "2030-01-01"},
+        )
+
+        assert response.status_code == 400
+        assert set(response.json()["errors"]) == {"status", "__all__"}
+
+    def test_staff_only(self, client, make_tasks):
+        """Выгрузка с почтой исполнителей закрыта для анонимов"""
+        make_tasks(1)
+
+        response = client.get(reverse("task_export", args=["csv"]))
+
+        assert response.status_code == 302
+        assert response["Location"].startswith(reverse("admin:login"))
+
+    def test_unknown_format(self, staff_client):
+        """Неизвестный формат - 404"""
+        response = staff_client.get(reverse("task_export", args=["xml"]))
+
+        assert response.status_code == 404
+
+    def test_queries_per_chunk(self, make_tasks, django_assert_num_queries):
+        """Одна выборка задач и один запрос тегов на порцию"""
+        make_tasks(12)
+
+        with django_assert_num_queries(4):
+            rows = list(export.iter_rows(Task.objects.all(), chunk_size=5))
+
+        assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+
+@pytest.mark.django_db
+class TestExportTasksCommand:
+    """Тесты команды export_tasks"""
+
+    def test_stdout(self, make_tasks):
+        """Выгрузка в stdout и количество задач в stderr"""
+        make_tasks(3, status="active")
+        out, err = io.StringIO(), io.StringIO()
+
+        call_command(
+            "export_tasks", "--format", "ndjson", "--status", "active",
+            stdout=out, stderr=err,
+        )
+
+        assert len(out.getvalue().splitlines()) == 3
+        assert "Exported 3 tasks" in err.getvalue()
+
+    def test_output_file(self, make_tasks, tmp_path):
+        """Выгрузка в файл"""
+        make_tasks(2)
+        path = tmp_path / "tasks.csv"
+
+        call_command("export_tasks", "--output", str(path), stderr=io.StringIO())
+
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+    def test_invalid_filter(self):
+        """Некорректная дата - ошибка команды"""
+        with pytest.raises(CommandError, match="date_from"):
+            call_command("export_tasks", "--from", "yesterday")
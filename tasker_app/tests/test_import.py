@@ -0,0 +1,172 @@
+import io
+import itertools
+import json
+from django.core.management import call_command
+from django.core.management.base import CommandError
+import pytest
+
+from tasker_app import importer, search
+from tasker_app.models import Tag, Task
+
+
+def write_ndjson(path, rows: list[dict]):
+    """Записать строки в NDJSON-файл"""
+    path.write_text(
+        "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def make_row(email: str, i: int = 0, **fields) -> dict:
+    """Корректная строка импорта"""
+    row = {
+        "title": f"Импортная задача {i}",
+        "end_date": "2030-01-01",
+        "user_email": email,
+        "tags": ["Импорт", "Бэкенд"],
+        "body": "Описание",
+    }
+    row.update(fields)
+    return row
+
+
+@pytest.mark.django_db
+class TestImportTasksCommand:
+    """Тесты команды import_tasks"""
+
+    def test_roundtrip_with_export(self, make_tasks, board_tags, tmp_path):
+        """Выгрузка CSV загружается обратно с тегами и исполнителем"""
+        make_tasks(4)
+        path = tmp_path / "tasks.csv"
+        call_command("export_tasks", "--output", str(path), stderr=io.StringIO())
+        Task.objects.all().delete()
+        out = io.StringIO()
+
+        call_command("import_tasks", str(path), stdout=out)
+
+        assert "Imported 4 of 4 rows" in out.getvalue()
+        assert "new tags: 0" in out.getvalue()
+        task = Task.objects.get(title="Задача номер 3")
+        assert sorted(task.get_tags_list()) == sorted(tag.name for tag in board_tags)
+        assert Tag.objects.count() == 3
+
+    def test_ndjson_batches(self, board_user, tmp_path):
+        """Новые теги создаются один раз на весь импорт"""
+        rows = [make_row(board_user.email, i) for i in range(7)]
+        path = write_ndjson(tmp_path / "tasks.ndjson", rows)
+
+        call_command("import_tasks", path, "--batch-size", "3", stdout=io.StringIO())
+
+        assert Task.objects.filter(user_name=board_user).count() == 7
+        assert Tag.objects.get(name="Импорт").tasks.count() == 7
+        assert Tag.objects.filter(name="Бэкенд").count() == 1
+
+    def test_dry_run(self, board_user, tmp_path):
+        """Проверка без записи в БД"""
+        rows = [make_row(board_user.email, i) for i in range(3)]
+        path = write_ndjson(tmp_path / "tasks.ndjson", rows)
+        out = io.StringIO()
+
+        call_command("import_tasks", path, "--dry-run", stdout=out)
+
+        assert "Validated 3 of 3 rows" in out.getvalue()
+        assert "new tags: 2" in out.getvalue()
+        assert not Task.objects.exists()
+        assert not Tag.objects.exists()
+
+    def test_invalid_rows(self, board_user, tmp_path):
+        """Некорректные строки пропускаются и перечисляются"""
+        rows = [
+            make_row(board_user.email, 1),
+            make_row(board_user.email, title="Одно"),
+            make_row(board_user.email, 2, status="done", end_date="31.12.2030"),
+            make_row("nobody@example.com", 3),
+            make_row("", 4, task_type="story", tags=["x" * 51]),
+            make_row(board_user.email, 5, title="Очень " * 20, end_date="2030-02-30"),
+        ]
+        path = write_ndjson(tmp_path / "tasks.ndjson", rows)
+        err = io.StringIO()
+
+        with pytest.raises(CommandError, match="5 rows are invalid"):
+            call_command("import_tasks", path, stdout=io.StringIO(), stderr=err)
+
+        assert "Row 2: Название должно содержать минимум 2 слова" in err.getvalue()
+        assert "Неизвестный статус done; Некорректная дата окончания" in err.getvalue()
+        assert "Row 4: Пользователь nobody@example.com не найден" in err.getvalue()
+        assert "Row 5: Неизвестный тип задачи story" in err.getvalue()
+        assert "Имя тега длиннее 50 символов" in err.getvalue()
+        assert "Row 6: Название длиннее 100 символов; Некорректная" in err.getvalue()
+        assert Task.objects.count() == 1
+
+    def test_constant_queries_per_batch(
+        self, board_user, django_assert_num_queries
+    ):
+        """Пачка пишется за фиксированное число запросов"""
+        rows = [make_row(board_user.email, i, tags=[f"Тег {i}"]) for i in range(50)]
+        task_importer = importer.TaskImporter(batch_size=50)
+
+        # пользователи, теги (поиск, создание и выборка id созданных) и
+        # транзакция с двумя INSERT, счётчиками задач (INSERT и UPDATE) и
+        # пересчётом поисковых документов (запросов столько, сколько нужно
+        # поисковому бэкенду БД)
+        search_queries = len(search.get_backend().update_sql([0]))
+        with django_assert_num_queries(10 + search_queries):
+            result = task_importer.run(rows)
+
+        assert result.imported == 50
+
+    def test_tag_names_are_normalized(self, board_user, board_tags):
+        """Теги сопоставляются без учёта регистра и лишних пробелов"""
+        rows = [
+            make_row(board_user.email, 1, tags=" Бэкенд, Release,  release "),
+            make_row(board_user.email, 2, tags=["RELEASE", "Бэкенд"]),
+        ]
+
+        result = importer.TaskImporter(batch_size=1).run(rows)
+
+        assert result.tags_created == 1
+        assert Tag.objects.get(name="Release").tasks.count() == 2
+        assert board_tags[0].tasks.count() == 2
+
+    def test_batch_without_valid_rows(self):
+        """Пачка без корректных строк ничего не пишет"""
+        result = importer.TaskImporter().run([make_row("nobody@example.com")])
+
+        assert result.imported == 0
+        assert result.errors == [(1, ["Пользователь nobody@example.com не найден"])]
+
+    def test_stdin_with_progress(self, board_user, monkeypatch, mocker):
+        """Чтение из stdin и вывод прогресса"""
+        rows = [make_row(board_user.email, i, tags="Импорт, Бэкенд") for i in range(4)]
+        monkeypatch.setattr(
+            "sys.stdin",
+            io.StringIO("\n\n".join(json.dumps(row) for row in rows)),
+        )
+        mocker.patch(
+            "tasker_app.management.commands.import_tasks.time.perf_counter",
+            side_effect=itertools.count(0, 2),
+        )
+        err = io.StringIO()
+
+        call_command(
+            "import_tasks", "-", "--format", "ndjson", "--batch-size", "2",
+            stdout=io.StringIO(), stderr=err,
+        )
+
+        assert "4 rows (1 rows/s)" in err.getvalue()
+        assert Tag.objects.get(name="Импорт").tasks.count() == 4
+
+    def test_bad_input(self, tmp_path):
+        """Ошибки формата файла"""
+        path = tmp_path / "tasks.ndjson"
+        path.write_text('{"title": "ok"}\n[1]\n{"title":\n', encoding="utf-8")
+
+        with pytest.raises(CommandError, match="Строка 2"):
+            call_command("import_tasks", str(path), stdout=io.StringIO())
+        with pytest.raises(importer.ImportFormatError, match="Строка 3"):
+            list(importer.read_ndjson(io.StringIO('{"title": "ok"}\n\n{"title":\n')))
+        with pytest.raises(importer.ImportFormatError, match="Строка 2"):
+            list(importer.read_csv(["title,tags\n", "x\ry,1\n"]))
+        with pytest.raises(CommandError, match="Unknown input format"):
+            call_command("import_tasks", str(tmp_path / "tasks.xml"))
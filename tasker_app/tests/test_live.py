@@ -0,0 +1,261 @@
+# pylint: disable=redefined-outer-name
+import asyncio
+import json
+import threading
+
+from django.test import RequestFactory
+from django.urls import reverse
+import pytest
+
+from tasker_app import live
+from tasker_app.async_views import AsyncKanbanEventsView
+from tasker_app.live import RESET_FRAME, LocalBroker, RedisBroker
+from tasker_app.models import Task
+
+
+def event(task_id: int, kind: str = "updated", **payload) -> dict:
+    """Событие в формате tasker_app.events"""
+    return {"task_id": task_id, "kind": kind, "payload": payload, "occurred_at": "x"}
+
+
+def frame_data(frame: str) -> list[dict]:
+    """События из кадра SSE"""
+    return json.loads(frame.rsplit("data: ", 1)[1])
+
+
+def frame_id(frame: str) -> str:
+    """id кадра SSE"""
+    return frame.split("\n", 1)[0].removeprefix("id: ")
+
+
+async def next_frame(subscription) -> str:
+    """Кадр подписчика с ограничением ожидания"""
+    return await asyncio.wait_for(subscription.get(), 5)
+
+
+@pytest.fixture
+def broker(settings):
+    """Брокер процесса с маленькой историей и очередью"""
+    settings.TASK_LIVE_HISTORY = 3
+    settings.TASK_LIVE_QUEUE_SIZE = 5
+    settings.TASK_LIVE_KEEPALIVE = 0.01
+    return live.get_broker()
+
+
+class TestLocalBroker:
+    """Раздача событий подписчикам процесса"""
+
+    def test_fan_out_from_thread(self):
+        """Публикация из другого потока доходит до сотен подписчиков"""
+        broker = LocalBroker(history=10, queue_size=10)
+
+        async def scenario():
+            subscriptions = [broker.subscribe() for _ in range(300)]
+            thread = threading.Thread(
+                target=broker.publish, args=([event(1, status="new", title="A")],)
+            )
+            thread.start()
+            frames = await asyncio.gather(*map(next_frame, subscriptions))
+            thread.join()
+            for subscription in subscriptions:
+                broker.unsubscribe(subscription)
+            return frames
+
+        frames = asyncio.run(scenario())
+
+        assert len(set(frames)) == 1 and len(frames) == 300
+        assert frame_data(frames[0]) == [
+            {"task_id": 1, "kind": "updated", "status": "new", "title": "A"}
+        ]
+        assert len(broker) == 0
+
+    def test_replay(self):
+        """Переподключение получает пропущенные сообщения или reset"""
+        broker = LocalBroker(history=2, queue_size=10)
+        broker.publish([])
+        for pk in (1, 2, 3):
+            broker.publish([event(pk)])
+
+        async def first_frames(last_event_id):
+            subscription = broker.subscribe(last_event_id)
+            frames = []
+            while not subscription._queue.empty():  # pylint: disable=protected-access
+                frames.append(await subscription.get())
+            broker.unsubscribe(subscription)
+            return frames
+
+        missed = asyncio.run(first_frames(f"{broker.epoch}-2"))
+        assert [frame_data(frame)[0]["task_id"] for frame in missed] == [3]
+        assert asyncio.run(first_frames(f"{broker.epoch}-0")) == [RESET_FRAME]
+        assert asyncio.run(first_frames("other-3")) == [RESET_FRAME]
+        assert not asyncio.run(first_frames(None))
+        assert frame_id(missed[0]) == f"{broker.epoch}-3"
+
+    def test_slow_subscriber(self):
+        """Переполненная очередь заменяется одним reset"""
+        broker = LocalBroker(history=10, queue_size=2)
+
+        async def scenario():
+            subscription = broker.subscribe()
+            for pk in range(4):
+                broker.publish([event(pk)])
+            await asyncio.sleep(0)
+            frame = await next_frame(subscription)
+            assert subscription._queue.empty()  # pylint: disable=protected-access
+            return frame
+
+        assert asyncio.run(scenario()) == RESET_FRAME
+
+    def test_closed_loop(self):
+        """Подписчики закрытого цикла не мешают публикации"""
+        broker = LocalBroker(history=10, queue_size=2)
+
+        async def subscribe():
+            return broker.subscribe()
+
+        asyncio.run(subscribe())
+        broker.publish([event(1)])
+
+        assert len(broker) == 1
+
+
+class TestRedisBroker:
+    """Публикация через канал Redis"""
+
+    def test_publish_and_listen(self, mocker):
+        """Сообщения канала раздаются подписчикам, сбой канала - переподключение"""
+        client = mocker.Mock()
+        mocker.patch("redis.Redis.from_url", return_value=client)
+        broker = RedisBroker(history=10, queue_size=10, url="redis://example")
+        broker.reconnect_delay = 0.01
+        published = json.dumps([event(7, title="B")])
+        listened = threading.Event()
+
+        def listen():
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": published}
+            listened.set()
+            raise ValueError("broken")
+
+        client.pubsub.return_value.listen.side_effect = listen
+
+        async def scenario():
+            subscription = broker.subscribe()
+            frame = await next_frame(subscription)
+            broker.unsubscribe(subscription)
+            return frame
+
+        broker.publish([event(7, title="B")])
+        broker.publish([])
+        frame = asyncio.run(scenario())
+        assert listened.wait(5)
+        broker.close()
+
+        client.publish.assert_called_once_with(RedisBroker.channel, published)
+        assert frame_data(frame) == [{"task_id": 7, "kind": "updated", "title": "B"}]
+
+    def test_publish_error(self, mocker, caplog):
+        """Недоступный Redis не ломает запись задачи"""
+        client = mocker.Mock()
+        client.publish.side_effect = ValueError("down")
+        mocker.patch("redis.Redis.from_url", return_value=client)
+
+        RedisBroker(history=10, queue_size=10).publish([event(1)])
+
+        assert "Live update was not published" in caplog.text
+
+
+@pytest.mark.django_db
+class TestTaskEvents:
+    """События задач после коммита"""
+
+    def test_published_after_commit(
+        self, broker, make_tasks, django_capture_on_commit_callbacks
+    ):
+        """Создание и перенос в другую колонку"""
+        loop = asyncio.new_event_loop()
+
+        async def subscribe():
+            return broker.subscribe()
+
+        # Запись - в потоке теста (его транзакция), чтение - в цикле
+        subscription = loop.run_until_complete(subscribe())
+        with django_capture_on_commit_callbacks(execute=True):
+            task = make_tasks(1)[0]
+        created = loop.run_until_complete(next_frame(subscription))
+        task.status = Task.TaskStatus.ACTIVE
+        with django_capture_on_commit_callbacks(execute=True):
+            task.save()
+        moved = loop.run_until_complete(next_frame(subscription))
+        broker.unsubscribe(subscription)
+        loop.close()
+
+        assert frame_data(created)[0]["kind"] == "created"
+        assert frame_data(moved) == [
+            {
+                "task_id": task.pk,
+                "kind": "status_changed",
+                "title": task.title,
+                "status": "active",
+                "previous_status": "new",
+            }
+        ]
+
+    def test_rolled_back(self, broker, make_tasks, django_capture_on_commit_callbacks):
+        """Без коммита ничего не публикуется"""
+        with django_capture_on_commit_callbacks() as callbacks:
+            make_tasks(1)
+
+        assert callbacks
+        assert not broker._history  # pylint: disable=protected-access
+
+
+class TestKanbanEvents:
+    """Поток событий канбана"""
+
+    def test_wsgi(self, client, db):
+        """Под WSGI - 204, браузер не переподключается"""
+        assert client.get(reverse("kanban_events")).status_code == 204
+
+    def test_stream(self, broker, rf: RequestFactory):
+        """Кадры SSE: retry, события, keepalive; отключение - отписка"""
+
+        async def scenario():
+            view = AsyncKanbanEventsView.as_view()
+            response = await view(rf.get("/kanban/events/"))
+            frames = aiter(response.streaming_content)
+            received = [await anext(frames)]
+            broker.publish([event(5, kind="deleted")])
+            received.append(await anext(frames))
+            received.append(await anext(frames))
+            subscribers = len(broker)
+            await frames.aclose()
+            return response, received, subscribers
+
+        response, frames, subscribers = asyncio.run(scenario())
+
+        assert response["Content-Type"] == "text/event-stream"
+        assert response["Cache-Control"] == "no-cache"
+        assert frames[0] == live.RETRY_FRAME.encode()
+        assert frame_data(frames[1].decode()) == [{"task_id": 5, "kind": "deleted"}]
+        assert frames[2] == live.KEEPALIVE_FRAME.encode()
+        assert subscribers == 1 and len(broker) == 0
+
+    def test_reset_ends_stream(self, broker):
+        """Поток заканчивается после reset"""
+
+        async def scenario():
+            return [frame async for frame in live.stream("other-1")]
+
+        assert asyncio.run(scenario()) == [live.RETRY_FRAME, RESET_FRAME]
+        assert len(broker) == 0
+
+    def test_kanban_page(self, client, make_tasks):
+        """Канбан подключает поток, карточки помечены id задач"""
+        task = make_tasks(1)[0]
+
+        content = client.get(reverse("kanban")).content.decode()
+
+        assert f'data-live-url="{reverse("kanban_events")}"' in content
+        assert f'data-task-id="{task.pk}"' in content
+        assert 'data-column-total="new"' in content
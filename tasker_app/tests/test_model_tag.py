@@ -1,5 +1,11 @@
+import importlib
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
 import pytest
 
+from tasker_app import board_cache, search
 from tasker_app.models import Tag
 
 
@@ -50,3 +56,103 @@ class TestTagModel:
 
         with pytest.raises(Tag.DoesNotExist):
             Tag.objects.get(pk=tag_id)
+
+
+@pytest.mark.django_db
+class TestTagNormalization:
+    """Тесты уникальности и нормализации имён тегов"""
+
+    def test_name_is_normalized(self):
+        """Крайние и повторные пробелы убираются при сохранении"""
+        tag = Tag.objects.create(name="  База   данных ")
+
+        assert Tag.objects.get(pk=tag.pk).name == "База данных"
+
+    def test_case_insensitive_unique(self):
+        """Имя, отличающееся регистром, не создаёт второй тег"""
+        Tag.objects.create(name="Backend")
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Tag.objects.create(name="backend ")
+
+    def test_full_clean(self):
+        """Валидация модели (формы админки) сообщает о дубле"""
+        Tag.objects.create(name="Backend")
+
+        with pytest.raises(ValidationError, match="Тег с таким именем уже существует"):
+            Tag(name=" BACKEND").full_clean()
+
+
+@pytest.mark.django_db
+class TestGetOrCreateMany:
+    """Тесты разрешения имён тегов пачкой"""
+
+    def test_constant_queries(self, db, django_assert_num_queries):
+        """Поиск, создание и повторный поиск - три запроса на любое число имён"""
+        backend = Tag.objects.create(name="Backend")
+        names = ["backend", " Backend", "New  tag", "new TAG", *[f"Тег {i}" for i in range(20)]]
+
+        with django_assert_num_queries(3):
+            tags, created = Tag.objects.get_or_create_many(names)
+
+        assert tags["backend"] == tags[" Backend"] == backend.pk
+        assert tags["New  tag"] == tags["new TAG"]
+        assert created[0] == "New tag" and len(created) == 21
+        assert Tag.objects.count() == 22
+
+    def test_existing_only(self, board_tags, django_assert_num_queries):
+        """Если все теги есть, нужен один запрос"""
+        with django_assert_num_queries(1):
+            tags, created = Tag.objects.get_or_create_many(["Баг", "баг", " "])
+
+        assert tags == {"Баг": board_tags[2].pk, "баг": board_tags[2].pk}
+        assert not created
+
+    def test_without_create(self, db):
+        """create=False только сообщает о новых именах"""
+        tags, created = Tag.objects.get_or_create_many(["Релиз"], create=False)
+
+        assert tags == {"Релиз": None}
+        assert created == ["Релиз"]
+        assert not Tag.objects.exists()
+
+    def test_concurrently_created(self, db, monkeypatch):
+        """Тег, созданный между поиском и вставкой, находится повторным запросом"""
+        find = Tag.objects._find  # pylint: disable=protected-access
+        calls = []
+
+        def racing_find(names):
+            calls.append(names)
+            if len(calls) == 1:
+                Tag.objects.create(name="Release")
+                return {}
+            return find(names)
+
+        monkeypatch.setattr(Tag.objects, "_find", racing_find)
+        tags, _ = Tag.objects.get_or_create_many(["release"])
+
+        assert tags["release"] == Tag.objects.get().pk
+
+
+@pytest.mark.django_db
+def test_merge_duplicates_migration(make_tasks, board_tags):
+    """Миграция сливает дубли и переносит связи задач"""
+    first, second = make_tasks(2)
+    # Дубли, созданные до ограничения уникальности (без нормализации)
+    spaced, upper = Tag.objects.bulk_create([Tag(name=" Бэкенд"), Tag(name="Баг  ")])
+    first.tags.add(board_tags[0], spaced)
+    second.tags.add(spaced, upper)
+    migration = importlib.import_module("tasker_app.migrations.0009_merge_duplicate_tags")
+    version = board_cache.get_versions(board_cache.BOARD)
+    # Документы затронутых задач миграция пересчитывает заново
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {search.get_backend().table}")
+
+    # Без входа в контекст: SQLite не даёт открыть его внутри транзакции теста
+    migration.merge_duplicates(apps, connection.schema_editor())
+
+    assert list(Tag.objects.values_list("name", flat=True)) == ["Бэкенд", "Фронтенд", "Баг"]
+    assert first.get_tags_list() == ["Бэкенд"]
+    assert sorted(second.get_tags_list()) == ["Баг", "Бэкенд"]
+    assert [task.pk for task in search.search("Баг")] == [second.pk]
+    assert board_cache.get_versions(board_cache.BOARD) != version
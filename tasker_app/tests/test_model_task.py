@@ -136,6 +136,19 @@ class TestTaskModel:
         default_tasks = Task.get_by_date()
         assert default_tasks.count() == 2
 
+    def test_get_by_date_default_is_evaluated_per_call(self, test_user, monkeypatch):
+        """Тест: "сегодня" по умолчанию считается при вызове, а не при импорте"""
+        tomorrow = date.today() + timedelta(days=1)
+        Task.objects.create(
+            title="Задача на завтра",
+            user_name=test_user,
+            body="Описание",
+            end_date=tomorrow,
+        )
+        monkeypatch.setattr("django.utils.timezone.localdate", lambda: tomorrow)
+
+        assert Task.get_by_date().count() == 1
+
     def test_get_tags_list_method(self, test_user, test_tags):
         """Тест метода get_tags_list"""
         task = Task.objects.create(
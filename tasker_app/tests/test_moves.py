@@ -0,0 +1,254 @@
+# pylint: disable=redefined-outer-name
+import importlib
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk, counters
+from tasker_app.models import Task, TaskEvent
+
+
+ACTIVE, CLOSED, NEW = Task.TaskStatus.ACTIVE, Task.TaskStatus.CLOSED, Task.TaskStatus.NEW
+MOVES_URL = reverse("kanban_moves")
+
+
+def column(status: str) -> list[int]:
+    """id задач колонки в порядке канбана"""
+    return list(
+        Task.objects.filter(status=status)
+        .order_by("rank", "id")
+        .values_list("pk", flat=True)
+    )
+
+
+def post_moves(client, payload):
+    """POST пачки переносов"""
+    return client.post(MOVES_URL, json.dumps(payload), content_type="application/json")
+
+
+@pytest.fixture
+def board(make_tasks):
+    """По четыре задачи в колонках new и active"""
+    return {
+        NEW: [task.pk for task in make_tasks(4)],
+        ACTIVE: [task.pk for task in make_tasks(4, status=ACTIVE)],
+    }
+
+
+@pytest.mark.django_db
+class TestMoveTasks:
+    """Перенос задач: новый rank между соседями"""
+
+    def test_reorder_and_move(self, board):
+        """Перестановка в колонке и перенос в другую и в пустую колонку"""
+        first, second, third, fourth = board[NEW]
+
+        moved = bulk.move_tasks([(fourth, NEW, 1), (first, ACTIVE, 2), (second, CLOSED, 5)])
+
+        assert column(NEW) == [fourth, third]
+        assert column(ACTIVE)[2] == first and len(column(ACTIVE)) == 5
+        assert column(CLOSED) == [second]
+        assert moved[second] == (CLOSED, 0)
+        assert set(moved) == {first, second, fourth}
+
+    def test_sequential_moves(self, board):
+        """Переносы пачки применяются по порядку"""
+        first, second, third, fourth = board[NEW]
+
+        bulk.move_tasks([(fourth, NEW, 0), (third, NEW, 0), (first, NEW, 3)])
+
+        assert column(NEW) == [third, fourth, second, first]
+
+    def test_one_row_updated(self, board):
+        """При зазоре между соседями меняется только перенесённая задача"""
+        ranks = dict(Task.objects.values_list("pk", "rank"))
+        first, second, _, fourth = board[NEW]
+
+        bulk.move_tasks([(fourth, NEW, 1)])
+
+        changed = {
+            pk for pk, rank in Task.objects.values_list("pk", "rank") if ranks[pk] != rank
+        }
+        assert changed == {fourth}
+        assert ranks[first] < Task.objects.get(pk=fourth).rank < ranks[second]
+
+    def test_rebalance_prefix(self, board):
+        """Без зазора перенумеровывается только начало колонки до границы"""
+        first, second, third, fourth = board[NEW]
+        for pk, rank in zip(board[NEW], (10, 11, 100, 200)):
+            Task.objects.filter(pk=pk).update(rank=rank)
+
+        # Сверх выбранного начала колонки остаётся fourth
+        bulk.move_tasks([(third, NEW, 1)])
+
+        assert column(NEW) == [first, third, second, fourth]
+        assert Task.objects.get(pk=fourth).rank == 200
+        assert Task.objects.get(pk=first).rank < 10
+
+    def test_rebalance_whole_column(self, board):
+        """Колонка целиком перенумеровывается с шагом RANK_STEP"""
+        first, second, third, fourth = board[NEW]
+        Task.objects.filter(pk__in=board[NEW]).update(rank=7)
+
+        bulk.move_tasks([(fourth, NEW, 1), (third, NEW, 10)])
+
+        assert column(NEW) == [first, fourth, second, third]
+        ranks = list(
+            Task.objects.filter(status=NEW).order_by("rank").values_list("rank", flat=True)
+        )
+        assert ranks == [0, bulk.RANK_STEP, 2 * bulk.RANK_STEP, 3 * bulk.RANK_STEP]
+
+    def test_missing_tasks(self, board):
+        """Несуществующие задачи пропускаются"""
+        assert not bulk.move_tasks([(0, NEW, 0)])
+        assert list(bulk.move_tasks([(0, NEW, 0), (board[ACTIVE][0], NEW, 0)])) == [
+            board[ACTIVE][0]
+        ]
+
+    def test_constant_queries(self, board):
+        """Число запросов не зависит от числа переносов"""
+
+        def count(moves) -> int:
+            with CaptureQueriesContext(connection) as ctx:
+                bulk.move_tasks(moves)
+            return len(ctx.captured_queries)
+
+        few = [(board[NEW][0], ACTIVE, 0)]
+        many = [(pk, ACTIVE, 1) for pk in board[NEW][1:]] + [(board[ACTIVE][0], NEW, 0)]
+
+        assert count(few) + 1 == count(many)  # вторая колонка - запрос её начала
+
+    def test_counters_and_events(self, board, settings, django_capture_on_commit_callbacks):
+        """Счётчики и журнал событий: status_changed или updated с rank"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        TaskEvent.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            moved = bulk.move_tasks([(board[NEW][0], CLOSED, 0), (board[NEW][1], NEW, 3)])
+
+        assert counters.count_by_status() == {NEW: 3, ACTIVE: 4, CLOSED: 1}
+        payloads = list(TaskEvent.objects.order_by("pk").values_list("kind", "payload"))
+        assert payloads == [
+            (
+                "status_changed",
+                {
+                    "title": "Задача номер 0",
+                    "status": CLOSED,
+                    "previous_status": NEW,
+                    "rank": moved[board[NEW][0]][1],
+                },
+            ),
+            (
+                "updated",
+                {"title": "Задача номер 1", "status": NEW, "rank": moved[board[NEW][1]][1]},
+            ),
+        ]
+
+    def test_renumbered_events(self, board, settings, django_capture_on_commit_callbacks):
+        """Перенумерованные соседи получают события updated с новым rank"""
+        settings.TASK_EVENTS_BATCH_SIZE = 1
+        first, _, third, _ = board[NEW]
+        for pk, rank in zip(board[NEW], (10, 11, 100, 200)):
+            Task.objects.filter(pk=pk).update(rank=rank)
+        TaskEvent.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            moved = bulk.move_tasks([(third, NEW, 1)])
+
+        events = {
+            task_id: (kind, payload)
+            for task_id, kind, payload in TaskEvent.objects.values_list(
+                "task_id", "kind", "payload"
+            )
+        }
+        assert events[first] == (
+            "updated",
+            {"status": NEW, "rank": Task.objects.get(pk=first).rank},
+        )
+        assert events[third][1]["rank"] == moved[third][1]
+        assert list(moved) == [third]
+
+
+@pytest.mark.django_db
+class TestKanbanMoveView:
+    """Эндпоинт переносов канбана"""
+
+    def test_moves(self, client, board):
+        """Ответ - новые статусы и rank, несуществующие id отдельно"""
+        task = board[NEW][3]
+        missing = max(board[ACTIVE]) + 1
+
+        response = post_moves(
+            client,
+            {
+                "moves": [
+                    {"id": task, "status": "active", "position": 0},
+                    {"id": missing, "status": "new", "position": 0},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        rank = Task.objects.get(pk=task).rank
+        assert response.json() == {
+            "moved": [{"id": task, "status": "active", "rank": rank}],
+            "missing": [missing],
+        }
+        assert column(ACTIVE)[0] == task
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            "not json",
+            json.dumps([1]),
+            json.dumps({"moves": {}}),
+            json.dumps({"moves": [{"id": 1}] * 101}),
+            json.dumps({"moves": [{"id": 1, "status": "lost", "position": -1}]}),
+            json.dumps({"moves": ["move"]}),
+        ],
+    )
+    def test_invalid(self, client, db, payload):
+        """Некорректная пачка - 400 с ошибками"""
+        response = client.post(MOVES_URL, payload, content_type="application/json")
+
+        assert response.status_code == 400
+        assert "errors" in response.json()
+
+    def test_kanban_order(self, client, board):
+        """Колонки канбана - в порядке rank, карточки перетаскиваются"""
+        bulk.move_tasks([(board[NEW][3], NEW, 0)])
+
+        response = client.get(reverse("kanban"))
+
+        assert [task.pk for task in response.context["columns"][NEW]][:2] == [
+            board[NEW][3],
+            board[NEW][0],
+        ]
+        content = response.content.decode()
+        assert f'data-move-url="{MOVES_URL}"' in content
+        assert 'draggable="true"' in content
+        assert "csrftoken" in response.cookies
+
+
+@pytest.mark.django_db
+def test_fill_rank_migration(make_tasks):
+    """Миграция нумерует колонки в прежнем порядке - по сроку"""
+    today = date.today()
+    late, early = make_tasks(1, end_date=today + timedelta(days=1)) + make_tasks(1)
+    closed = make_tasks(1, status=CLOSED)[0]
+    migration = importlib.import_module("tasker_app.migrations.0012_task_rank")
+
+    migration.fill_rank(apps, SimpleNamespace(execute=connection.cursor().execute))
+
+    ranks = dict(Task.objects.values_list("pk", "rank"))
+    assert ranks == {
+        early.pk: bulk.RANK_STEP,
+        late.pk: 2 * bulk.RANK_STEP,
+        closed.pk: bulk.RANK_STEP,
+    }
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from django.db import connection
+from django.urls import reverse
+import pytest
+
+from tasker_app.models import Task
+from tasker_app.pagination import InvalidCursor, KeysetPaginator
+from tasker_app.views import IndexTemplateView, KanbanTemplateView
+
+
+@pytest.mark.django_db
+class TestKeysetPaginator:
+    """Тесты курсорной пагинации"""
+
+    @pytest.fixture
+    def tasks(self, make_tasks):
+        """Задачи с повторяющимися датами окончания"""
+        today = date.today()
+        return [
+            task
+            for offset in (2, 0, 1)
+            for task in make_tasks(3, end_date=today + timedelta(days=offset))
+        ]
+
+    def test_walk_all_pages(self, tasks):
+        """Обход по курсорам возвращает все задачи по (end_date, id) без повторов"""
+        paginator = KeysetPaginator(Task.objects.all(), per_page=4)
+        seen, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            seen.extend(page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+
+        expected = sorted(tasks, key=lambda task: (task.end_date, task.id))
+        assert seen == expected
+
+    def test_deep_page_uses_keyset_condition(self, tasks):
+        """Глубокая страница выбирается условием по ключу, а не OFFSET"""
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+        cursor = paginator.encode_cursor(tasks[4])
+
+        sql = str(paginator.page_queryset(Task.objects.all(), cursor).query)
+
+        assert "OFFSET" not in sql
+        assert '"end_date" >' in sql
+
+    def test_values_rows(self, tasks):
+        """Курсор строится и по словарям values()"""
+        queryset = Task.objects.values("id", "end_date")
+        paginator = KeysetPaginator(queryset, per_page=8)
+
+        page = paginator.page()
+        rest = paginator.page(page.next_cursor)
+
+        assert len(page) == 8
+        assert len(rest) == 1
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "WzFd", "eyJhIjogMX0", "WyJ4IiwxXQ"])
+    def test_invalid_cursor(self, cursor):
+        """Повреждённый курсор вызывает InvalidCursor"""
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+
+        with pytest.raises(InvalidCursor):
+            paginator.page(cursor)
+
+    def test_column_pages_without_compound_slicing(self, make_tasks, monkeypatch):
+        """Без LIMIT внутри UNION колонки выбираются отдельными запросами"""
+        make_tasks(3, status=Task.TaskStatus.NEW)
+        make_tasks(1, status=Task.TaskStatus.CLOSED)
+        monkeypatch.setattr(
+            connection.features, "supports_slicing_ordering_in_compound", False
+        )
+        paginator = KeysetPaginator(Task.objects.all(), per_page=2)
+
+        pages = paginator.column_pages(
+            "status", dict.fromkeys(Task.TaskStatus.values)
+        )
+
+        assert [len(pages[status]) for status in ("new", "active", "closed")] == [2, 0, 1]
+        assert pages["new"].has_next()
+
+
+@pytest.mark.django_db
+class TestBoardPagination:
+    """Тесты постраничного вывода досок"""
+
+    def test_index_load_more(self, client, make_tasks, monkeypatch):
+        """Главная отдаёт страницу и ссылку на следующую"""
+        make_tasks(5)
+        monkeypatch.setattr(IndexTemplateView, "paginate_by", 3)
+
+        first = client.get(reverse("index"))
+        cursor = first.context["page"].next_cursor
+        second = client.get(reverse("index"), {"cursor": cursor})
+
+        assert f"?cursor={cursor}" in first.content.decode()
+        assert len(first.context["tasks"]) == 3
+        assert len(second.context["tasks"]) == 2
+        assert not second.context["page"].has_next()
+
+    def test_invalid_cursor_is_404(self, client):
+        """Некорректный курсор - 404"""
+        assert client.get(reverse("index"), {"cursor": "broken"}).status_code == 404
+        assert client.get(reverse("kanban"), {"new": "broken"}).status_code == 404
+
+    def test_kanban_column_cursor(self, client, make_tasks, monkeypatch):
+        """Курсор колонки канбана листает только эту колонку"""
+        make_tasks(3, status=Task.TaskStatus.NEW)
+        make_tasks(3, status=Task.TaskStatus.ACTIVE)
+        monkeypatch.setattr(KanbanTemplateView, "paginate_by", 2)
+
+        first = client.get(reverse("kanban")).context["columns"]
+        second = client.get(
+            reverse("kanban"), {"new": first["new"].next_cursor}
+        ).context["columns"]
+
+        assert len(second["new"]) == 1
+        assert len(second["active"]) == 2
+        assert second["new"].total == 3
@@ -0,0 +1,99 @@
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+import pytest
+
+from tasker_app.models import Task
+from tasker_app.profiling import RequestProfile, call_site, get_store
+from user_app.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestRequestProfiling:
+    """Тесты профилирования запросов"""
+
+    @pytest.fixture
+    def profiling(self, settings):
+        """Включённое профилирование с пустой сводкой"""
+        settings.REQUEST_PROFILING = True
+        get_store().clear()
+
+    def test_server_timing(self, client, make_tasks, profiling):
+        """Метрики запроса отдаются в Server-Timing"""
+        make_tasks(3)
+
+        response = client.get(reverse("index"))
+
+        timing = response["Server-Timing"]
+        assert 'db;dur=' in timing
+        assert 'desc="4 queries"' in timing
+        assert "tpl;dur=" in timing and "app;dur=" in timing
+        assert "dup;" not in timing
+
+    def test_disabled(self, client, db):
+        """Без настройки middleware не работает"""
+        response = client.get(reverse("about"))
+
+        assert "Server-Timing" not in response
+
+    def test_duplicates_by_call_site(self, make_tasks):
+        """Повторы SQL из одного места кода помечаются"""
+        make_tasks(3)
+        profile = RequestProfile()
+
+        with connection.execute_wrapper(profile):
+            for task in Task.objects.all():
+                task.get_tags_list()
+            for _ in range(2):
+                Task.objects.count()
+
+        duplicates = {item["site"].split(":")[0]: item for item in profile.duplicates()}
+        tags = duplicates["tasker_app/models.py"]
+        assert tags["count"] == 3
+        assert not tags["identical"]
+        assert duplicates["tasker_app/tests/test_profiling.py"]["identical"]
+        assert 'dup;desc="3 repeated queries"' in profile.server_timing()
+
+    def test_call_site_outside_project(self, settings):
+        """Запрос не из кода проекта"""
+        settings.BASE_DIR = "/nonexistent"
+
+        assert call_site() == "unknown"
+
+    def test_summary(self, make_tasks, profiling):
+        """Сводка по представлениям доступна только администраторам"""
+        make_tasks(2)
+        client = Client()
+        client.get(reverse("index"))
+        client.get(reverse("index"))
+        client.get("/missing/")
+
+        assert client.get(reverse("profiling_summary")).status_code == 302
+        client.force_login(
+            CustomUser.objects.create_superuser(
+                email="admin@example.com", password="adminpass123", full_name="Admin"
+            )  # type: ignore
+        )
+        views = client.get(reverse("profiling_summary")).json()["views"]
+
+        assert views["index"]["requests"] == 2
+        # Второй запрос доски берётся из кеша досок: остаются валидаторы
+        assert views["index"]["queries"] == {"avg": 3, "p95": 4, "max": 4}
+        assert views["index"]["duplicates"] == []
+        assert views["<unresolved>"]["requests"] == 1
+
+    def test_summary_duplicates_and_reset(self, staff_client, make_tasks, profiling):
+        """Повторы попадают в сводку, POST сбрасывает её"""
+        make_tasks(3)
+        profile = RequestProfile(total_time=0.01)
+        with connection.execute_wrapper(profile):
+            for task in Task.objects.all():
+                task.get_tags_list()
+        get_store().add("index", profile)
+
+        index = get_store().summary()["index"]
+        response = staff_client.post(reverse("profiling_summary"))
+
+        assert index["duplicates"][0]["requests"] == 1
+        assert index["duplicates"][0]["count"] == 3
+        assert not response.json()["views"]
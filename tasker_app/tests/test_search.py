@@ -0,0 +1,195 @@
+# pylint: disable=redefined-outer-name
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk, search
+from tasker_app.models import Tag, Task
+
+
+def found(query: str) -> list[str]:
+    """Названия найденных задач по убыванию релевантности"""
+    return [task.title for task in search.search(query)]
+
+
+@pytest.fixture
+def task(make_tasks):
+    """Задача без тегов"""
+    task = make_tasks(1)[0]
+    task.title = "Починить авторизацию"
+    task.body = "Пользователь не может войти после смены пароля"
+    task.save()
+    return task
+
+
+@pytest.mark.django_db
+class TestSearchDocuments:
+    """Тесты обновления поисковых документов на путях записи"""
+
+    def test_title_and_body(self, task):
+        """Задача ищется по словам названия и описания"""
+        assert found("авторизацию") == [task.title]
+        assert found("пароля") == [task.title]
+        assert not found("отчёт")
+
+    def test_ranking(self, make_tasks, board_tags):
+        """Совпадение в названии важнее описания, описание - тегов"""
+        in_tags, in_body, in_title = make_tasks(3)
+        Task.objects.filter(pk=in_title.pk).update(title="Миграция базы")
+        Task.objects.filter(pk=in_body.pk).update(body="Нужна миграция")
+        search.rebuild()
+        tag = Tag.objects.create(name="Миграция")
+        in_tags.tags.add(tag)
+
+        assert found("миграция") == ["Миграция базы", in_body.title, in_tags.title]
+
+    def test_save_updates(self, task):
+        """Изменённое название ищется, старое - нет"""
+        task.title = "Обновить зависимости"
+        task.save()
+
+        assert found("зависимости") == [task.title]
+        assert not found("авторизацию")
+
+    def test_unrelated_save_skips_update(self, task, django_assert_num_queries):
+        """save(update_fields) без текста не пересчитывает документ"""
+        # Срок, в отличие от статуса, не входит и в счётчики задач
+        task.end_date += timedelta(days=1)
+        with django_assert_num_queries(1):
+            task.save(update_fields=["end_date"])
+
+    def test_delete(self, task):
+        """Удалённая задача не находится"""
+        task.delete()
+
+        assert not found("авторизацию")
+
+    def test_task_tags(self, task, board_tags):
+        """Теги задачи входят в её документ"""
+        task.tags.add(board_tags[0])
+        assert found("бэкенд") == [task.title]
+
+        task.tags.clear()
+        assert not found("бэкенд")
+
+    def test_tag_side(self, task, board_tags):
+        """Изменения со стороны тега обновляют документы его задач"""
+        tag = board_tags[0]
+        tag.tasks.add(task)
+        assert found("бэкенд") == [task.title]
+
+        tag.name = "Сервер"
+        tag.save()
+        assert found("сервер") == [task.title]
+
+        tag.tasks.clear()
+        assert not found("сервер")
+
+        tag.tasks.add(task)
+        tag.delete()
+        assert not found("сервер")
+
+    def test_bulk(self, task, board_tags, board_user):
+        """Массовые операции обновляют документы"""
+        bulk.add_tag([task.pk], board_tags[1].pk)
+        assert found("фронтенд") == [task.title]
+
+        bulk.remove_tag([task.pk], board_tags[1].pk)
+        assert not found("фронтенд")
+
+        bulk.set_fields([task.pk], title="Массово переименована")
+        assert found("переименована") == ["Массово переименована"]
+
+        bulk.create_tasks(
+            [Task(title="Импорт", body="", end_date=task.end_date, user_name=board_user)],
+            [[board_tags[2].pk]],
+        )
+        assert found("баг") == ["Импорт"]
+
+    def test_rebuild_command(self, task):
+        """Команда пересчитывает документы всех задач"""
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        assert out.getvalue().strip() == "Indexed 1 tasks"
+        assert found("авторизацию") == [task.title]
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="Морфология есть только в PostgreSQL"
+    )
+    def test_stemming(self, task):
+        """Поиск учитывает словоформы"""
+        assert found("авторизация") == [task.title]
+
+
+@pytest.mark.django_db
+class TestSearchPages:
+    """Тесты страниц результатов"""
+
+    def test_pagination(self, make_tasks):
+        """Результаты отдаются страницами"""
+        for report in make_tasks(5):
+            report.title = f"Отчёт {report.pk}"
+            report.save()
+
+        first = search.search("отчёт", per_page=3)
+        second = search.search("отчёт", page=2, per_page=3)
+
+        assert first.has_next and not second.has_next
+        assert len(first) == 3 and len(second) == 2
+        assert not {r.pk for r in first} & {r.pk for r in second}
+
+    def test_empty_query(self, db, django_assert_num_queries):
+        """Пустой запрос ничего не ищет"""
+        with django_assert_num_queries(0):
+            page = search.search("  ")
+
+        assert not page.object_list and not page.has_next
+
+    def test_view(self, client, task, board_tags, django_assert_max_num_queries):
+        """Страница поиска: id по релевантности, задачи, теги"""
+        task.tags.add(board_tags[0])
+
+        with django_assert_max_num_queries(3):
+            response = client.get(reverse("task_search"), {"q": "пароля"})
+
+        content = response.content.decode()
+        assert task.title in content
+        assert "Теги: Бэкенд" in content
+
+    def test_view_next_page(self, client, make_tasks):
+        """Ссылка на следующую страницу сохраняет запрос"""
+        for report in make_tasks(search.PER_PAGE + 1):
+            report.title = "Общий отчёт"
+            report.save()
+
+        response = client.get(reverse("task_search"), {"q": "отчёт", "page": "x"})
+
+        assert response.context["page"].number == 1
+        assert "page=2" in response.content.decode()
+
+    def test_view_nothing_found(self, client, db):
+        """Пустой результат для непустого запроса"""
+        response = client.get(reverse("task_search"), {"q": "ничего"})
+
+        assert "Ничего не найдено" in response.content.decode()
+
+    def test_admin(self, staff_client, task, make_tasks):
+        """Поиск в админке идёт по индексу"""
+        make_tasks(2)
+        url = reverse("admin:tasker_app_task_changelist")
+
+        response = staff_client.get(url, {"q": "пароля"})
+
+        assert list(response.context["cl"].result_list) == [task]
+        assert staff_client.get(url).context["cl"].result_count == 3
+
+
+def test_fts_query():
+    """Запрос FTS5 из слов пользователя"""
+    assert search.SqliteSearch.fts_query('починить "вход" -') == '"починить"* "вход"*'
+    assert search.SqliteSearch.fts_query("!!") == '""'
@@ -0,0 +1,70 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+import pytest
+
+from tasker_app import seeding
+from tasker_app.models import Tag, Task
+from user_app.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestSeedTasksCommand:
+    """Тесты команды seed_tasks"""
+
+    def test_seed(self):
+        """Создаются пользователи, теги и задачи с разными статусами"""
+        out = StringIO()
+
+        call_command(
+            "seed_tasks", "--users", "5", "--tags", "8", "--tasks", "300",
+            "--batch-size", "120", "--seed", "1", stdout=out,
+        )
+
+        assert "Created 5 users, 8 tags and 300 tasks" in out.getvalue()
+        assert CustomUser.objects.count() == 5
+        assert Tag.objects.values("name").distinct().count() == 8
+        assert set(Task.objects.values_list("status", flat=True)) == set(
+            Task.TaskStatus.values
+        )
+        counts = Task.objects.annotate(tag_count=Count("tags"))
+        assert max(counts.values_list("tag_count", flat=True)) <= 5
+        assert CustomUser.objects.first().check_password("password")
+
+    def test_existing_users_and_tags(self, board_user, board_tags):
+        """Без новых пользователей задачи достаются существующим"""
+        call_command(
+            "seed_tasks", "--users", "0", "--tags", "2", "--tasks", "20",
+            stdout=StringIO(),
+        )
+
+        assert Task.objects.filter(user_name=board_user).count() == 20
+        assert Tag.objects.count() == 5
+
+    def test_no_users(self):
+        """Без пользователей задачи не создаются"""
+        with pytest.raises(CommandError, match="Нет пользователей"):
+            call_command("seed_tasks", "--users", "0", "--tags", "0", "--tasks", "1")
+
+    def test_unique_tag_names(self, board_tags, mocker):
+        """Совпадающие имена тегов получают номер"""
+        faker = mocker.Mock()
+        faker.word.return_value = "баг"
+
+        seeding.Seeder(faker).create_tags(2)
+
+        assert sorted(Tag.objects.values_list("name", flat=True)) == [
+            "Баг",
+            "Баг 2",
+            "Баг 3",
+            "Бэкенд",
+            "Фронтенд",
+        ]
+
+    def test_without_faker(self, mocker):
+        """Без faker команда сообщает о зависимости"""
+        mocker.patch.dict("sys.modules", {"faker": None})
+
+        with pytest.raises(CommandError, match="requires faker"):
+            call_command("seed_tasks")
@@ -0,0 +1,60 @@
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+import pytest
+
+from tasker_app.models import TaskEvent
+from tasker_app.tasks import process_task_events, send_task, send_task_on_commit
+
+
+def make_events(count: int, kind: str = "created") -> list[dict]:
+    """Пачка событий в формате буфера"""
+    return [
+        {
+            "task_id": i,
+            "kind": kind,
+            "payload": {"title": f"Задача {i}"},
+            "occurred_at": timezone.now().isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestProcessTaskEvents:
+    """Тесты обработки пачки событий воркером"""
+
+    def test_batch_written_in_bulk(self, capsys, django_assert_num_queries):
+        """Пачка событий записывается одним запросом"""
+        with django_assert_num_queries(1):
+            result = process_task_events(make_events(3) + make_events(2, "deleted"))
+
+        assert result == {"created": 3, "deleted": 2}
+        assert TaskEvent.objects.count() == 5
+        assert "Создана новая задача: Задача 2" in capsys.readouterr().out
+
+    def test_send_task_eager_without_broker(self):
+        """Без брокера задача выполняется в процессе"""
+        send_task(process_task_events, make_events(1))
+
+        assert TaskEvent.objects.count() == 1
+
+    def test_send_task_falls_back_when_broker_down(self, mocker):
+        """Недоступный брокер не роняет запрос: задача выполняется в процессе"""
+        apply_async = mocker.patch.object(
+            process_task_events, "apply_async", side_effect=OperationalError("down")
+        )
+
+        send_task(process_task_events, make_events(2))
+
+        assert TaskEvent.objects.count() == 2
+        # Отправка не повторяется, откат сразу после первой ошибки
+        assert apply_async.call_args.kwargs["retry"] is False
+
+    def test_send_task_on_commit(self, django_capture_on_commit_callbacks):
+        """Задача уходит только после коммита"""
+        with django_capture_on_commit_callbacks() as callbacks:
+            send_task_on_commit(process_task_events, make_events(1))
+            assert not TaskEvent.objects.exists()
+        callbacks[0]()
+
+        assert TaskEvent.objects.count() == 1
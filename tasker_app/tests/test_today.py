@@ -0,0 +1,136 @@
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from tasker_app import board_cache, bulk
+from tasker_app.models import Task
+
+
+# Между этими поясами 25 часов: "сегодня" в них всегда разное
+EAST = "Pacific/Kiritimati"
+WEST = "Pacific/Pago_Pago"
+
+
+def local_today(name: str):
+    """Сегодняшняя дата в часовом поясе name"""
+    return timezone.localdate(timezone=ZoneInfo(name))
+
+
+def today_titles(client) -> set[str]:
+    """Названия задач на странице "Сегодня" """
+    response = client.get(reverse("today"))
+    assert response.status_code == 200
+    return {task.title for task in response.context["tasks"]}
+
+
+@pytest.mark.django_db
+class TestTodayTimezone:
+    """Тесты страницы "Сегодня" в часовом поясе пользователя"""
+
+    @pytest.fixture
+    def day_tasks(self, make_tasks):
+        """По задаче на "сегодня" восточного и западного поясов"""
+        east = make_tasks(1, end_date=local_today(EAST))[0]
+        west = make_tasks(1, end_date=local_today(WEST))[0]
+        Task.objects.filter(pk=east.pk).update(title="Восток")
+        Task.objects.filter(pk=west.pk).update(title="Запад")
+
+    def test_user_timezone(self, client, board_user, day_tasks):
+        """Пояс из профиля пользователя"""
+        board_user.timezone = EAST
+        board_user.save()
+        client.force_login(board_user)
+
+        assert today_titles(client) == {"Восток"}
+
+    def test_browser_timezone(self, day_tasks):
+        """Без пояса в профиле - из cookie браузера"""
+        client = Client()
+        client.cookies["timezone"] = WEST
+
+        assert today_titles(client) == {"Запад"}
+
+    def test_shared_cache_entry(self, day_tasks):
+        """Пояса с одной датой используют одну запись кеша"""
+        client = Client()
+        client.cookies["timezone"] = WEST
+        today_titles(client)
+        client.cookies["timezone"] = "Pacific/Midway"  # тоже UTC-11
+
+        today_titles(client)
+
+        assert board_cache.stats.summary()["today"]["hits"] == 1
+
+    def test_invalid_cookie(self, db):
+        """Неизвестный пояс в cookie игнорируется"""
+        client = Client()
+        client.cookies["timezone"] = "Mars/Olympus"
+
+        response = client.get(reverse("today"))
+
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestTodayCache:
+    """Тесты сброса кеша страницы "Сегодня" """
+
+    def test_other_day_keeps_cache(self, client, make_tasks):
+        """Изменение задачи с другим сроком не сбрасывает кеш дня"""
+        make_tasks(1)
+        other = make_tasks(1, end_date=timezone.localdate() + timedelta(days=5))[0]
+        today_titles(client)
+
+        other.title = "Другой день"
+        other.save()
+        bulk.set_fields([other.pk], status=Task.TaskStatus.CLOSED)
+        today_titles(client)
+
+        assert board_cache.stats.summary()["today"] == {
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+        }
+
+    def test_same_day_invalidates(self, client, make_tasks):
+        """Изменение задачи на сегодня сбрасывает кеш дня"""
+        task = make_tasks(1)[0]
+        today_titles(client)
+
+        task.title = "Переименована"
+        task.save()
+
+        assert today_titles(client) == {"Переименована"}
+
+    def test_moved_away_invalidates(self, client, make_tasks):
+        """Перенос задачи с сегодняшнего дня убирает её со страницы"""
+        task = make_tasks(1)[0]
+        today_titles(client)
+
+        task.end_date = timezone.localdate() + timedelta(days=1)
+        task.save()
+
+        assert not today_titles(client)
+
+    def test_bulk_moved_here_invalidates(self, client, make_tasks):
+        """Массовый перенос задач на сегодня появляется на странице"""
+        task = make_tasks(1, end_date=timezone.localdate() + timedelta(days=3))[0]
+        assert not today_titles(client)
+
+        bulk.set_fields([task.pk], end_date=timezone.localdate().isoformat())
+
+        assert today_titles(client) == {task.title}
+
+    def test_tag_rename_invalidates(self, client, make_tasks, board_tags):
+        """Переименование тега сбрасывает кеш всех дней"""
+        make_tasks(2)
+        today_titles(client)
+
+        board_tags[0].name = "Бэк"
+        board_tags[0].save()
+
+        assert "Бэк" in client.get(reverse("today")).content.decode()
@@ -0,0 +1,123 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app.models import Task
+from tasker_app.views import KanbanTemplateView
+
+
+BOARD_VIEWS = ("index", "today", "kanban")
+# Колонки канбана читаются одним UNION, если БД поддерживает LIMIT в его
+# частях (PostgreSQL), иначе - запросом на колонку (SQLite)
+KANBAN_COLUMN_QUERIES = (
+    1
+    if connection.features.supports_slicing_ordering_in_compound
+    else len(Task.TaskStatus.values)
+)
+
+
+def count_queries(client, url: str) -> int:
+    """Количество SQL-запросов при рендере страницы"""
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestBoardQueryCount:
+    """Регрессионные тесты на количество запросов досок"""
+
+    @pytest.mark.parametrize("view_name", BOARD_VIEWS)
+    def test_queries_do_not_grow_with_tasks(self, client, make_tasks, view_name):
+        """Число запросов не зависит от количества задач на доске"""
+        url = reverse(view_name)
+        for status in Task.TaskStatus.values:
+            make_tasks(1, status=status)
+        small = count_queries(client, url)
+
+        for status in Task.TaskStatus.values:
+            make_tasks(15, status=status)
+        large = count_queries(client, url)
+
+        assert small == large
+
+    # Первые запросы каждой доски - валидаторы условного GET
+    @pytest.mark.parametrize(
+        "view_name, max_queries",
+        [("index", 4), ("today", 3), ("kanban", 3 + KANBAN_COLUMN_QUERIES)],
+    )
+    def test_queries_upper_bound(
+        self, client, make_tasks, django_assert_max_num_queries, view_name, max_queries
+    ):
+        """Доска укладывается в фиксированное число запросов"""
+        for status in Task.TaskStatus.values:
+            make_tasks(5, status=status)
+
+        with django_assert_max_num_queries(max_queries):
+            response = client.get(reverse(view_name))
+        assert response.status_code == 200
+
+    def test_board_renders_tags_and_user(self, client, make_tasks):
+        """Карточки содержат исполнителя и теги из предзагруженных данных"""
+        make_tasks(3)
+        content = client.get(reverse("index")).content.decode()
+
+        assert "Board User" in content
+        assert "Теги: Бэкенд, Фронтенд" in content
+
+    def test_detail_tags_without_extra_queries(
+        self, client, make_tasks, django_assert_num_queries
+    ):
+        """Детальная страница загружает теги одним запросом"""
+        task = make_tasks(4)[3]
+
+        # Валидаторы, задача с исполнителем, теги
+        with django_assert_num_queries(3):
+            response = client.get(reverse("task_detail", kwargs={"pk": task.pk}))
+        assert "Бэкенд, Фронтенд, Баг" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_get_tags_list_uses_prefetch(make_tasks, django_assert_num_queries):
+    """get_tags_list не обращается к БД при предзагруженных тегах"""
+    make_tasks(4)
+    tasks = list(Task.objects.for_board().order_by("pk"))
+
+    with django_assert_num_queries(0):
+        tags = [task.get_str_with_all_tags() for task in tasks]
+        users = [str(task.user_name) for task in tasks]
+
+    assert tags[0] == ""
+    assert tags[3] == "Бэкенд, Фронтенд, Баг"
+    assert set(users) == {"Board User"}
+
+
+@pytest.mark.django_db
+def test_kanban_columns_and_counts(client, make_tasks, django_assert_num_queries):
+    """Канбан раскладывает задачи по колонкам одной выборкой"""
+    make_tasks(3, status=Task.TaskStatus.NEW)
+    make_tasks(2, status=Task.TaskStatus.ACTIVE)
+
+    # Валидаторы (счётчики и MAX(updated_at)), колонки и их теги; количество
+    # по статусам - из счётчиков, прочитанных для валидаторов
+    with django_assert_num_queries(3 + KANBAN_COLUMN_QUERIES):
+        response = client.get(reverse("kanban"))
+
+    columns = response.context["columns"]
+    assert len(columns["new"]) == 3
+    assert len(columns["active"]) == 2
+    assert columns["closed"].object_list == []
+    assert (columns["new"].total, columns["closed"].total) == (3, 0)
+    assert "Нет завершенных задач" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_kanban_status_counts_without_validators(make_tasks):
+    """Без прочитанного состояния валидаторов числа берутся из счётчиков"""
+    make_tasks(2)
+
+    counts = KanbanTemplateView().get_status_counts()
+
+    assert counts[Task.TaskStatus.NEW] == 2
@@ -0,0 +1,176 @@
+from datetime import date
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from tasker_app import bulk
+from tasker_app.models import Task
+from user_app.models import CustomUser
+
+
+def edit_data(task: Task, **changes) -> dict:
+    """Данные формы изменения задачи: текущие значения, версия и changes"""
+    data = {
+        "task_type": task.task_type,
+        "status": task.status,
+        "title": task.title,
+        "user_name": task.user_name_id,
+        "body": task.body,
+        "tags": [tag.pk for tag in task.tags.all()],
+        "end_date": task.end_date.isoformat(),
+        "version": task.version,
+    }
+    data.update(changes)
+    return data
+
+
+@pytest.mark.django_db
+class TestTaskViews:
+    """Тесты представлений создания, изменения и удаления задач"""
+
+    @pytest.fixture
+    def form_data(self, board_user, board_tags):
+        """Фикстура с корректными данными формы задачи"""
+        return {
+            "task_type": Task.TaskType.BUG,
+            "status": Task.TaskStatus.NEW,
+            "title": "Починить вход",
+            "user_name": board_user.pk,
+            "body": "Описание ошибки",
+            "tags": [tag.pk for tag in board_tags[:2]],
+            "end_date": date.today().isoformat(),
+        }
+
+    def test_create_task(self, client, form_data):
+        """Создание задачи сохраняет её и перенаправляет на её страницу"""
+        response = client.post(reverse("add_task_form"), form_data)
+
+        task = Task.objects.get()
+        assert response.status_code == 302
+        assert response.url == reverse("task_detail", kwargs={"pk": task.pk})
+        assert task.get_tags_list() == ["Бэкенд", "Фронтенд"]
+
+    def test_create_task_title_validation(self, client, form_data):
+        """Название из одного слова не проходит валидацию"""
+        form_data["title"] = "Починить"
+
+        response = client.post(reverse("add_task_form"), form_data)
+
+        assert response.status_code == 200
+        assert "минимум 2 слова" in response.content.decode()
+        assert not Task.objects.exists()
+
+    def test_add_form_disables_status(self, client):
+        """На форме создания статус недоступен для изменения"""
+        response = client.get(reverse("add_task_form"))
+
+        assert response.status_code == 200
+        assert response.context["form"].fields["status"].widget.attrs["disabled"]
+
+    def test_update_task(self, client, form_data, make_tasks):
+        """Изменение задачи перенаправляет на её страницу"""
+        task = make_tasks(1)[0]
+        form_data["status"] = Task.TaskStatus.ACTIVE
+
+        response = client.post(
+            reverse("task_edit", kwargs={"pk": task.pk}), form_data
+        )
+
+        task.refresh_from_db()
+        assert response.url == reverse("task_detail", kwargs={"pk": task.pk})
+        assert task.status == Task.TaskStatus.ACTIVE
+        assert task.title == "Починить вход"
+
+    def test_update_changed_fields_only(self, client, make_tasks):
+        """UPDATE пишет только изменённые поля, задача читается один раз"""
+        task = make_tasks(1)[0]
+        url = reverse("task_edit", kwargs={"pk": task.pk})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(url, edit_data(task, status=Task.TaskStatus.CLOSED))
+
+        assert response.status_code == 302
+        task_queries = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if '"tasker_app_task" ' in query["sql"] or '"tasker_app_task".' in query["sql"]
+        ]
+        (select, update) = [sql for sql in task_queries if "tasker_app_tag" not in sql]
+        if connection.features.has_select_for_update:
+            assert select.endswith("FOR UPDATE")
+        assert '"status"' in update and '"updated_at"' in update
+        assert '"body"' not in update and '"title"' not in update
+        task.refresh_from_db()
+        assert task.status == Task.TaskStatus.CLOSED
+
+    def test_update_without_changes(self, client, make_tasks):
+        """Неизменённая форма ничего не записывает"""
+        task = make_tasks(1)[0]
+
+        with CaptureQueriesContext(connection) as ctx:
+            client.post(reverse("task_edit", kwargs={"pk": task.pk}), edit_data(task))
+
+        assert not [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        assert Task.objects.get().updated_at == task.updated_at
+
+    def test_update_tags_diff(self, client, make_tasks, board_tags):
+        """Связи с тегами меняются только для добавленных и снятых тегов"""
+        task = make_tasks(1)[0]
+        task.tags.set(board_tags[:2])
+        links = Task.tags.through.objects.filter(task=task)
+        kept = links.get(tag=board_tags[1]).pk
+        task.refresh_from_db()
+
+        response = client.post(
+            reverse("task_edit", kwargs={"pk": task.pk}),
+            edit_data(task, tags=[board_tags[1].pk, board_tags[2].pk]),
+        )
+
+        assert response.status_code == 302
+        assert sorted(links.values_list("tag_id", flat=True)) == [
+            board_tags[1].pk,
+            board_tags[2].pk,
+        ]
+        assert links.get(tag=board_tags[1]).pk == kept
+
+    def test_update_conflict(self, client, make_tasks):
+        """Задачу изменили после открытия формы - 409, изменения не затираются"""
+        task = make_tasks(1)[0]
+        url = reverse("task_edit", kwargs={"pk": task.pk})
+        stale = edit_data(task, title="Своё новое название")
+        bulk.set_fields([task.pk], status=Task.TaskStatus.ACTIVE)
+
+        response = client.post(url, stale)
+
+        assert response.status_code == 409
+        assert "Задачу изменили" in response.content.decode()
+        task.refresh_from_db()
+        assert (task.title, task.status) == ("Задача номер 0", Task.TaskStatus.ACTIVE)
+        # Форма несёт текущую версию: повторная отправка сохраняет
+        form = response.context["form"]
+        assert form["version"].value() == task.version
+        response = client.post(url, dict(stale, version=form["version"].value()))
+        assert response.status_code == 302
+        task.refresh_from_db()
+        assert task.title == "Своё новое название"
+
+    def test_delete_task_by_staff(self, client, make_tasks):
+        """Администратор может удалить задачу"""
+        task = make_tasks(1)[0]
+        admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", password="adminpass123", full_name="Admin"
+        )  # type: ignore
+        client.force_login(admin)
+
+        response = client.delete(reverse("task_delete", kwargs={"pk": task.pk}))
+
+        assert response.url == reverse("index")
+        assert not Task.objects.exists()
+
+    def test_about_page(self, client):
+        """Страница about доступна без авторизации"""
+        response = client.get(reverse("about"))
+
+        assert response.status_code == 200
+        assert response.context["active_page"] == "about"
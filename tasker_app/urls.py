@@ -1,22 +1,45 @@
 from django.urls import path
+from .api import TagListView, TaskBatchView, TaskListView, UserListView
 from .views import (
     TaskDeleteView,
     TaskDetailView,
     TaskUpdateView,
     IndexTemplateView,
+    KanbanEventsView,
+    KanbanMoveView,
     KanbanTemplateView,
+    WorkloadTemplateView,
     AboutTemplateView,
     TodayTemplateView,
     TaskCreateView,
+    TaskExportView,
+    TaskSearchView,
+    TagAutocompleteView,
+    UserAutocompleteView,
 )
 
 urlpatterns = [
     path("", IndexTemplateView.as_view(), name="index"),
     path("kanban/", KanbanTemplateView.as_view(), name="kanban"),
+    path("kanban/events/", KanbanEventsView.as_view(), name="kanban_events"),
+    path("kanban/moves/", KanbanMoveView.as_view(), name="kanban_moves"),
+    path("workload/", WorkloadTemplateView.as_view(), name="workload"),
     path("about/", AboutTemplateView.as_view(), name="about"),
     path("today/", TodayTemplateView.as_view(), name="today"),
     path("tasks/add/", TaskCreateView.as_view(), name="add_task_form"),
+    path(
+        "autocomplete/users/",
+        UserAutocompleteView.as_view(),
+        name="autocomplete_users",
+    ),
+    path("autocomplete/tags/", TagAutocompleteView.as_view(), name="autocomplete_tags"),
+    path("tasks/search/", TaskSearchView.as_view(), name="task_search"),
+    path("tasks/export/<str:fmt>/", TaskExportView.as_view(), name="task_export"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task_detail"),
     path("tasks/<int:pk>/edit/", TaskUpdateView.as_view(), name="task_edit"),
     path("tasks/<int:pk>/delete/", TaskDeleteView.as_view(), name="task_delete"),
+    path("api/tasks/", TaskListView.as_view(), name="api_tasks"),
+    path("api/tasks/batch/", TaskBatchView.as_view(), name="api_tasks_batch"),
+    path("api/tags/", TagListView.as_view(), name="api_tags"),
+    path("api/users/", UserListView.as_view(), name="api_users"),
 ]
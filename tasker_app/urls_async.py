@@ -0,0 +1,30 @@
+"""Маршруты асинхронных представлений (config/urls_asgi.py)
+
+Адреса и имена берутся из tasker_app/urls.py, меняются только представления.
+"""
+
+from django.urls import path
+
+from tasker_app.async_views import (
+    AsyncIndexTemplateView,
+    AsyncKanbanEventsView,
+    AsyncKanbanTemplateView,
+    AsyncTaskDetailView,
+    AsyncTodayTemplateView,
+)
+from tasker_app.urls import urlpatterns as sync_urlpatterns
+
+
+ASYNC_VIEWS = {
+    "index": AsyncIndexTemplateView,
+    "kanban": AsyncKanbanTemplateView,
+    "kanban_events": AsyncKanbanEventsView,
+    "today": AsyncTodayTemplateView,
+    "task_detail": AsyncTaskDetailView,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name].as_view(), name=pattern.name)
+    for pattern in sync_urlpatterns
+    if pattern.name in ASYNC_VIEWS
+]
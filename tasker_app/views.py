@@ -1,45 +1,340 @@
+import hashlib
+import json
+from datetime import date
+
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from django.views.generic import (
     CreateView,
     DetailView,
     UpdateView,
     DeleteView,
     TemplateView,
+    View,
 )
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+
+from tasker_app import board_cache, bulk, counters, export, search
+from tasker_app.forms import (
+    TaskFilterForm,
+    TaskModelForm,
+    TaskMoveForm,
+    TaskSearchForm,
+)
+from tasker_app.models import ArchivedTask, Tag, Task
+from tasker_app.pagination import InvalidCursor, KeysetPage, KeysetPaginator
+from user_app.models import CustomUser
+
+
+class ConditionalGetMixin:
+    """Ответ 304 Not Modified до выборки задач и рендеринга шаблона
+
+    Валидаторы строятся по состоянию страницы (get_validation_state): по
+    умолчанию это отметка последнего изменения и число задач из
+    get_validation_queryset и версия кеша досок (теги и имена исполнителей).
+    В ETag входит также пользователь, от которого зависит шапка страницы.
+    """
 
-from tasker_app.forms import TaskModelForm
-from tasker_app.models import Task
-from tasker_app.tasks import log_new_task
+    # Агрегаты get_validation_queryset, из которых строятся валидаторы
+    validators = {"last_modified": Max("updated_at"), "count": Count("id")}
+    model = Task
+
+    def get_validation_queryset(self):
+        """Объекты, от которых зависит страница; по умолчанию - все объекты model"""
+        return self.model._default_manager.all()  # pylint: disable=protected-access
+
+    @staticmethod
+    def get_queryset_state(state: dict, version: int) -> tuple[list, float | None]:
+        """Состояние страницы по агрегатам state и версии кеша досок"""
+        last_modified = state["last_modified"]
+        parts = [version, state["count"], last_modified and last_modified.isoformat()]
+        return parts, last_modified and last_modified.timestamp()
+
+    def get_validation_state(self) -> tuple[list, float | None]:
+        """Составляющие ETag и время последнего изменения страницы"""
+        state = self.get_validation_queryset().aggregate(**self.validators)
+        return self.get_queryset_state(state, board_cache.get_versions(board_cache.BOARD)[0])
+
+    def get_etag_parts(self) -> list:
+        """Дополнительные составляющие ETag"""
+        return []
+
+    def get_validators(self, state: tuple[list, float | None], user_pk) -> tuple:
+        """ETag и отметка времени по состоянию страницы"""
+        parts, last_modified = state
+        parts = [user_pk, *parts, *self.get_etag_parts()]
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        # Слабый ETag: страницы различаются маской CSRF-токена
+        etag = f'W/"{digest}"'
+        timestamp = int(last_modified) if last_modified is not None else None
+        return etag, timestamp
+
+    @staticmethod
+    def finish_response(response, etag: str, timestamp: int | None):
+        """Заголовки валидаторов и кеширования ответа"""
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+        # Браузер проверяет актуальность страницы при каждом показе
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
+    def get(self, request, *args, **kwargs):
+        """304, если страница у клиента актуальна, иначе полный ответ"""
+        etag, timestamp = self.get_validators(self.get_validation_state(), request.user.pk)
+        response = None
+        # Непоказанные сообщения должны попасть на страницу
+        if not messages.get_messages(request):
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+        if response is None:
+            response = super().get(request, *args, **kwargs)  # type: ignore
+        return self.finish_response(response, etag, timestamp)
+
+
+class BoardPaginationMixin:
+    """Курсорная пагинация задач на досках и кеш данных доски
+
+    Данные доски (build_board) кешируются под именем board_name с ключом из
+    параметров запроса и get_board_params; get_board_context раскладывает их
+    по контексту шаблона.
+    """
+
+    paginate_by = 50
+    ordering = ("end_date", "id")
+    board_name: str
+    # Состояние задач из get_validation_state (get_tasks_state)
+    tasks_state: dict | None = None
+
+    def get_paginator(self, queryset) -> KeysetPaginator:
+        """Пагинатор по сортировке ordering"""
+        return KeysetPaginator(queryset, self.paginate_by, ordering=self.ordering)
+
+    def get_cursor(self) -> str | None:
+        """Курсор страницы из параметра cursor"""
+        return self.request.GET.get("cursor")  # type: ignore
+
+    def paginate_tasks(self, queryset) -> KeysetPage:
+        """Страница задач после курсора из параметра cursor"""
+        try:
+            return self.get_paginator(queryset).page(self.get_cursor())
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+
+    def get_board_queryset(self):
+        """Задачи доски"""
+        return Task.objects.for_board()
+
+    def get_board_scopes(self) -> tuple[str, ...]:
+        """Области кеша досок, от которых зависят данные"""
+        return (board_cache.BOARD, board_cache.TASKS)
+
+    def get_board_params(self) -> dict:
+        """Параметры ключа кеша помимо параметров запроса"""
+        return {}
+
+    def get_tasks_state(self) -> dict:
+        """Состояние задач доски из БД: числа по статусам из счётчиков и
+        последнее изменение задач (MAX(updated_at) по индексу)"""
+        return {
+            "counts": counters.count_by_status(),
+            **Task.objects.aggregate(last_modified=Max("updated_at")),
+        }
+
+    def get_board_state(
+        self, state: tuple[list, float | None], tasks_state: dict
+    ) -> tuple:
+        """Состояние доски для валидаторов: версии кеша досок и состояние задач
+
+        Состояние задач читается из БД и поэтому одинаково во всех процессах,
+        даже если версии кеша досок (locmem) увеличивает другой процесс. Оно
+        входит и в ключ кеша досок (get_board_key_params).
+        """
+        self.tasks_state = tasks_state
+        versions, modified = state
+        last_modified = tasks_state["last_modified"]
+        if modified is not None and last_modified is not None:
+            modified = max(modified, last_modified.timestamp())
+        return [*versions, sorted(tasks_state.items())], modified
+
+    def get_validation_state(self) -> tuple[list, float | None]:
+        """Состояние доски: без выборки задач, MAX(updated_at) берётся по индексу"""
+        return self.get_board_state(
+            board_cache.get_state(*self.get_board_scopes()), self.get_tasks_state()
+        )
+
+    def get_board_key_params(self) -> dict:
+        """Все параметры ключа кеша"""
+        params = self.get_board_params()
+        params.update(self.request.GET.items())  # type: ignore
+        if self.tasks_state is not None:
+            params["tasks_state"] = repr(sorted(self.tasks_state.items()))
+        return params
+
+    def build_board(self):
+        """Данные доски: по умолчанию страница задач"""
+        return self.paginate_tasks(self.get_board_queryset())
+
+    def get_board(self):
+        """Данные доски из кеша досок"""
+        return board_cache.get_or_build(
+            self.board_name,
+            self.get_board_key_params(),
+            self.build_board,
+            self.get_board_scopes(),
+        )
+
+    def get_board_context(self, board) -> dict:
+        """Контекст шаблона из данных доски"""
+        return {"tasks": board.object_list, "page": board}
 
-class IndexTemplateView(TemplateView):
+    def get_context_data(self, **kwargs):
+        """Контекст с данными доски (асинхронные представления передают их в board)"""
+        board = kwargs.pop("board", None)
+        if board is None:
+            board = self.get_board()
+        context = super().get_context_data(**kwargs)  # type: ignore
+        context.update(self.get_board_context(board))
+        return context
+
+
+class IndexTemplateView(BoardPaginationMixin, ConditionalGetMixin, TemplateView):
     """Представление главной страницы"""
 
     template_name = "tasker_app/index.html"
+    board_name = "index"
 
     def get_context_data(self, **kwargs):
-        tasks = Task.objects.all()
         context = super().get_context_data(**kwargs)
         context["active_page"] = "index"
-        context["tasks"] = tasks
         return context
 
 
-class KanbanTemplateView(TemplateView):
+class KanbanTemplateView(BoardPaginationMixin, ConditionalGetMixin, TemplateView):
     """Представление для канбана"""
 
     template_name = "tasker_app/kanban.html"
+    board_name = "kanban"
+    # Порядок карточек в колонке задаётся перетаскиванием (KanbanMoveView)
+    ordering = ("rank", "id")
 
     def get_context_data(self, **kwargs):
-        new_tasks = Task.objects.filter(status=Task.TaskStatus.NEW)
-        active_tasks = Task.objects.filter(status=Task.TaskStatus.ACTIVE)
-        closed_tasks = Task.objects.filter(status=Task.TaskStatus.CLOSED)
         context = super().get_context_data(**kwargs)
         context["active_page"] = "index"
-        context["new_tasks"] = new_tasks
-        context["active_tasks"] = active_tasks
-        context["closed_tasks"] = closed_tasks
+        return context
+
+    def get_board_context(self, board) -> dict:
+        # Cookie с токеном CSRF для переносов карточек (kanban_moves.js)
+        get_token(self.request)  # type: ignore
+        return {"columns": board}
+
+    def get_column_cursors(self) -> dict[str, str | None]:
+        """Курсор каждой колонки передаётся в параметре с именем статуса"""
+        return {
+            status: self.request.GET.get(status) for status in Task.TaskStatus.values
+        }
+
+    def get_status_counts(self) -> dict[str, int]:
+        """Числа задач по статусам: уже прочитанные для валидаторов или из счётчиков"""
+        if self.tasks_state is not None:
+            return self.tasks_state["counts"]
+        return counters.count_by_status()
+
+    @staticmethod
+    def set_totals(columns: dict[str, KeysetPage], counts: dict[str, int]) -> dict:
+        """Общее число задач в колонках - из счётчиков, а не COUNT(*)"""
+        for status, page in columns.items():
+            page.total = counts[status]
+        return columns
+
+    def build_board(self) -> dict[str, KeysetPage]:
+        """Страницы колонок по статусам с общим числом задач в колонке"""
+        paginator = self.get_paginator(self.get_board_queryset())
+        try:
+            columns = paginator.column_pages("status", self.get_column_cursors())
+        except InvalidCursor as exc:
+            raise Http404(str(exc)) from exc
+        return self.set_totals(columns, self.get_status_counts())
+
+
+class KanbanEventsView(View):
+    """Поток изменений задач для канбана (Server-Sent Events)
+
+    Поток держит соединение открытым, поэтому отдаётся только асинхронным
+    представлением под ASGI (tasker_app.async_views). Под WSGI ответ 204:
+    по нему браузер не переподключается, а доска работает без обновлений.
+    """
+
+    def get(self, request):
+        """Живые обновления недоступны"""
+        return HttpResponse(status=204)
+
+
+class KanbanMoveView(View):
+    """Перенос карточек канбана пачкой: {"moves": [{"id", "status", "position"}]}
+
+    Переносы применяются по порядку одной транзакцией (bulk.move_tasks).
+    Ответ - новые статус и rank перенесённых задач и id несуществующих.
+    """
+
+    max_moves = 100
+
+    def post(self, request):
+        """Применить переносы"""
+        try:
+            moves = json.loads(request.body)["moves"]
+        except (ValueError, KeyError, TypeError):
+            moves = None
+        if not isinstance(moves, list):
+            return JsonResponse({"errors": "Ожидается JSON с полем moves"}, status=400)
+        if len(moves) > self.max_moves:
+            return JsonResponse(
+                {"errors": f"Не больше {self.max_moves} переносов за раз"}, status=400
+            )
+        forms = [TaskMoveForm(move if isinstance(move, dict) else {}) for move in moves]
+        errors = {
+            index: form.errors for index, form in enumerate(forms) if not form.is_valid()
+        }
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+        moves = [
+            (data["id"], data["status"], data["position"])
+            for data in (form.cleaned_data for form in forms)
+        ]
+        moved = bulk.move_tasks(moves)
+        requested = {pk for pk, _, _ in moves}
+        return JsonResponse(
+            {
+                "moved": [
+                    {"id": pk, "status": status, "rank": rank}
+                    for pk, (status, rank) in moved.items()
+                ],
+                "missing": sorted(requested - moved.keys()),
+            }
+        )
+
+
+class WorkloadTemplateView(TemplateView):
+    """Загрузка исполнителей: число задач по статусам из счётчиков"""
+
+    template_name = "tasker_app/workload.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["active_page"] = "index"
+        context["rows"] = counters.workload()
+        context["statuses"] = Task.TaskStatus.choices
         return context
 
 
@@ -54,19 +349,114 @@ class AboutTemplateView(TemplateView):
         return context
 
 
-class TodayTemplateView(TemplateView):
-    """Представление страницы today"""
+class TodayTemplateView(BoardPaginationMixin, ConditionalGetMixin, TemplateView):
+    """Представление страницы today
+
+    "Сегодня" - в часовом поясе пользователя (user_app.middleware). Данные
+    зависят только от даты, поэтому пользователи из разных поясов с одной
+    датой получают одну запись кеша, а сбрасывают её только изменения задач
+    с этим сроком.
+    """
 
     template_name = "tasker_app/index.html"
+    board_name = "today"
+
+    @cached_property
+    def today(self) -> date:
+        """Дата в часовом поясе запроса"""
+        return timezone.localdate()
+
+    def get_etag_parts(self) -> list:
+        # Пустые доски разных дней не должны совпадать
+        return [self.today.isoformat()]
+
+    def get_board_queryset(self):
+        return Task.get_by_date(self.today).for_board()
+
+    def get_board_scopes(self) -> tuple[str, ...]:
+        return (board_cache.BOARD, board_cache.day_scope(self.today))
+
+    def get_tasks_state(self) -> dict:
+        # Только задачи дня (по индексу срока): изменения задач других дней
+        # не сбрасывают кеш дня
+        return Task.get_by_date(self.today).aggregate(**self.validators)
+
+    def get_board_params(self) -> dict:
+        return {"date": self.today.isoformat()}
 
     def get_context_data(self, **kwargs):
-        today_tasks = Task.get_by_date()
         context = super().get_context_data(**kwargs)
         context["active_page"] = "today"
-        context["tasks"] = today_tasks
         return context
 
 
+class TaskSearchView(TemplateView):
+    """Полнотекстовый поиск задач с ранжированием"""
+
+    template_name = "tasker_app/search.html"
+
+    def get_context_data(self, **kwargs):
+        form = TaskSearchForm(self.request.GET)
+        # Некорректный номер страницы не мешает искать: берётся первая
+        form.is_valid()
+        query = form.cleaned_data.get("q", "")
+        number = form.cleaned_data.get("page") or 1
+        context = super().get_context_data(**kwargs)
+        context["active_page"] = "search"
+        context["query"] = query
+        context["page"] = search.search(query, number)
+        return context
+
+
+class AutocompleteView(View):
+    """Варианты для виджетов автодополнения: {"results": [{"id", "text"}]}
+
+    Ищет по началу значения search_field без учёта регистра (индекс по
+    UPPER(поле) в PostgreSQL) и отдаёт не больше limit вариантов.
+    """
+
+    model: type
+    search_field: str
+    limit = 20
+
+    def get_results_queryset(self, query: str):
+        """id и текст вариантов, начинающихся с query"""
+        return (
+            self.model.objects.filter(**{f"{self.search_field}__istartswith": query})
+            .order_by(self.search_field, "pk")
+            .values_list("pk", self.search_field)
+        )
+
+    def get(self, request):
+        """Отдать варианты для запроса q"""
+        query = request.GET.get("q", "").strip()
+        try:
+            limit = min(int(request.GET.get("limit", self.limit)), self.limit)
+        except ValueError:
+            limit = self.limit
+        results = []
+        if query and limit > 0:
+            results = [
+                {"id": pk, "text": text}
+                for pk, text in self.get_results_queryset(query)[:limit]
+            ]
+        return JsonResponse({"results": results})
+
+
+class UserAutocompleteView(AutocompleteView):
+    """Исполнители по началу имени (почта не отдаётся)"""
+
+    model = CustomUser
+    search_field = "full_name"
+
+
+class TagAutocompleteView(AutocompleteView):
+    """Теги по началу названия"""
+
+    model = Tag
+    search_field = "name"
+
+
 class TaskCreateView(CreateView):
     """Представление для формы создания задачи"""
 
@@ -81,29 +471,71 @@ class TaskCreateView(CreateView):
         """Добавляем сообщение об успешном создании задачи."""
         response = super().form_valid(form)
         messages.success(self.request, "Пост успешно создан")
-
-        # логируем в консоль результат задачи celery
-        task_result = log_new_task.delay(str(self.object.title))  # type: ignore
-        print(task_result.get())
         return response
 
 
-class TaskDetailView(DetailView):
-    """Представление для детального просмотра задачи"""
+class TaskDetailView(ConditionalGetMixin, DetailView):
+    """Представление для детального просмотра задачи
 
-    model = Task
+    Задачи, перенесённой в архив (tasker_app.archive), нет в таблице задач -
+    карточка показывается по архиву, без изменения и удаления.
+    """
+
+    queryset = Task.objects.for_board()
+    archive_queryset = ArchivedTask.objects.select_related("user_name").prefetch_related(
+        "tags"
+    )
     template_name = "tasker_app/task_detail.html"
+    context_object_name = "task"
+
+    def get_validation_queryset(self):
+        return Task.objects.filter(pk=self.kwargs["pk"])
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            archived = self.archive_queryset.filter(pk=self.kwargs["pk"]).first()
+            if archived is None:
+                raise
+            return archived
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["archived"] = isinstance(self.object, ArchivedTask)
+        return context
 
 
 class TaskUpdateView(UpdateView):
-    """Представление для формы изменения задачи"""
+    """Представление для формы изменения задачи
+
+    Сохраняются только изменённые поля и связи с тегами (TaskModelForm.save).
+    """
 
     model = Task
     template_name = "tasker_app/task_edit.html"
     form_class = TaskModelForm
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method == "POST":
+            # Задача заблокирована до конца сохранения: между проверкой
+            # версии в форме и записью её не изменит другой запрос
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().post(request, *args, **kwargs)
+
+    def form_invalid(self, form):
+        response = super().form_invalid(form)
+        if form.has_error(NON_FIELD_ERRORS, "conflict"):
+            response.status_code = 409
+        return response
+
     def get_success_url(self):
-        return reverse_lazy("task_detail", kwargs={"pk": self.get_object().pk})
+        return reverse_lazy("task_detail", kwargs={"pk": self.object.pk})
 
 
 class TaskDeleteView(DeleteView):
@@ -120,3 +552,24 @@ class TaskDeleteView(DeleteView):
             return super().delete(request, *args, **kwargs)
         messages.error(self.request, "У вас нет прав на удаление задачи")
         return reverse_lazy("index")
+
+
+@method_decorator(staff_member_required, name="dispatch")
+class TaskExportView(View):
+    """Потоковая выгрузка задач в CSV или NDJSON с фильтрами.
+    Выгрузка содержит почту исполнителей, поэтому доступна только персоналу"""
+
+    def get(self, request, fmt):
+        """Отдать выгрузку в формате fmt"""
+        if fmt not in export.FORMATS:
+            raise Http404("Неизвестный формат выгрузки")
+        form = TaskFilterForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        serialize, content_type = export.FORMATS[fmt]
+        rows = export.iter_rows(form.filter(Task.objects.all()))
+        response = StreamingHttpResponse(
+            export.stream(serialize(rows)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="tasks.{fmt}"'
+        return response
@@ -0,0 +1,48 @@
+"""Виджеты выбора с подгрузкой вариантов по мере ввода
+
+Обычные Select/SelectMultiple для связей выводят все строки таблицы. Эти
+виджеты рендерят только выбранные значения (один запрос по pk), а остальные
+варианты static/autocomplete.js запрашивает у эндпоинта автодополнения.
+"""
+
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteMixin:
+    """Только выбранные варианты и URL эндпоинта в data-autocomplete-url"""
+
+    def __init__(self, url_name: str, attrs=None):
+        super().__init__(attrs)  # type: ignore
+        self.url_name = url_name
+
+    def get_context(self, name, value, attrs):
+        """Добавить URL эндпоинта к атрибутам"""
+        context = super().get_context(name, value, attrs)  # type: ignore
+        context["widget"]["attrs"]["data-autocomplete-url"] = reverse(self.url_name)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        """Варианты только из выбранных значений"""
+        # self.choices - ModelChoiceIterator поля формы
+        iterator = self.choices  # type: ignore  # pylint: disable=access-member-before-definition
+        empty_label = iterator.field.empty_label
+        choices = []
+        if not self.allow_multiple_selected and empty_label is not None:  # type: ignore
+            choices.append(("", empty_label))
+        selected = [pk for pk in value if str(pk).isdigit()]
+        if selected:
+            queryset = iterator.queryset.filter(pk__in=selected)
+            choices += [(obj.pk, str(obj)) for obj in queryset]
+        self.choices = choices  # pylint: disable=attribute-defined-outside-init
+        try:
+            return super().optgroups(name, value, attrs)  # type: ignore
+        finally:
+            self.choices = iterator  # pylint: disable=attribute-defined-outside-init
+
+class AutocompleteSelect(AutocompleteMixin, forms.Select):
+    """Select с автодополнением"""
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, forms.SelectMultiple):
+    """SelectMultiple с автодополнением"""
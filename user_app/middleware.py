@@ -0,0 +1,50 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.utils import timezone
+
+from user_app.models import get_zone
+
+
+# Cookie с часовым поясом браузера (выставляет static/board.js)
+TIMEZONE_COOKIE = "timezone"
+
+
+class TimezoneMiddleware:
+    """Часовой пояс запроса: из профиля пользователя или из браузера
+
+    Без них используется TIME_ZONE. От часового пояса зависят "сегодня"
+    (timezone.localdate) и вывод дат и времени в шаблонах. Работает и в
+    асинхронной цепочке (ASGI), не занимая поток на время запроса.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def activate(request, user) -> None:
+        """Включить часовой пояс пользователя или cookie браузера"""
+        name = getattr(user, "timezone", "") or request.COOKIES.get(TIMEZONE_COOKIE, "")
+        zone = get_zone(name)
+        if zone is None:
+            timezone.deactivate()
+        else:
+            timezone.activate(zone)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.activate(request, getattr(request, "user", None))
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        user = None
+        if hasattr(request, "auser"):
+            user = await request.auser()
+            # request.user загрузил бы пользователя ещё раз (в шаблоне)
+            request.user = user
+        self.activate(request, user)
+        return await self.get_response(request)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+import user_app.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0002_alter_customuser_username'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='timezone',
+            field=models.CharField(blank=True, help_text='Например, Europe/Moscow. Если не задан - из браузера', max_length=64, validators=[user_app.models.validate_timezone], verbose_name='Часовой пояс'),
+        ),
+    ]
@@ -1,7 +1,24 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
 
+def get_zone(name: str) -> ZoneInfo | None:
+    """Часовой пояс по имени IANA или None для неизвестного имени"""
+    try:
+        return ZoneInfo(name) if name else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def validate_timezone(name: str) -> None:
+    """Валидация имени часового пояса"""
+    if get_zone(name) is None:
+        raise ValidationError(f"Неизвестный часовой пояс: {name}")
+
+
 class CustomUserManager(BaseUserManager):
     """Модель менеджера пользователей"""
 
@@ -36,6 +53,13 @@ class CustomUser(AbstractUser):
         null=True,
         verbose_name="Имя пользователя (не обязательное)",
     )
+    timezone = models.CharField(
+        max_length=64,
+        blank=True,
+        validators=[validate_timezone],
+        verbose_name="Часовой пояс",
+        help_text="Например, Europe/Moscow. Если не задан - из браузера",
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 import pytest
 from user_app.models import CustomUser
 
@@ -157,3 +158,13 @@ def test_multiple_users():
     assert "user1@example.com" in emails
     assert "user2@example.com" in emails
     assert "user3@example.com" in emails
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ["Mars/Olympus", "../etc/passwd"])
+def test_invalid_timezone(name):
+    """Тест: неизвестный часовой пояс не проходит валидацию"""
+    user = CustomUser(email="tz@example.com", full_name="Tz User", timezone=name)
+
+    with pytest.raises(ValidationError, match="Неизвестный часовой пояс"):
+        user.full_clean(exclude=["password"])
@@ -0,0 +1,61 @@
+from django.urls import reverse
+import pytest
+
+from user_app.models import CustomUser
+
+
+@pytest.mark.django_db
+class TestUserViews:
+    """Тесты регистрации и авторизации"""
+
+    def test_register(self, client):
+        """Регистрация создаёт пользователя и авторизует его"""
+        response = client.post(
+            reverse("register"),
+            {
+                "email": "New@Example.com",
+                "full_name": "New User",
+                "password1": "Sup3r-secret-pass",
+                "password2": "Sup3r-secret-pass",
+            },
+        )
+
+        assert response.url == reverse("login")
+        user = CustomUser.objects.get()
+        assert user.email == "new@example.com"
+        assert client.session["_auth_user_id"] == str(user.pk)
+
+    def test_register_duplicate_email(self, client):
+        """Повторная регистрация с тем же email запрещена"""
+        CustomUser.objects.create_user(
+            email="taken@example.com", password="pass123", full_name="Taken"
+        )  # type: ignore
+
+        response = client.post(
+            reverse("register"),
+            {
+                "email": "TAKEN@example.com",
+                "full_name": "Other",
+                "password1": "Sup3r-secret-pass",
+                "password2": "Sup3r-secret-pass",
+            },
+        )
+
+        assert response.status_code == 200
+        assert "Этот email уже занят" in response.content.decode()
+
+    def test_login_and_logout(self, client):
+        """Вход по email без учёта регистра и выход"""
+        CustomUser.objects.create_user(
+            email="login@example.com", password="pass12345", full_name="Login"
+        )  # type: ignore
+
+        response = client.post(
+            reverse("login"),
+            {"username": "LOGIN@example.com", "password": "pass12345"},
+        )
+        assert response.url == reverse("index")
+
+        response = client.post(reverse("logout"))
+        assert response.url == reverse("login")
+        assert "_auth_user_id" not in client.session